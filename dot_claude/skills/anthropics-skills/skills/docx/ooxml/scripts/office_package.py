@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+In-memory Office package (.docx/.pptx/.xlsx) for unpack-edit-pack round trips.
+
+OfficePackage maps part names (e.g. "word/document.xml") to their bytes, loaded
+straight from the zip or lazily from an unpacked directory. An editor can attach
+its parsed tree to a part; the tree is then the part's content and is only
+serialized when the part is read or the package is saved. Writing the package
+out as a directory is an optional debugging view, not a required stage.
+
+Example usage:
+    package = OfficePackage.open("report.docx")
+    data = package.read("word/document.xml")
+    package.write("word/document.xml", data.replace(b"Draft", b"Final"))
+    package.save("report-final.docx")
+
+    # Same line numbers as unpack.py output, for line-based lookups
+    package = OfficePackage.open("report.docx", pretty=True)
+
+    # Optional debugging view on disk
+    package.extract("debug-unpacked")
+"""
+
+import zipfile
+from pathlib import Path
+
+import defusedxml.minidom
+
+CONTENT_TYPES_PART = "[Content_Types].xml"
+XML_SUFFIXES = (".xml", ".rels")
+
+
+class OfficePackage:
+    """Mapping of part name to bytes (or an attached, lazily serialized tree).
+
+    Attributes:
+        path: The .docx/.pptx/.xlsx file the package was opened from, if any
+    """
+
+    def __init__(self, parts=None, path=None):
+        """
+        Initialize from a dict of part name to bytes.
+
+        Args:
+            parts: Optional dict mapping part names to bytes
+            path: Optional Office file the parts came from (default save target)
+        """
+        self.path = Path(path) if path else None
+        self._parts = dict(parts or {})
+        self._written = set()
+        self._trees = {}
+        self._base_dirs = ()
+        self._pretty_pending = set()
+        # Parts as stored in the source zip, saved as-is while unmodified
+        self._packed = {}
+        # Loaded content of parts replaced by write() (None: part was new)
+        self._originals = {}
+
+    @classmethod
+    def open(cls, path, pretty=False):
+        """Load all parts of an Office file straight from the zip.
+
+        Args:
+            path: Path to the .docx/.pptx/.xlsx file
+            pretty: If True, XML parts are pretty-printed on first access exactly
+                like unpack.py does, so line numbers match an unpacked tree
+
+        Raises:
+            ValueError: If an entry name is absolute or contains ".."
+        """
+        with zipfile.ZipFile(path) as zf:
+            parts = {
+                _checked_name(info.filename): zf.read(info)
+                for info in zf.infolist()
+                if not info.is_dir()
+            }
+        package = cls(parts, path=path)
+        package._packed = dict(parts)
+        if pretty:
+            package._pretty_pending = {n for n in parts if n.endswith(XML_SUFFIXES)}
+        return package
+
+    @classmethod
+    def from_directory(cls, directory, underlay=None):
+        """View an unpacked directory as a package; files are read on first access.
+
+        Args:
+            directory: Unpacked directory
+            underlay: Optional directory whose files show through wherever
+                directory has no file of the same name (it is only read)
+        """
+        package = cls()
+        for base_dir in (directory, underlay):
+            if base_dir is None:
+                continue
+            base_dir = Path(base_dir)
+            if not base_dir.is_dir():
+                raise ValueError(f"{base_dir} is not a directory")
+            package._base_dirs += (base_dir,)
+        return package
+
+    def names(self):
+        """Return all part names in the package."""
+        names = dict.fromkeys(self._parts)
+        names.update(dict.fromkeys(self._trees))
+        # Rescan so files added to the directory after loading are visible
+        for base_dir in self._base_dirs:
+            for file in base_dir.rglob("*"):
+                if file.is_file():
+                    names.setdefault(file.relative_to(base_dir).as_posix())
+        return list(names)
+
+    def __contains__(self, name):
+        if name in self._parts or name in self._trees:
+            return True
+        return self._file(name) is not None
+
+    def __iter__(self):
+        return iter(self.names())
+
+    @property
+    def modified(self):
+        """Names of parts written, or whose attached tree changed, since loading.
+
+        A tree counts as changed unless it has a false `modified` attribute.
+        """
+        changed = set(self._written)
+        changed.update(
+            name
+            for name, tree in self._trees.items()
+            if getattr(tree, "modified", True)
+        )
+        return changed
+
+    def read(self, name):
+        """Return the bytes of a part, serializing its attached tree if any.
+
+        Raises:
+            KeyError: If the part does not exist
+        """
+        tree = self._trees.get(name)
+        if tree is not None and (
+            getattr(tree, "modified", True) or name not in self._parts
+        ):
+            return tree.serialize()
+        if name not in self._parts:
+            file = self._file(name)
+            if file is None:
+                raise KeyError(f"Part not found: {name}")
+            self._parts[name] = file.read_bytes()
+        if name in self._pretty_pending:
+            self._pretty_pending.discard(name)
+            self._parts[name] = prettify_xml_content(self._parts[name])
+        return self._parts[name]
+
+    def write(self, name, data):
+        """Replace a part's content with bytes, detaching any attached tree."""
+        if name not in self._originals:
+            self._originals[name] = self._loaded(name)
+        self._trees.pop(name, None)
+        self._pretty_pending.discard(name)
+        self._parts[name] = bytes(data)
+        self._written.add(name)
+
+    def _loaded(self, name):
+        """Return a part's bytes as loaded (ignoring attached trees), or None."""
+        if name in self._parts:
+            return self._parts[name]
+        file = self._file(name)
+        return file.read_bytes() if file is not None else None
+
+    def _file(self, name):
+        """Return the file backing a part in the package's directories, or None."""
+        for base_dir in self._base_dirs:
+            file = base_dir / name
+            if file.is_file():
+                return file
+        return None
+
+    def attach(self, name, tree):
+        """Make a parsed tree the live content of a part.
+
+        Until the tree reports itself modified (see `modified`), reads and saves
+        use the part's existing bytes instead of serializing the tree.
+
+        Args:
+            name: Part name
+            tree: Object with a serialize() method returning the part's bytes,
+                and optionally a `modified` flag
+        """
+        self._trees[name] = tree
+
+    def copy(self):
+        """Return an independent snapshot of the current package contents.
+
+        Loaded bytes are shared (they are immutable) and parts still pending
+        pretty-printing stay pending, so a snapshot costs no parsing.
+        """
+        snapshot = OfficePackage()
+        for name in self.names():
+            if name in self._trees or name not in self._parts:
+                snapshot._parts[name] = self.read(name)
+            else:
+                snapshot._parts[name] = self._parts[name]
+        snapshot._pretty_pending = self._pretty_pending & snapshot._parts.keys()
+        modified = self.modified
+        snapshot._packed = {
+            name: data for name, data in self._packed.items() if name not in modified
+        }
+        return snapshot
+
+    def original(self):
+        """Return the package as loaded, before any writes or tree edits.
+
+        Attached trees never touch the loaded bytes and write() keeps what it
+        replaces, so nothing is copied up front; parts added since loading
+        are left out.
+        """
+        snapshot = OfficePackage(path=self.path)
+        snapshot._base_dirs = self._base_dirs
+        for name in self._parts:
+            data = self._originals.get(name, self._parts[name])
+            if data is not None:
+                snapshot._parts[name] = data
+        return snapshot
+
+    def save(self, path=None, condense=True):
+        """Write the package as a zip file.
+
+        Args:
+            path: Output file (default: the file the package was opened from)
+            condense: If True, strip pretty-printing whitespace from XML parts
+                the same way pack.py does
+        """
+        path = Path(path) if path else self.path
+        if path is None:
+            raise ValueError("No output path given and package has no source file")
+
+        # [Content_Types].xml goes first, as Office itself writes it
+        names = sorted(self.names(), key=lambda n: n != CONTENT_TYPES_PART)
+        modified = self.modified
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name in names:
+                if name in self._packed and name not in modified:
+                    # Untouched: copy the source bytes, no re-serializing
+                    zf.writestr(name, self._packed[name])
+                    continue
+                data = self.read(name)
+                if condense and name.endswith(XML_SUFFIXES):
+                    data = condense_xml_content(data)
+                zf.writestr(name, data)
+
+    def extract(self, directory, names=None, pretty=False):
+        """Write parts to a directory (a debugging view of the package).
+
+        Args:
+            directory: Target directory (created if missing)
+            names: Optional iterable of part names to write (default: all)
+            pretty: If True, pretty-print XML parts like unpack.py
+
+        Raises:
+            ValueError: If a part would be written outside the directory
+        """
+        directory = Path(directory)
+        root = directory.resolve()
+        for name in self.names() if names is None else names:
+            target = directory / name
+            if not target.resolve().is_relative_to(root):
+                raise ValueError(f"Part outside the target directory: {name}")
+            data = self.read(name)
+            if pretty and name.endswith(XML_SUFFIXES):
+                data = prettify_xml_content(data)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # Replace rather than overwrite, so hardlinked copies stay untouched
+            target.unlink(missing_ok=True)
+            target.write_bytes(data)
+
+
+def _checked_name(name):
+    """Return a zip entry name, refusing ones that could escape a directory."""
+    parts = name.replace("\\", "/").split("/")
+    if name.startswith(("/", "\\")) or ":" in parts[0] or ".." in parts:
+        raise ValueError(f"Unsafe part name in package: {name}")
+    return name
+
+
+def prettify_xml_content(content):
+    """Pretty-print XML bytes the way unpack.py does (ascii, 2-space indent)."""
+    dom = defusedxml.minidom.parseString(content)
+    return dom.toprettyxml(indent="  ", encoding="ascii")
+
+
+def condense_xml_content(content):
+    """Strip pretty-printing whitespace and comments from XML bytes.
+
+    Text inside *:t elements (w:t, a:t, ...) is left untouched.
+    """
+    dom = defusedxml.minidom.parseString(content)
+
+    # Process each element to remove whitespace and comments
+    for element in dom.getElementsByTagName("*"):
+        # Skip w:t elements and their processing
+        if element.tagName.endswith(":t"):
+            continue
+
+        # Remove whitespace-only text nodes and comment nodes. The DOM is only
+        # serialized afterwards, so the child list is rebuilt in one pass rather
+        # than with removeChild, which rescans it for every node (quadratic on
+        # a body with tens of thousands of paragraphs).
+        kept = [
+            child
+            for child in element.childNodes
+            if not (
+                child.nodeType == child.TEXT_NODE
+                and child.nodeValue
+                and child.nodeValue.strip() == ""
+            )
+            and child.nodeType != child.COMMENT_NODE
+        ]
+        if len(kept) != len(element.childNodes):
+            element.childNodes[:] = kept
+
+    return dom.toxml(encoding="UTF-8")
@@ -0,0 +1,48 @@
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from office_package import OfficePackage
+
+
+class TestUnsafePartNames(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+
+    def write_zip(self, name):
+        path = self.root / "package.docx"
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("word/document.xml", "<document/>")
+            zf.writestr(name, "escaped")
+        return path
+
+    def test_open_rejects_unsafe_entry_names(self):
+        """Entries that are absolute or contain '..' are refused on open"""
+        for name in ("../escaped.txt", "word/../../escaped.txt", "/etc/escaped.txt"):
+            with self.subTest(name=name):
+                with self.assertRaises(ValueError):
+                    OfficePackage.open(self.write_zip(name))
+        self.assertFalse((self.root / "escaped.txt").exists())
+
+    def test_extract_refuses_parts_outside_directory(self):
+        """Parts added in memory are not written outside the target directory"""
+        package = OfficePackage({"word/document.xml": b"<document/>"})
+        package.write("../escaped.txt", b"escaped")
+        with self.assertRaises(ValueError):
+            package.extract(self.root / "unpacked")
+        self.assertFalse((self.root / "escaped.txt").exists())
+
+    def test_extract_writes_regular_parts(self):
+        package = OfficePackage.open(self.write_zip("word/media/image1.png"))
+        package.extract(self.root / "unpacked")
+        self.assertEqual(
+            (self.root / "unpacked/word/media/image1.png").read_bytes(), b"escaped"
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,14 +7,18 @@ Example usage:
 """
 
 import argparse
-import shutil
 import subprocess
 import sys
 import tempfile
-import defusedxml.minidom
-import zipfile
 from pathlib import Path
 
+try:
+    from .office_package import OfficePackage, condense_xml_content
+    from .soffice_pool import SofficePoolError, convert, pool_available
+except ImportError:
+    from office_package import OfficePackage, condense_xml_content
+    from soffice_pool import SofficePoolError, convert, pool_available
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
@@ -61,34 +65,24 @@ def pack_document(input_dir, output_file, validate=False):
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    # XML is condensed in memory while zipping; the input directory is untouched
+    OfficePackage.from_directory(input_dir).save(output_file)
+
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file):
+            output_file.unlink()  # Delete the corrupt file
+            return False
 
     return True
 
 
 def validate_document(doc_path):
-    """Validate document by converting to HTML with soffice."""
+    """Validate document by converting to HTML with soffice.
+
+    Uses a warm instance from the soffice_pool service when one is running,
+    otherwise cold-starts soffice for this document.
+    """
     # Determine the correct filter based on file extension
     match doc_path.suffix.lower():
         case ".docx":
@@ -99,6 +93,14 @@ def validate_document(doc_path):
             filter_name = "html:HTML (StarCalc)"
 
     with tempfile.TemporaryDirectory() as temp_dir:
+        if pool_available():
+            try:
+                convert(doc_path, filter_name, temp_dir, timeout=10)
+                return True
+            except SofficePoolError as e:
+                print(f"Validation error: {e}", file=sys.stderr)
+                return False
+
         try:
             result = subprocess.run(
                 [
@@ -132,27 +134,8 @@ def validate_document(doc_path):
 
 def condense_xml(xml_file):
     """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
-
-    # Process each element to remove whitespace and comments
-    for element in dom.getElementsByTagName("*"):
-        # Skip w:t elements and their processing
-        if element.tagName.endswith(":t"):
-            continue
-
-        # Remove whitespace-only text nodes and comment nodes
-        for child in list(element.childNodes):
-            if (
-                child.nodeType == child.TEXT_NODE
-                and child.nodeValue
-                and child.nodeValue.strip() == ""
-            ) or child.nodeType == child.COMMENT_NODE:
-                element.removeChild(child)
-
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+    xml_file = Path(xml_file)
+    xml_file.write_bytes(condense_xml_content(xml_file.read_bytes()))
 
 
 if __name__ == "__main__":
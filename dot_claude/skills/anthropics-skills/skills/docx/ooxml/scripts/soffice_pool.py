@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""
+Pooled headless LibreOffice conversion service.
+
+Cold-starting `soffice --headless` takes several seconds per document, which
+dominates validation, thumbnailing and formula recalculation. This module keeps
+a pool of warm LibreOffice instances, each with its own user profile and UNO
+socket, behind a small local service. Clients send newline-delimited JSON
+requests over a Unix socket; callers fall back to a cold `soffice` process when
+the service is not running.
+
+Example usage:
+    # Start the service (the interpreter must provide the `uno` module,
+    # e.g. /usr/bin/python3 with python3-uno, or LibreOffice's bundled python)
+    python soffice_pool.py serve --size 4
+
+    # Compare cold-start and pooled per-document latency
+    python soffice_pool.py bench report.docx deck.pptx --convert-to pdf
+
+    # From Python
+    from soffice_pool import pool_available, convert, recalc
+    if pool_available():
+        pdf_path = convert("deck.pptx", "pdf", "/tmp/out")
+        recalc("model.xlsx")
+"""
+
+import argparse
+import json
+import os
+import queue
+import shutil
+import signal
+import socket
+import socketserver
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+SOCKET_ENV_VAR = "SOFFICE_POOL_SOCKET"
+DEFAULT_POOL_SIZE = min(4, os.cpu_count() or 1)
+STARTUP_TIMEOUT = 60  # Seconds to wait for a new instance to accept UNO connections
+QUEUE_TIMEOUT = 120  # Seconds a request may wait for an idle instance
+
+# Default export filters per output extension, keyed by LibreOffice document service
+DEFAULT_FILTERS = {
+    "pdf": {
+        "com.sun.star.presentation.PresentationDocument": "impress_pdf_Export",
+        "com.sun.star.sheet.SpreadsheetDocument": "calc_pdf_Export",
+        "com.sun.star.drawing.DrawingDocument": "draw_pdf_Export",
+        "com.sun.star.text.TextDocument": "writer_pdf_Export",
+    },
+    "html": {
+        "com.sun.star.presentation.PresentationDocument": "impress_html_Export",
+        "com.sun.star.sheet.SpreadsheetDocument": "HTML (StarCalc)",
+        "com.sun.star.text.TextDocument": "HTML (StarWriter)",
+    },
+}
+
+
+class SofficePoolError(RuntimeError):
+    """Raised when the conversion service rejects or fails a request."""
+
+
+# ==================== Client ====================
+
+
+def default_socket_path():
+    """Return the service socket path ($SOFFICE_POOL_SOCKET or a per-user default)."""
+    if os.environ.get(SOCKET_ENV_VAR):
+        return Path(os.environ[SOCKET_ENV_VAR])
+    return Path(tempfile.gettempdir()) / f"soffice-pool-{os.getuid()}.sock"
+
+
+def pool_available(socket_path=None):
+    """Check whether a conversion service is listening and responsive."""
+    socket_path = Path(socket_path or default_socket_path())
+    if not socket_path.exists():
+        return False
+    try:
+        return _request({"op": "ping"}, timeout=2, socket_path=socket_path)["ok"]
+    except (OSError, SofficePoolError, ValueError):
+        return False
+
+
+def convert(path, convert_to, outdir, timeout=30, socket_path=None):
+    """Convert a document with a pooled instance.
+
+    Args:
+        path: Document to convert
+        convert_to: Target in `soffice --convert-to` syntax ("pdf", "html:HTML", ...)
+        outdir: Directory for the converted file (named after the input stem)
+        timeout: Maximum seconds the conversion may run
+        socket_path: Optional service socket (default: default_socket_path())
+
+    Returns:
+        Path: The converted file
+
+    Raises:
+        SofficePoolError: If the service is unreachable or the conversion failed
+    """
+    response = _request(
+        {
+            "op": "convert",
+            "path": str(Path(path).absolute()),
+            "convert_to": convert_to,
+            "outdir": str(Path(outdir).absolute()),
+            "timeout": timeout,
+        },
+        timeout=timeout + QUEUE_TIMEOUT,
+        socket_path=socket_path,
+    )
+    return Path(response["output"])
+
+
+def recalc(path, timeout=30, socket_path=None):
+    """Recalculate all formulas in a spreadsheet and store it in place.
+
+    Raises:
+        SofficePoolError: If the service is unreachable or recalculation failed
+    """
+    _request(
+        {"op": "recalc", "path": str(Path(path).absolute()), "timeout": timeout},
+        timeout=timeout + QUEUE_TIMEOUT,
+        socket_path=socket_path,
+    )
+
+
+def _request(payload, timeout, socket_path=None):
+    """Send one JSON request to the service and return its decoded response."""
+    socket_path = Path(socket_path or default_socket_path())
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(socket_path))
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as stream:
+                line = stream.readline()
+    except OSError as e:
+        raise SofficePoolError(f"Conversion service unavailable: {e}") from e
+
+    if not line:
+        raise SofficePoolError("Conversion service closed the connection")
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise SofficePoolError(response.get("error", "Unknown conversion error"))
+    return response
+
+
+# ==================== Server ====================
+
+
+class _Instance:
+    """One warm soffice process with its own profile and UNO socket."""
+
+    def __init__(self, index, profile_root, soffice="soffice"):
+        self.index = index
+        self.soffice = soffice
+        self.profile_dir = Path(profile_root) / f"profile-{index}"
+        self.port = None
+        self.process = None
+        self.desktop = None
+
+    def start(self):
+        """Launch soffice and connect to it over UNO."""
+        import uno
+
+        self.port = _free_port()
+        self.process = subprocess.Popen(
+            [
+                self.soffice,
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--nodefault",
+                "--norestore",
+                "--nolockcheck",
+                f"--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext",
+                f"-env:UserInstallation={self.profile_dir.as_uri()}",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        local_ctx = uno.getComponentContext()
+        resolver = local_ctx.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_ctx
+        )
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            if self.process.poll() is not None:
+                raise SofficePoolError(
+                    f"soffice instance {self.index} exited during startup"
+                )
+            try:
+                ctx = resolver.resolve(
+                    f"uno:socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext"
+                )
+                break
+            except Exception:
+                if time.monotonic() > deadline:
+                    self.stop()
+                    raise SofficePoolError(
+                        f"soffice instance {self.index} did not accept connections"
+                    )
+                time.sleep(0.25)
+
+        self.desktop = ctx.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", ctx
+        )
+
+    def stop(self):
+        """Terminate the soffice process (the profile is kept for reuse)."""
+        self.desktop = None
+        if self.process and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+
+    def restart(self):
+        self.stop()
+        self.start()
+
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def convert(self, path, convert_to, outdir):
+        """Load `path` and store it into `outdir` using the requested filter."""
+        import uno
+
+        extension, _, filter_name = convert_to.partition(":")
+        doc = self._load(path)
+        try:
+            if not filter_name:
+                filter_name = _default_filter(doc, extension)
+            output = Path(outdir) / f"{Path(path).stem}.{extension}"
+            doc.storeToURL(
+                uno.systemPathToFileUrl(str(output)), _props(FilterName=filter_name)
+            )
+        finally:
+            doc.close(True)
+        return output
+
+    def recalc(self, path):
+        """Recalculate all formulas and store the document in its own format."""
+        doc = self._load(path)
+        try:
+            doc.calculateAll()
+            doc.store()
+        finally:
+            doc.close(True)
+
+    def _load(self, path):
+        import uno
+
+        doc = self.desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(str(path)), "_blank", 0, _props(Hidden=True)
+        )
+        if doc is None:
+            raise SofficePoolError(f"Could not load {path}")
+        return doc
+
+
+class SofficePool:
+    """Fixed-size pool of warm soffice instances with queueing and recovery.
+
+    Requests wait for an idle instance (up to queue_timeout seconds). Each job
+    runs under a watchdog; an instance that exceeds the job timeout is killed
+    and restarted, as is any instance found dead before or after a job.
+    """
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, profile_root=None, soffice="soffice"):
+        self.profile_root = Path(
+            profile_root or tempfile.mkdtemp(prefix="soffice-pool-profiles-")
+        )
+        self.instances = [
+            _Instance(i, self.profile_root, soffice=soffice) for i in range(size)
+        ]
+        self._idle = queue.Queue()
+
+    def start(self):
+        for instance in self.instances:
+            instance.start()
+            self._idle.put(instance)
+
+    def shutdown(self):
+        for instance in self.instances:
+            instance.stop()
+        shutil.rmtree(self.profile_root, ignore_errors=True)
+
+    def run(self, job, timeout, queue_timeout=QUEUE_TIMEOUT):
+        """Run `job(instance)` on an idle instance and return its result.
+
+        Raises:
+            SofficePoolError: On queue timeout, job timeout or instance crash
+        """
+        try:
+            instance = self._idle.get(timeout=queue_timeout)
+        except queue.Empty:
+            raise SofficePoolError("All soffice instances are busy")
+
+        try:
+            if not instance.alive():
+                instance.restart()
+
+            timed_out = threading.Event()
+
+            def on_timeout():
+                timed_out.set()
+                instance.stop()
+
+            watchdog = threading.Timer(timeout, on_timeout)
+            watchdog.start()
+            try:
+                return job(instance)
+            except Exception as e:
+                if timed_out.is_set():
+                    raise SofficePoolError("Timeout during conversion") from e
+                if isinstance(e, SofficePoolError):
+                    raise
+                raise SofficePoolError(f"{type(e).__name__}: {e}") from e
+            finally:
+                watchdog.cancel()
+        finally:
+            if not instance.alive():
+                try:
+                    instance.restart()
+                except SofficePoolError as e:
+                    print(f"Warning: {e}", file=sys.stderr)
+            self._idle.put(instance)
+
+    def handle(self, request):
+        """Dispatch one decoded request and return the response dict."""
+        op = request.get("op")
+        timeout = float(request.get("timeout", 30))
+        if op == "ping":
+            return {"ok": True, "size": len(self.instances)}
+        if op == "convert":
+            output = self.run(
+                lambda inst: inst.convert(
+                    request["path"], request["convert_to"], request["outdir"]
+                ),
+                timeout,
+            )
+            return {"ok": True, "output": str(output)}
+        if op == "recalc":
+            self.run(lambda inst: inst.recalc(request["path"]), timeout)
+            return {"ok": True}
+        raise SofficePoolError(f"Unknown operation: {op}")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            response = self.server.pool.handle(json.loads(line))  # type: ignore
+        except (SofficePoolError, KeyError, ValueError) as e:
+            response = {"ok": False, "error": str(e)}
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class _PoolServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(size=DEFAULT_POOL_SIZE, socket_path=None, soffice="soffice"):
+    """Start the pool and serve requests until interrupted."""
+    socket_path = Path(socket_path or default_socket_path())
+    if socket_path.exists():
+        if pool_available(socket_path):
+            raise SofficePoolError(f"A service is already listening on {socket_path}")
+        socket_path.unlink()
+
+    pool = SofficePool(size=size, soffice=soffice)
+    print(f"Starting {size} soffice instance(s)...")
+    pool.start()
+
+    server = _PoolServer(str(socket_path), _RequestHandler)
+    server.pool = pool  # type: ignore
+
+    def on_sigterm(*_):
+        # shutdown() blocks until serve_forever() returns, so call it off-thread
+        threading.Thread(target=server.shutdown).start()
+
+    signal.signal(signal.SIGTERM, on_sigterm)
+    print(f"Listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+        pool.shutdown()
+
+
+# ==================== Helpers ====================
+
+
+def _props(**kwargs):
+    """Build a tuple of UNO PropertyValues from keyword arguments."""
+    from com.sun.star.beans import PropertyValue  # type: ignore
+
+    props = []
+    for name, value in kwargs.items():
+        prop = PropertyValue()
+        prop.Name = name
+        prop.Value = value
+        props.append(prop)
+    return tuple(props)
+
+
+def _default_filter(doc, extension):
+    """Pick the export filter for `extension` based on the loaded document type."""
+    for service, filter_name in DEFAULT_FILTERS.get(extension, {}).items():
+        if doc.supportsService(service):
+            return filter_name
+    raise SofficePoolError(
+        f"No default filter for '{extension}'; use the 'ext:FilterName' syntax"
+    )
+
+
+def _free_port():
+    """Ask the OS for a free localhost TCP port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _benchmark(files, convert_to, runs):
+    """Print per-document latency for cold `soffice` vs. the pooled service."""
+    if not pool_available():
+        sys.exit(f"Error: no conversion service at {default_socket_path()}")
+
+    cold_times, pooled_times = [], []
+    print(f"{'document':40} {'cold (s)':>10} {'pooled (s)':>11} {'speedup':>8}")
+    for file in files:
+        cold, pooled = [], []
+        for _ in range(runs):
+            with tempfile.TemporaryDirectory() as temp_dir:
+                start = time.perf_counter()
+                subprocess.run(
+                    [
+                        "soffice",
+                        "--headless",
+                        "--convert-to",
+                        convert_to,
+                        "--outdir",
+                        temp_dir,
+                        str(file),
+                    ],
+                    capture_output=True,
+                )
+                cold.append(time.perf_counter() - start)
+
+            with tempfile.TemporaryDirectory() as temp_dir:
+                start = time.perf_counter()
+                convert(file, convert_to, temp_dir)
+                pooled.append(time.perf_counter() - start)
+
+        cold_s, pooled_s = statistics.median(cold), statistics.median(pooled)
+        cold_times.append(cold_s)
+        pooled_times.append(pooled_s)
+        print(
+            f"{Path(file).name[:40]:40} {cold_s:10.2f} {pooled_s:11.2f} {cold_s / pooled_s:7.1f}x"
+        )
+
+    cold_s, pooled_s = statistics.median(cold_times), statistics.median(pooled_times)
+    print(f"{'median':40} {cold_s:10.2f} {pooled_s:11.2f} {cold_s / pooled_s:7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pooled LibreOffice conversion service"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Run the conversion service")
+    serve_parser.add_argument(
+        "--size",
+        type=int,
+        default=DEFAULT_POOL_SIZE,
+        help=f"Number of warm soffice instances (default: {DEFAULT_POOL_SIZE})",
+    )
+    serve_parser.add_argument("--socket", help="Unix socket path to listen on")
+    serve_parser.add_argument("--soffice", default="soffice", help="soffice binary")
+
+    bench_parser = subparsers.add_parser(
+        "bench", help="Compare cold-start and pooled per-document latency"
+    )
+    bench_parser.add_argument("files", nargs="+", help="Documents to convert")
+    bench_parser.add_argument(
+        "--convert-to", default="pdf", help="Target format (default: pdf)"
+    )
+    bench_parser.add_argument(
+        "--runs", type=int, default=3, help="Runs per document (default: 3)"
+    )
+
+    args = parser.parse_args()
+    try:
+        if args.command == "serve":
+            serve(size=args.size, socket_path=args.socket, soffice=args.soffice)
+        else:
+            _benchmark(args.files, args.convert_to, args.runs)
+    except SofficePoolError as e:
+        sys.exit(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
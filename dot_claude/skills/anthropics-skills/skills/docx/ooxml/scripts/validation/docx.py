@@ -36,12 +36,15 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         if not self.validate_unique_ids():
             all_valid = False
 
+        # Tests 3-4 only matter if the package structure may have changed
+        package_changed = self.package_changed()
+
         # Test 3: Relationship and file reference validation
-        if not self.validate_file_references():
+        if package_changed and not self.validate_file_references():
             all_valid = False
 
         # Test 4: Content type declarations
-        if not self.validate_content_types():
+        if package_changed and not self.validate_content_types():
             all_valid = False
 
         # Test 5: XSD schema validation
@@ -65,7 +68,8 @@ class DOCXSchemaValidator(BaseSchemaValidator):
             all_valid = False
 
         # Count and compare paragraphs
-        self.compare_paragraph_counts()
+        if self.parts is None or "word/document.xml" in self.parts:
+            self.compare_paragraph_counts()
 
         return all_valid
 
@@ -75,7 +79,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         """
         errors = []
 
-        for xml_file in self.xml_files:
+        for xml_file in self.checked_files:
             # Only check document.xml files
             if xml_file.name != "document.xml":
                 continue
@@ -128,7 +132,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         """
         errors = []
 
-        for xml_file in self.xml_files:
+        for xml_file in self.checked_files:
             # Only check document.xml files
             if xml_file.name != "document.xml":
                 continue
@@ -220,7 +224,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         """
         errors = []
 
-        for xml_file in self.xml_files:
+        for xml_file in self.checked_files:
             if xml_file.name != "document.xml":
                 continue
 
@@ -230,8 +234,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
 
                 # Find w:delText in w:ins that are NOT within w:del
                 invalid_elements = root.xpath(
-                    ".//w:ins//w:delText[not(ancestor::w:del)]",
-                    namespaces=namespaces
+                    ".//w:ins//w:delText[not(ancestor::w:del)]", namespaces=namespaces
                 )
 
                 for elem in invalid_elements:
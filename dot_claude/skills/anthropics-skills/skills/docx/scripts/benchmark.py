@@ -0,0 +1,654 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the docx editing library.
+
+Each measurement runs in a fresh child process so load time, save time and
+peak memory of one configuration are not skewed by another.
+
+Example usage:
+    # Compare XML backends on a synthetic 20k-paragraph document.xml
+    PYTHONPATH=<docx skill dir> python -m scripts.benchmark backends --paragraphs 20000
+
+    # Compare XML backends on an unpacked document
+    PYTHONPATH=<docx skill dir> python -m scripts.benchmark backends unpacked/word/document.xml
+
+    # Time attribute injection for a 10k-run insertion
+    PYTHONPATH=<docx skill dir> python -m scripts.benchmark inject --runs 10000
+
+    # Time suggest_replacements with 500 edits on a 20k-paragraph document.xml
+    PYTHONPATH=<docx skill dir> python -m scripts.benchmark replace --paragraphs 20000 --edits 500
+
+    # Time suggest_diff redlining 500 changed paragraphs of a 50k-paragraph document
+    PYTHONPATH=<docx skill dir> python -m scripts.benchmark redline --paragraphs 50000 --changes 500
+
+    # Compare mail_merge with parsing and saving the template once per record
+    PYTHONPATH=<docx skill dir> python -m scripts.benchmark merge --records 5000
+
+    # Compare add_comment in a loop with one add_comments call
+    PYTHONPATH=<docx skill dir> python -m scripts.benchmark comments report.docx --count 2000
+
+    # Compare docx_to_markdown with pandoc on a synthetic 50k-paragraph .docx
+    PYTHONPATH=<docx skill dir> python -m scripts.benchmark markdown --paragraphs 50000
+"""
+
+import argparse
+import multiprocessing
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+from ooxml.scripts.office_package import OfficePackage
+
+from .document import Document, DocxXMLEditor, IdAllocator, LxmlDocxXMLEditor
+from .docx_to_markdown import docx_to_markdown
+from .mail_merge import mail_merge
+
+BACKENDS = {"minidom": DocxXMLEditor, "lxml": LxmlDocxXMLEditor}
+
+W_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W14_NAMESPACE = "http://schemas.microsoft.com/office/word/2010/wordml"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the docx library")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    backends = subparsers.add_parser(
+        "backends", help="Compare minidom and lxml editor backends"
+    )
+    backends.add_argument(
+        "xml_file", nargs="?", help="document.xml to load (default: synthetic)"
+    )
+    backends.add_argument(
+        "--paragraphs", type=int, default=10000, help="Synthetic paragraph count"
+    )
+    backends.add_argument(
+        "--runs", type=int, default=3, help="Runs per synthetic paragraph"
+    )
+
+    inject = subparsers.add_parser(
+        "inject", help="Time RSID/author attribute injection on inserted runs"
+    )
+    inject.add_argument(
+        "--runs", type=int, default=10000, help="Runs in the inserted fragment"
+    )
+
+    replace = subparsers.add_parser(
+        "replace", help="Time suggest_replacements on a synthetic document"
+    )
+    replace.add_argument(
+        "--paragraphs", type=int, default=10000, help="Synthetic paragraph count"
+    )
+    replace.add_argument(
+        "--edits", type=int, default=100, help="Number of (match, replacement) edits"
+    )
+
+    redline = subparsers.add_parser(
+        "redline", help="Time suggest_diff between two synthetic documents"
+    )
+    redline.add_argument(
+        "--paragraphs", type=int, default=10000, help="Synthetic paragraph count"
+    )
+    redline.add_argument(
+        "--changes", type=int, default=100, help="Paragraphs changed in the revision"
+    )
+
+    merge = subparsers.add_parser(
+        "merge", help="Compare mail_merge with a per-record parse/save loop"
+    )
+    merge.add_argument(
+        "--records", type=int, default=2000, help="Number of documents to render"
+    )
+    merge.add_argument(
+        "--paragraphs", type=int, default=200, help="Template paragraph count"
+    )
+
+    comments = subparsers.add_parser(
+        "comments", help="Compare add_comment in a loop with add_comments"
+    )
+    comments.add_argument("docx_file", help="Document to comment on")
+    comments.add_argument(
+        "--count", type=int, default=1000, help="Number of comments to add"
+    )
+
+    markdown = subparsers.add_parser(
+        "markdown", help="Compare docx_to_markdown with pandoc text extraction"
+    )
+    markdown.add_argument(
+        "docx_file", nargs="?", help="Document to convert (default: synthetic)"
+    )
+    markdown.add_argument(
+        "--paragraphs", type=int, default=10000, help="Synthetic paragraph count"
+    )
+
+    args = parser.parse_args()
+    if args.command == "backends":
+        benchmark_backends(args.xml_file, args.paragraphs, args.runs)
+    elif args.command == "inject":
+        benchmark_inject(args.runs)
+    elif args.command == "replace":
+        benchmark_replace(args.paragraphs, args.edits)
+    elif args.command == "redline":
+        benchmark_redline(args.paragraphs, args.changes)
+    elif args.command == "merge":
+        benchmark_merge(args.records, args.paragraphs)
+    elif args.command == "comments":
+        benchmark_comments(args.docx_file, args.count)
+    elif args.command == "markdown":
+        benchmark_markdown(args.docx_file, args.paragraphs)
+
+
+def benchmark_backends(xml_file=None, paragraphs=10000, runs=3):
+    """Print load time, save time and peak RSS of each editor backend.
+
+    Args:
+        xml_file: document.xml to load; a synthetic one is generated if omitted
+        paragraphs: Paragraph count of the synthetic document
+        runs: Runs per paragraph of the synthetic document
+
+    Returns:
+        dict: Backend name to {"load", "save", "peak_rss_mb"} measurements
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if xml_file is None:
+            xml_file = Path(temp_dir) / "document.xml"
+            xml_file.write_text(synthetic_document_xml(paragraphs, runs))
+        size_mb = Path(xml_file).stat().st_size / 2**20
+        print(f"{xml_file}: {size_mb:.1f} MB")
+
+        results = {}
+        for name in BACKENDS:
+            # Save to a copy so the input stays untouched between backends
+            output_file = Path(temp_dir) / f"{name}.xml"
+            results[name] = _in_child_process(
+                _measure_backend, name, xml_file, output_file
+            )
+
+    print(f"{'backend':<10}{'load (s)':>10}{'save (s)':>10}{'peak RSS (MB)':>15}")
+    for name, result in results.items():
+        print(
+            f"{name:<10}{result['load']:>10.2f}{result['save']:>10.2f}"
+            f"{result['peak_rss_mb']:>15.0f}"
+        )
+    return results
+
+
+def benchmark_inject(runs=10000):
+    """Print the time to insert a fragment of runs, and the attribute injection share.
+
+    The fragment has 10 runs per paragraph; every tenth paragraph is a
+    deletion (with its w:id preset), so both w:rsidR and w:rsidDel paths are
+    exercised. It is inserted once as sibling paragraphs and once as a
+    single table holding them.
+
+    Args:
+        runs: Number of w:r elements in the inserted fragment
+
+    Returns:
+        dict: (backend, shape) to {"insert", "inject"} timings in seconds
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        xml_file = Path(temp_dir) / "document.xml"
+        xml_file.write_text(synthetic_document_xml(paragraphs=100, runs=3))
+
+        results = {
+            (name, shape): _in_child_process(
+                _measure_inject, name, xml_file, runs, shape
+            )
+            for name in BACKENDS
+            for shape in ("paragraphs", "table")
+        }
+
+    print(f"Inserting {runs} runs")
+    print(f"{'backend':<10}{'shape':<12}{'insert (s)':>12}{'inject (s)':>12}")
+    for (name, shape), result in results.items():
+        print(
+            f"{name:<10}{shape:<12}{result['insert']:>12.3f}{result['inject']:>12.3f}"
+        )
+    return results
+
+
+def benchmark_replace(paragraphs=10000, edits=100):
+    """Print the time to apply edits as tracked changes with suggest_replacements.
+
+    Each edit matches text spanning two runs of one synthetic paragraph, so
+    every replacement splits runs.
+
+    Args:
+        paragraphs: Paragraph count of the synthetic document (3 runs each)
+        edits: Number of (match, replacement) pairs
+
+    Returns:
+        dict: Backend name to {"seconds", "replaced"}
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        xml_file = Path(temp_dir) / "document.xml"
+        xml_file.write_text(synthetic_document_xml(paragraphs, runs=3))
+        step = max(paragraphs // edits, 1)
+        pairs = [
+            (f"{i} run 0 Paragraph {i} run", f"{i} run 0, Paragraph {i}, run")
+            for i in range(0, paragraphs, step)[:edits]
+        ]
+        results = {
+            name: _in_child_process(_measure_replace, name, xml_file, pairs)
+            for name in BACKENDS
+        }
+
+    print(f"{len(pairs)} edits on {paragraphs} paragraphs")
+    print(f"{'backend':<10}{'time (s)':>10}{'replaced':>10}")
+    for name, result in results.items():
+        print(f"{name:<10}{result['seconds']:>10.2f}{result['replaced']:>10}")
+    return results
+
+
+def benchmark_redline(paragraphs=10000, changes=100):
+    """Print the time to redline a synthetic document against its revision.
+
+    The revision rewords one word in most changed paragraphs, and deletes or
+    inserts a paragraph in place of every fifth one.
+
+    Args:
+        paragraphs: Paragraph count of the synthetic document (3 runs each)
+        changes: Number of paragraphs changed in the revision
+
+    Returns:
+        dict: Backend name to {"seconds", "counts"}
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        original = Path(temp_dir) / "original.xml"
+        revised = Path(temp_dir) / "revised.xml"
+        xml = synthetic_document_xml(paragraphs, runs=3)
+        original.write_text(xml)
+        revised.write_text(_synthetic_revision(xml, paragraphs, changes))
+        results = {
+            name: _in_child_process(_measure_redline, name, original, revised)
+            for name in BACKENDS
+        }
+
+    print(f"{changes} changes on {paragraphs} paragraphs")
+    print(f"{'backend':<10}{'time (s)':>10}  counts")
+    for name, result in results.items():
+        print(f"{name:<10}{result['seconds']:>10.2f}  {result['counts']}")
+    return results
+
+
+def benchmark_merge(records=2000, paragraphs=200):
+    """Print docs/s of mail_merge and of a per-record parse, edit and save loop.
+
+    The loop (how merging works with the editor library) only renders a sample
+    of the records, as it is far slower. It replaces placeholders within one
+    w:t only, leaving the split ones unfilled.
+
+    Args:
+        records: Number of documents mail_merge renders
+        paragraphs: Paragraph count of the synthetic template; every tenth has
+            placeholders, half of them split across runs
+
+    Returns:
+        dict: Method name to docs/s
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        template = Path(temp_dir) / "template.docx"
+        _write_synthetic_template(template, paragraphs)
+        rows = [
+            {"name": f"Customer {i}", "amount": f"{i}.00", "ref": f"R-{i:06d}"}
+            for i in range(records)
+        ]
+        sample = rows[: max(records // 20, 10)]
+        output_dir = Path(temp_dir) / "out"
+        results = {
+            "parse/save loop": _in_child_process(
+                _measure_merge_loop, template, sample, output_dir
+            ),
+            "mail_merge (1 process)": _in_child_process(
+                _measure_merge, template, rows, output_dir, 1
+            ),
+        }
+        processes = multiprocessing.cpu_count()
+        if processes > 1:
+            results[f"mail_merge ({processes} processes)"] = _in_child_process(
+                _measure_merge, template, rows, output_dir, processes
+            )
+
+    print(f"{records} documents from a {paragraphs}-paragraph template")
+    print(f"{'method':<28}{'docs/s':>10}")
+    for name, docs_per_second in results.items():
+        print(f"{name:<28}{docs_per_second:>10.0f}")
+    return results
+
+
+def benchmark_comments(docx_file, count=1000):
+    """Print the time to add comments one by one and as a single batch.
+
+    Comments are anchored to the document's paragraphs in order, wrapping
+    around if there are fewer paragraphs than comments.
+
+    Args:
+        docx_file: .docx file to comment on (left untouched)
+        count: Number of comments to add
+
+    Returns:
+        dict: (backend, mode) to seconds spent adding the comments
+    """
+    results = {
+        (name, mode): _in_child_process(_measure_comments, name, docx_file, count, mode)
+        for name in BACKENDS
+        for mode in ("add_comment", "add_comments")
+    }
+
+    print(f"Adding {count} comments to {docx_file}")
+    print(f"{'backend':<10}{'mode':<14}{'time (s)':>10}")
+    for (name, mode), seconds in results.items():
+        print(f"{name:<10}{mode:<14}{seconds:>10.2f}")
+    return results
+
+
+def benchmark_markdown(docx_file=None, paragraphs=10000):
+    """Print time, throughput and peak RSS of docx_to_markdown and pandoc.
+
+    Both convert with tracked changes shown. pandoc is skipped if it is not
+    on PATH.
+
+    Args:
+        docx_file: .docx file to convert; a synthetic one is generated if omitted
+        paragraphs: Paragraph count of the synthetic document (3 runs each)
+
+    Returns:
+        dict: Converter name to {"seconds", "peak_rss_mb"}
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if docx_file is None:
+            docx_file = Path(temp_dir) / "synthetic.docx"
+            _write_synthetic_docx(docx_file, paragraphs)
+        with zipfile.ZipFile(docx_file) as zf:
+            size_mb = zf.getinfo("word/document.xml").file_size / 2**20
+        print(f"{docx_file}: word/document.xml {size_mb:.1f} MB")
+
+        output_file = Path(temp_dir) / "output.md"
+        results = {
+            "docx_to_markdown": _in_child_process(
+                _measure_markdown, docx_file, output_file
+            )
+        }
+        if shutil.which("pandoc"):
+            results["pandoc"] = _in_child_process(
+                _measure_pandoc, docx_file, output_file
+            )
+        else:
+            print("pandoc not found on PATH, skipped")
+
+    print(f"{'converter':<18}{'time (s)':>10}{'MB/s':>8}{'peak RSS (MB)':>15}")
+    for name, result in results.items():
+        print(
+            f"{name:<18}{result['seconds']:>10.2f}"
+            f"{size_mb / result['seconds']:>8.1f}{result['peak_rss_mb']:>15.0f}"
+        )
+    return results
+
+
+def synthetic_document_xml(paragraphs, runs):
+    """Return a pretty-printed document.xml shaped like unpack.py output."""
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        f'<w:document xmlns:w="{W_NAMESPACE}" xmlns:w14="{W14_NAMESPACE}">',
+        "  <w:body>",
+    ]
+    for i in range(paragraphs):
+        lines.append(f'    <w:p w14:paraId="{i:08X}" w:rsidR="00A1B2C3">')
+        for j in range(runs):
+            lines += [
+                '      <w:r w:rsidR="00A1B2C3">',
+                "        <w:rPr>",
+                "          <w:b/>" if j % 2 else "          <w:i/>",
+                "        </w:rPr>",
+                f'        <w:t xml:space="preserve">Paragraph {i} run {j} </w:t>',
+                "      </w:r>",
+            ]
+        lines.append("    </w:p>")
+    lines += ["  </w:body>", "</w:document>", ""]
+    return "\n".join(lines)
+
+
+def _synthetic_revision(xml, paragraphs, changes):
+    """Return synthetic_document_xml output with changes spread over paragraphs."""
+    lines = xml.split("\n")
+    step = max(paragraphs // changes, 1)
+    for n, i in enumerate(range(0, paragraphs, step)[:changes]):
+        # Each paragraph is 20 lines after the 3 header lines; run 1 text is +11
+        first, text = 3 + 20 * i, 3 + 20 * i + 11
+        if n % 5 == 3:
+            lines[first : first + 20] = [""] * 20
+        elif n % 5 == 4:
+            lines[first] = (
+                f"    <w:p><w:r><w:t>Clause {i} added in the revision</w:t></w:r>"
+                f"</w:p>\n{lines[first]}"
+            )
+        else:
+            lines[text] = lines[text].replace(" run 1 ", " line 1 ")
+    return "\n".join(lines)
+
+
+def _write_synthetic_docx(path, paragraphs):
+    """Write a minimal .docx whose every tenth paragraph has tracked changes."""
+    revision = 'w:author="Benchmark" w:date="2025-01-01T00:00:00Z"'
+    body = []
+    for i in range(paragraphs):
+        runs = [
+            f"<w:r><w:rPr>{'<w:b/>' if j % 2 else '<w:i/>'}</w:rPr>"
+            f'<w:t xml:space="preserve">Paragraph {i} run {j} </w:t></w:r>'
+            for j in range(3)
+        ]
+        if i % 10 == 0:
+            runs[1] = (
+                f'<w:del w:id="{2 * i}" {revision}><w:r>'
+                f'<w:delText xml:space="preserve">Paragraph {i} run 1 </w:delText>'
+                f'</w:r></w:del><w:ins w:id="{2 * i + 1}" {revision}><w:r>'
+                '<w:t xml:space="preserve">Inserted text </w:t></w:r></w:ins>'
+            )
+        body.append(f'<w:p w14:paraId="{i:08X}">{"".join(runs)}</w:p>')
+    _write_minimal_docx(path, "".join(body))
+
+
+def _write_minimal_docx(path, body):
+    """Write a .docx holding just word/document.xml with the given w:body XML."""
+    document = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<w:document xmlns:w="{W_NAMESPACE}" xmlns:w14="{W14_NAMESPACE}">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/'
+        'vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        "</Types>"
+    )
+    rels = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+        'relationships"><Relationship Id="rId1" Type="http://schemas.'
+        'openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/></Relationships>'
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", content_types)
+        zf.writestr("_rels/.rels", rels)
+        zf.writestr("word/document.xml", document)
+
+
+def _write_synthetic_template(path, paragraphs):
+    """Write a .docx with {{name}}, {{amount}} and {{ref}} placeholders."""
+    body = []
+    for i in range(paragraphs):
+        text = f'<w:r><w:t xml:space="preserve">Paragraph {i} </w:t></w:r>'
+        if i % 20 == 0:
+            text += "<w:r><w:t>Dear {{name}}, you owe {{amount}}.</w:t></w:r>"
+        elif i % 10 == 0:
+            # Split the way Word splits a placeholder after a spelling check
+            text += (
+                "<w:r><w:t>Reference: {{</w:t></w:r>"
+                '<w:proofErr w:type="spellStart"/>'
+                "<w:r><w:rPr><w:b/></w:rPr><w:t>ref</w:t></w:r>"
+                '<w:proofErr w:type="spellEnd"/>'
+                "<w:r><w:t>}}</w:t></w:r>"
+            )
+        body.append(f"<w:p>{text}</w:p>")
+    _write_minimal_docx(path, "".join(body))
+
+
+def _measure_backend(name, xml_file, output_file):
+    baseline = _peak_rss_mb()
+
+    start = time.perf_counter()
+    editor = BACKENDS[name](xml_file, rsid="00112233")
+    load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    editor.xml_path = Path(output_file)
+    editor.save()
+    save = time.perf_counter() - start
+
+    return {"load": load, "save": save, "peak_rss_mb": _peak_rss_mb() - baseline}
+
+
+def _measure_inject(name, xml_file, runs, shape):
+    editor = BACKENDS[name](xml_file, rsid="00112233")
+    paragraphs = []
+    for i in range(0, runs, 10):
+        content = "".join(
+            f"<w:r><w:t> Run {j} </w:t></w:r>" for j in range(i, min(i + 10, runs))
+        )
+        if i % 100 == 90:
+            content = content.replace("w:t>", "w:delText>")
+            content = f'<w:del w:id="{i}">{content}</w:del>'
+        paragraphs.append(f"<w:p>{content}</w:p>")
+    if shape == "table":
+        rows = "".join(f"<w:tr><w:tc>{p}</w:tc></w:tr>" for p in paragraphs)
+        fragment = f"<w:tbl>{rows}</w:tbl>"
+    else:
+        fragment = "".join(paragraphs)
+
+    # Injection alone, on detached copies of the fragment (best of 5)
+    inject = float("inf")
+    for _ in range(5):
+        nodes = editor._parse_fragment(fragment)
+        start = time.perf_counter()
+        editor._inject_attributes_to_nodes(nodes)
+        inject = min(inject, time.perf_counter() - start)
+
+    anchor = editor.get_node(tag="w:p", attrs={"w14:paraId": "00000000"})
+    start = time.perf_counter()
+    editor.insert_after(anchor, fragment)
+    insert = time.perf_counter() - start
+
+    return {"insert": insert, "inject": inject}
+
+
+def _measure_replace(name, xml_file, pairs):
+    editor = BACKENDS[name](xml_file, rsid="00112233")
+    start = time.perf_counter()
+    counts = editor.suggest_replacements(pairs)
+    return {
+        "seconds": time.perf_counter() - start,
+        "replaced": sum(counts.values()),
+    }
+
+
+def _measure_redline(name, original, revised):
+    # Seeded up front, as Document does for every part it loads
+    ids = IdAllocator()
+    ids.seed(Path(original).read_bytes())
+    editor = BACKENDS[name](original, rsid="00112233", ids=ids)
+    revised_editor = BACKENDS[name](revised, rsid="00112233")
+    start = time.perf_counter()
+    counts = editor.suggest_diff(revised_editor)
+    return {"seconds": time.perf_counter() - start, "counts": counts}
+
+
+def _measure_merge(template, rows, output_dir, processes):
+    stats = mail_merge(template, rows, output_dir, processes=processes)
+    return stats["docs_per_second"]
+
+
+def _measure_merge_loop(template, rows, output_dir):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    for n, row in enumerate(rows, 1):
+        package = OfficePackage.open(template)
+        editor = DocxXMLEditor("word/document.xml", rsid="00112233", package=package)
+        for t in editor.dom.getElementsByTagName("w:t"):
+            text = t.firstChild.data
+            if "{{" in text:
+                for field, value in row.items():
+                    text = text.replace(f"{{{{{field}}}}}", value)
+                t.firstChild.data = text
+        package.save(output_dir / f"{n:05d}.docx")
+    return len(rows) / (time.perf_counter() - start)
+
+
+def _measure_comments(name, docx_file, count, mode):
+    doc = Document(docx_file, backend=name)
+    editor = doc["word/document.xml"]
+    paragraphs = editor._find_all(editor._root(), "w:p")
+    anchors = [paragraphs[i % len(paragraphs)] for i in range(count)]
+
+    start = time.perf_counter()
+    if mode == "add_comments":
+        doc.add_comments(
+            [
+                {"start": p, "end": p, "text": f"Comment {i}"}
+                for i, p in enumerate(anchors)
+            ]
+        )
+    else:
+        for i, p in enumerate(anchors):
+            doc.add_comment(start=p, end=p, text=f"Comment {i}")
+    return time.perf_counter() - start
+
+
+def _measure_markdown(docx_file, output_file):
+    baseline = _peak_rss_mb()
+    start = time.perf_counter()
+    docx_to_markdown(docx_file, output_file)
+    return {
+        "seconds": time.perf_counter() - start,
+        "peak_rss_mb": _peak_rss_mb() - baseline,
+    }
+
+
+def _measure_pandoc(docx_file, output_file):
+    start = time.perf_counter()
+    subprocess.run(
+        ["pandoc", "--track-changes=all", str(docx_file), "-o", str(output_file)],
+        check=True,
+    )
+    seconds = time.perf_counter() - start
+    # This child process only ever waits for pandoc
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return {
+        "seconds": seconds,
+        "peak_rss_mb": peak / (2**20 if sys.platform == "darwin" else 2**10),
+    }
+
+
+def _peak_rss_mb():
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def _in_child_process(func, *args):
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(func, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,9 @@ Usage:
     # Initialize
     doc = Document('workspace/unpacked')
     doc = Document('workspace/unpacked', author="John Doe", initials="JD")
+    doc = Document('workspace/report.docx')  # Edit in memory, no unpacked tree
+    doc = Document('workspace/report.docx', backend="lxml")  # Large documents
+
 
     # Find nodes
     node = doc["word/document.xml"].get_node(tag="w:del", attrs={"w:id": "1"})
@@ -21,28 +24,98 @@ Usage:
     doc["word/document.xml"].suggest_deletion(node)  # Delete content
     doc["word/document.xml"].revert_insertion(ins_node)  # Reject insertion
     doc["word/document.xml"].revert_deletion(del_node)  # Reject deletion
+    doc["word/document.xml"].suggest_replacements([("30 days", "60 days")])
+    doc.suggest_diff('workspace/report-v2.docx')  # Redline against a new version
 
     # Save
     doc.save()
+    doc.save('workspace/report-reviewed.docx')  # .docx or OfficePackage sessions
 """
 
 import html
+import os
+import posixpath
 import random
+import re
 import shutil
 import tempfile
+from bisect import bisect_left
+from collections import Counter
 from datetime import datetime, timezone
+from difflib import SequenceMatcher
+from itertools import accumulate
 from pathlib import Path
 
 from defusedxml import minidom
+from ooxml.scripts.office_package import XML_SUFFIXES, OfficePackage
 from ooxml.scripts.pack import pack_document
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
 from ooxml.scripts.validation.redlining import RedliningValidator
 
-from .utilities import XMLEditor
+from .utilities import LxmlXMLEditor, XMLEditor
 
 # Path to template files
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 
+# suggest_diff: words, whitespace runs and single punctuation marks are diffed
+DIFF_TOKEN = re.compile(r"\w+|\s+|[^\w\s]")
+
+# suggest_diff: paragraphs sharing less of their tokens are replaced whole
+MIN_DIFF_SIMILARITY = 0.5
+
+# suggest_diff: how many revised blocks ahead a changed block looks for its pair
+PAIR_LOOKAHEAD = 8
+
+# Paragraph children without text, which a word-level diff can step over
+TEXTLESS_MARKUP = (
+    "w:bookmarkStart",
+    "w:bookmarkEnd",
+    "w:proofErr",
+    "w:commentRangeStart",
+    "w:commentRangeEnd",
+    "w:permStart",
+    "w:permEnd",
+)
+
+# Elements whose w:r children are wrapped when content is marked inserted or
+# deleted; the last two are existing insertions, only ever wrapped in w:del
+RUN_CONTAINERS = (
+    "w:p",
+    "w:hyperlink",
+    "w:smartTag",
+    "w:customXml",
+    "w:fldSimple",
+    "w:sdtContent",
+    "w:ins",
+    "w:moveTo",
+)
+
+# Attributes of copied content referring to a relationship of its part
+RELATIONSHIP_ATTRIBUTES = ("r:id", "r:embed", "r:link")
+
+# Markup referring to the document it came from, dropped from copied content
+DROPPED_ON_IMPORT = (
+    "w:bookmarkStart",
+    "w:bookmarkEnd",
+    "w:commentRangeStart",
+    "w:commentRangeEnd",
+    "w:commentReference",
+    "w:footnoteReference",
+    "w:endnoteReference",
+)
+
+# Attributes removed from copied content so attribute injection sets new ones
+RESET_ON_IMPORT = (
+    "w:rsidR",
+    "w:rsidRPr",
+    "w:rsidRDefault",
+    "w:rsidP",
+    "w:rsidDel",
+    "w:rsidTr",
+    "w14:paraId",
+    "w14:textId",
+)
+
 
 class DocxXMLEditor(XMLEditor):
     """XMLEditor that automatically applies RSID, author, and date to new elements.
@@ -57,61 +130,56 @@ class DocxXMLEditor(XMLEditor):
     """
 
     def __init__(
-        self, xml_path, rsid: str, author: str = "Claude", initials: str = "C"
+        self,
+        xml_path,
+        rsid: str,
+        author: str = "Claude",
+        initials: str = "C",
+        package=None,
+        ids=None,
     ):
         """Initialize with required RSID and optional author.
 
         Args:
-            xml_path: Path to XML file to edit
+            xml_path: Path to XML file to edit (part name when package is given)
             rsid: RSID to automatically apply to new elements
             author: Author name for tracked changes and comments (default: "Claude")
             initials: Author initials (default: "C")
+            package: Optional OfficePackage to edit in memory
+            ids: Optional IdAllocator shared with other parts (default: one
+                seeded from this part on first use)
         """
-        super().__init__(xml_path)
+        super().__init__(xml_path, package=package)
         self.rsid = rsid
         self.author = author
         self.initials = initials
+        self._ids = ids
 
-    def _get_next_change_id(self):
-        """Get the next available change ID by checking all tracked change elements."""
-        max_id = -1
-        for tag in ("w:ins", "w:del"):
-            elements = self.dom.getElementsByTagName(tag)
-            for elem in elements:
-                change_id = elem.getAttribute("w:id")
-                if change_id:
-                    try:
-                        max_id = max(max_id, int(change_id))
-                    except ValueError:
-                        pass
-        return max_id + 1
+    @property
+    def ids(self):
+        """IdAllocator for change IDs and paraIds of new elements."""
+        if self._ids is None:
+            self._ids = IdAllocator()
+            self._ids.seed(self.serialize())
+        return self._ids
 
     def _ensure_w16du_namespace(self):
         """Ensure w16du namespace is declared on the root element."""
-        root = self.dom.documentElement
-        if not root.hasAttribute("xmlns:w16du"):  # type: ignore
-            root.setAttribute(  # type: ignore
-                "xmlns:w16du",
-                "http://schemas.microsoft.com/office/word/2023/wordml/word16du",
-            )
+        self._ensure_namespace(
+            "w16du", "http://schemas.microsoft.com/office/word/2023/wordml/word16du"
+        )
 
     def _ensure_w16cex_namespace(self):
         """Ensure w16cex namespace is declared on the root element."""
-        root = self.dom.documentElement
-        if not root.hasAttribute("xmlns:w16cex"):  # type: ignore
-            root.setAttribute(  # type: ignore
-                "xmlns:w16cex",
-                "http://schemas.microsoft.com/office/word/2018/wordml/cex",
-            )
+        self._ensure_namespace(
+            "w16cex", "http://schemas.microsoft.com/office/word/2018/wordml/cex"
+        )
 
     def _ensure_w14_namespace(self):
         """Ensure w14 namespace is declared on the root element."""
-        root = self.dom.documentElement
-        if not root.hasAttribute("xmlns:w14"):  # type: ignore
-            root.setAttribute(  # type: ignore
-                "xmlns:w14",
-                "http://schemas.microsoft.com/office/word/2010/wordml",
-            )
+        self._ensure_namespace(
+            "w14", "http://schemas.microsoft.com/office/word/2010/wordml"
+        )
 
     def _inject_attributes_to_nodes(self, nodes):
         """Inject RSID, author, and date attributes into DOM nodes where applicable.
@@ -127,139 +195,117 @@ class DocxXMLEditor(XMLEditor):
         Args:
             nodes: List of DOM nodes to process
         """
-        from datetime import datetime, timezone
-
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
+        has_attr = self._has_attr
+        set_attr = self._set_attr
+
         def is_inside_deletion(elem):
             """Check if element is inside a w:del element."""
-            parent = elem.parentNode
-            while parent:
-                if parent.nodeType == parent.ELEMENT_NODE and parent.tagName == "w:del":
+            parent = self._parent_of(elem)
+            while parent is not None:
+                if self._tag_of(parent) == "w:del":
                     return True
-                parent = parent.parentNode
+                parent = self._parent_of(parent)
             return False
 
         def add_rsid_to_p(elem):
-            if not elem.hasAttribute("w:rsidR"):
-                elem.setAttribute("w:rsidR", self.rsid)
-            if not elem.hasAttribute("w:rsidRDefault"):
-                elem.setAttribute("w:rsidRDefault", self.rsid)
-            if not elem.hasAttribute("w:rsidP"):
-                elem.setAttribute("w:rsidP", self.rsid)
+            if not has_attr(elem, "w:rsidR"):
+                set_attr(elem, "w:rsidR", self.rsid)
+            if not has_attr(elem, "w:rsidRDefault"):
+                set_attr(elem, "w:rsidRDefault", self.rsid)
+            if not has_attr(elem, "w:rsidP"):
+                set_attr(elem, "w:rsidP", self.rsid)
             # Add w14:paraId and w14:textId if not present
-            if not elem.hasAttribute("w14:paraId"):
+            if not has_attr(elem, "w14:paraId"):
                 self._ensure_w14_namespace()
-                elem.setAttribute("w14:paraId", _generate_hex_id())
-            if not elem.hasAttribute("w14:textId"):
+                set_attr(elem, "w14:paraId", self.ids.hex_id())
+            if not has_attr(elem, "w14:textId"):
                 self._ensure_w14_namespace()
-                elem.setAttribute("w14:textId", _generate_hex_id())
+                set_attr(elem, "w14:textId", self.ids.hex_id())
 
-        def add_rsid_to_r(elem):
+        def add_rsid_to_r(elem, inside_deletion):
             # Use w:rsidDel for <w:r> inside <w:del>, otherwise w:rsidR
-            if is_inside_deletion(elem):
-                if not elem.hasAttribute("w:rsidDel"):
-                    elem.setAttribute("w:rsidDel", self.rsid)
+            if inside_deletion:
+                if not has_attr(elem, "w:rsidDel"):
+                    set_attr(elem, "w:rsidDel", self.rsid)
             else:
-                if not elem.hasAttribute("w:rsidR"):
-                    elem.setAttribute("w:rsidR", self.rsid)
+                if not has_attr(elem, "w:rsidR"):
+                    set_attr(elem, "w:rsidR", self.rsid)
 
         def add_tracked_change_attrs(elem):
             # Auto-assign w:id if not present
-            if not elem.hasAttribute("w:id"):
-                elem.setAttribute("w:id", str(self._get_next_change_id()))
-            if not elem.hasAttribute("w:author"):
-                elem.setAttribute("w:author", self.author)
-            if not elem.hasAttribute("w:date"):
-                elem.setAttribute("w:date", timestamp)
+            if not has_attr(elem, "w:id"):
+                set_attr(elem, "w:id", str(self.ids.change_id()))
+            if not has_attr(elem, "w:author"):
+                set_attr(elem, "w:author", self.author)
+            if not has_attr(elem, "w:date"):
+                set_attr(elem, "w:date", timestamp)
             # Add w16du:dateUtc for tracked changes (same as w:date since we generate UTC timestamps)
-            if elem.tagName in ("w:ins", "w:del") and not elem.hasAttribute(
-                "w16du:dateUtc"
+            if self._tag_of(elem) in ("w:ins", "w:del") and not has_attr(
+                elem, "w16du:dateUtc"
             ):
                 self._ensure_w16du_namespace()
-                elem.setAttribute("w16du:dateUtc", timestamp)
+                set_attr(elem, "w16du:dateUtc", timestamp)
 
         def add_comment_attrs(elem):
-            if not elem.hasAttribute("w:author"):
-                elem.setAttribute("w:author", self.author)
-            if not elem.hasAttribute("w:date"):
-                elem.setAttribute("w:date", timestamp)
-            if not elem.hasAttribute("w:initials"):
-                elem.setAttribute("w:initials", self.initials)
+            if not has_attr(elem, "w:author"):
+                set_attr(elem, "w:author", self.author)
+            if not has_attr(elem, "w:date"):
+                set_attr(elem, "w:date", timestamp)
+            if not has_attr(elem, "w:initials"):
+                set_attr(elem, "w:initials", self.initials)
 
         def add_comment_extensible_date(elem):
             # Add w16cex:dateUtc for comment extensible elements
-            if not elem.hasAttribute("w16cex:dateUtc"):
+            if not has_attr(elem, "w16cex:dateUtc"):
                 self._ensure_w16cex_namespace()
-                elem.setAttribute("w16cex:dateUtc", timestamp)
+                set_attr(elem, "w16cex:dateUtc", timestamp)
 
         def add_xml_space_to_t(elem):
             # Add xml:space="preserve" to w:t if text has leading/trailing whitespace
-            if (
-                elem.firstChild
-                and elem.firstChild.nodeType == elem.firstChild.TEXT_NODE
-            ):
-                text = elem.firstChild.data
-                if text and (text[0].isspace() or text[-1].isspace()):
-                    if not elem.hasAttribute("xml:space"):
-                        elem.setAttribute("xml:space", "preserve")
+            text = self._leading_text(elem)
+            if text and (text[0].isspace() or text[-1].isspace()):
+                if not has_attr(elem, "xml:space"):
+                    set_attr(elem, "xml:space", "preserve")
+
+        handlers = {
+            "w:p": add_rsid_to_p,
+            "w:t": add_xml_space_to_t,
+            "w:ins": add_tracked_change_attrs,
+            "w:del": add_tracked_change_attrs,
+            "w:comment": add_comment_attrs,
+            "w16cex:commentExtensible": add_comment_extensible_date,
+        }
 
         for node in nodes:
-            if node.nodeType != node.ELEMENT_NODE:
+            if not self._is_element(node):
                 continue
 
-            # Handle the node itself
-            if node.tagName == "w:p":
-                add_rsid_to_p(node)
-            elif node.tagName == "w:r":
-                add_rsid_to_r(node)
-            elif node.tagName == "w:t":
-                add_xml_space_to_t(node)
-            elif node.tagName in ("w:ins", "w:del"):
-                add_tracked_change_attrs(node)
-            elif node.tagName == "w:comment":
-                add_comment_attrs(node)
-            elif node.tagName == "w16cex:commentExtensible":
-                add_comment_extensible_date(node)
-
-            # Process descendants (getElementsByTagName doesn't return the element itself)
-            for elem in node.getElementsByTagName("w:p"):
-                add_rsid_to_p(elem)
-            for elem in node.getElementsByTagName("w:r"):
-                add_rsid_to_r(elem)
-            for elem in node.getElementsByTagName("w:t"):
-                add_xml_space_to_t(elem)
-            for tag in ("w:ins", "w:del"):
-                for elem in node.getElementsByTagName(tag):
-                    add_tracked_change_attrs(elem)
-            for elem in node.getElementsByTagName("w:comment"):
-                add_comment_attrs(elem)
-            for elem in node.getElementsByTagName("w16cex:commentExtensible"):
-                add_comment_extensible_date(elem)
-
-    def replace_node(self, elem, new_content):
-        """Replace node with automatic attribute injection."""
-        nodes = super().replace_node(elem, new_content)
-        self._inject_attributes_to_nodes(nodes)
-        return nodes
-
-    def insert_after(self, elem, xml_content):
-        """Insert after with automatic attribute injection."""
-        nodes = super().insert_after(elem, xml_content)
-        self._inject_attributes_to_nodes(nodes)
-        return nodes
-
-    def insert_before(self, elem, xml_content):
-        """Insert before with automatic attribute injection."""
-        nodes = super().insert_before(elem, xml_content)
-        self._inject_attributes_to_nodes(nodes)
-        return nodes
-
-    def append_to(self, elem, xml_content):
-        """Append to with automatic attribute injection."""
-        nodes = super().append_to(elem, xml_content)
+            # One depth-first pass per fragment, tracking the open w:del elements
+            # instead of walking up from every run
+            inside_deletion = is_inside_deletion(node)
+            open_deletions = []
+            for event, elem in self._walk(node):
+                if event == "end":
+                    if open_deletions and open_deletions[-1] is elem:
+                        open_deletions.pop()
+                    continue
+                tag = self._tag_of(elem)
+                if tag == "w:r":
+                    add_rsid_to_r(elem, inside_deletion or bool(open_deletions))
+                elif tag in handlers:
+                    handlers[tag](elem)
+                    if tag == "w:del":
+                        open_deletions.append(elem)
+
+    def _nodes_inserted(self, nodes):
+        """Inject attributes into inserted nodes, then index them.
+
+        Runs for replace_node, insert_after, insert_before and append_to.
+        """
         self._inject_attributes_to_nodes(nodes)
-        return nodes
+        super()._nodes_inserted(nodes)
 
     def revert_insertion(self, elem):
         """Reject an insertion by wrapping its content in a deletion.
@@ -287,55 +333,47 @@ class DocxXMLEditor(XMLEditor):
         """
         # Collect insertions
         ins_elements = []
-        if elem.tagName == "w:ins":
+        if self._tag_of(elem) == "w:ins":
             ins_elements.append(elem)
         else:
-            ins_elements.extend(elem.getElementsByTagName("w:ins"))
+            ins_elements.extend(self._find_all(elem, "w:ins"))
 
         # Validate that there are insertions to reject
         if not ins_elements:
             raise ValueError(
                 f"revert_insertion requires w:ins elements. "
-                f"The provided element <{elem.tagName}> contains no insertions. "
+                f"The provided element <{self._tag_of(elem)}> contains no insertions. "
             )
 
         # Process all insertions - wrap all children in w:del
         for ins_elem in ins_elements:
-            runs = list(ins_elem.getElementsByTagName("w:r"))
+            runs = self._find_all(ins_elem, "w:r")
             if not runs:
                 continue
 
             # Create deletion wrapper
-            del_wrapper = self.dom.createElement("w:del")
+            del_wrapper = self._create_element("w:del")
 
             # Process each run
             for run in runs:
                 # Convert w:t → w:delText and w:rsidR → w:rsidDel
-                if run.hasAttribute("w:rsidR"):
-                    run.setAttribute("w:rsidDel", run.getAttribute("w:rsidR"))
-                    run.removeAttribute("w:rsidR")
-                elif not run.hasAttribute("w:rsidDel"):
-                    run.setAttribute("w:rsidDel", self.rsid)
-
-                for t_elem in list(run.getElementsByTagName("w:t")):
-                    del_text = self.dom.createElement("w:delText")
-                    # Copy ALL child nodes (not just firstChild) to handle entities
-                    while t_elem.firstChild:
-                        del_text.appendChild(t_elem.firstChild)
-                    for i in range(t_elem.attributes.length):
-                        attr = t_elem.attributes.item(i)
-                        del_text.setAttribute(attr.name, attr.value)
-                    t_elem.parentNode.replaceChild(del_text, t_elem)
+                if self._has_attr(run, "w:rsidR"):
+                    self._set_attr(run, "w:rsidDel", self._get_attr(run, "w:rsidR"))
+                    self._remove_attr(run, "w:rsidR")
+                elif not self._has_attr(run, "w:rsidDel"):
+                    self._set_attr(run, "w:rsidDel", self.rsid)
+
+                for t_elem in self._find_all(run, "w:t"):
+                    self._rename(t_elem, "w:delText")
 
             # Move all children from ins to del wrapper
-            while ins_elem.firstChild:
-                del_wrapper.appendChild(ins_elem.firstChild)
+            self._move_children(ins_elem, del_wrapper)
 
             # Add del wrapper back to ins
-            ins_elem.appendChild(del_wrapper)
+            self._append_child(ins_elem, del_wrapper)
 
-            # Inject attributes to the deletion wrapper
-            self._inject_attributes_to_nodes([del_wrapper])
+            # Inject attributes to the deletion wrapper and index it
+            self._nodes_inserted([del_wrapper])
 
         return [elem]
 
@@ -366,18 +404,18 @@ class DocxXMLEditor(XMLEditor):
         """
         # Collect deletions FIRST - before we modify the DOM
         del_elements = []
-        is_single_del = elem.tagName == "w:del"
+        is_single_del = self._tag_of(elem) == "w:del"
 
         if is_single_del:
             del_elements.append(elem)
         else:
-            del_elements.extend(elem.getElementsByTagName("w:del"))
+            del_elements.extend(self._find_all(elem, "w:del"))
 
         # Validate that there are deletions to reject
         if not del_elements:
             raise ValueError(
                 f"revert_deletion requires w:del elements. "
-                f"The provided element <{elem.tagName}> contains no deletions. "
+                f"The provided element <{self._tag_of(elem)}> contains no deletions. "
             )
 
         # Track created insertion (only relevant if elem is a single w:del)
@@ -386,46 +424,42 @@ class DocxXMLEditor(XMLEditor):
         # Process all deletions - create insertions that copy the deleted content
         for del_elem in del_elements:
             # Clone the deleted runs and convert them to insertions
-            runs = list(del_elem.getElementsByTagName("w:r"))
+            runs = self._find_all(del_elem, "w:r")
             if not runs:
                 continue
 
             # Create insertion wrapper
-            ins_elem = self.dom.createElement("w:ins")
+            ins_elem = self._create_element("w:ins")
 
             for run in runs:
                 # Clone the run
-                new_run = run.cloneNode(True)
+                new_run = self._clone(run)
 
                 # Convert w:delText → w:t
-                for del_text in list(new_run.getElementsByTagName("w:delText")):
-                    t_elem = self.dom.createElement("w:t")
-                    # Copy ALL child nodes (not just firstChild) to handle entities
-                    while del_text.firstChild:
-                        t_elem.appendChild(del_text.firstChild)
-                    for i in range(del_text.attributes.length):
-                        attr = del_text.attributes.item(i)
-                        t_elem.setAttribute(attr.name, attr.value)
-                    del_text.parentNode.replaceChild(t_elem, del_text)
+                for del_text in self._find_all(new_run, "w:delText"):
+                    self._rename(del_text, "w:t")
 
                 # Update run attributes: w:rsidDel → w:rsidR
-                if new_run.hasAttribute("w:rsidDel"):
-                    new_run.setAttribute("w:rsidR", new_run.getAttribute("w:rsidDel"))
-                    new_run.removeAttribute("w:rsidDel")
-                elif not new_run.hasAttribute("w:rsidR"):
-                    new_run.setAttribute("w:rsidR", self.rsid)
+                if self._has_attr(new_run, "w:rsidDel"):
+                    self._set_attr(
+                        new_run, "w:rsidR", self._get_attr(new_run, "w:rsidDel")
+                    )
+                    self._remove_attr(new_run, "w:rsidDel")
+                elif not self._has_attr(new_run, "w:rsidR"):
+                    self._set_attr(new_run, "w:rsidR", self.rsid)
 
-                ins_elem.appendChild(new_run)
+                self._append_child(ins_elem, new_run)
 
             # Insert the new insertion after the deletion
-            nodes = self.insert_after(del_elem, ins_elem.toxml())
+            self._insert_after_node(del_elem, ins_elem)
+            self._nodes_inserted([ins_elem])
 
             # If processing a single w:del, track the created insertion
-            if is_single_del and nodes:
-                created_insertion = nodes[0]
+            if is_single_del:
+                created_insertion = ins_elem
 
         # Return based on input type
-        if is_single_del and created_insertion:
+        if is_single_del and created_insertion is not None:
             return [elem, created_insertion]
         else:
             return [elem]
@@ -495,122 +529,933 @@ class DocxXMLEditor(XMLEditor):
         Raises:
             ValueError: If element has existing tracked changes or invalid structure
         """
-        if elem.nodeName == "w:r":
+        tag = self._tag_of(elem)
+        if tag == "w:r":
             # Check for existing w:delText
-            if elem.getElementsByTagName("w:delText"):
+            if self._find_all(elem, "w:delText"):
                 raise ValueError("w:r element already contains w:delText")
 
-            # Convert w:t → w:delText
-            for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
-                # Copy ALL child nodes (not just firstChild) to handle entities
-                while t_elem.firstChild:
-                    del_text.appendChild(t_elem.firstChild)
-                # Preserve attributes like xml:space
-                for i in range(t_elem.attributes.length):
-                    attr = t_elem.attributes.item(i)
-                    del_text.setAttribute(attr.name, attr.value)
-                t_elem.parentNode.replaceChild(del_text, t_elem)
+            # Convert w:t → w:delText (keeps attributes like xml:space)
+            for t_elem in self._find_all(elem, "w:t"):
+                self._rename(t_elem, "w:delText")
 
             # Update run attributes: w:rsidR → w:rsidDel
-            if elem.hasAttribute("w:rsidR"):
-                elem.setAttribute("w:rsidDel", elem.getAttribute("w:rsidR"))
-                elem.removeAttribute("w:rsidR")
-            elif not elem.hasAttribute("w:rsidDel"):
-                elem.setAttribute("w:rsidDel", self.rsid)
+            if self._has_attr(elem, "w:rsidR"):
+                self._set_attr(elem, "w:rsidDel", self._get_attr(elem, "w:rsidR"))
+                self._remove_attr(elem, "w:rsidR")
+            elif not self._has_attr(elem, "w:rsidDel"):
+                self._set_attr(elem, "w:rsidDel", self.rsid)
 
             # Wrap in w:del
-            del_wrapper = self.dom.createElement("w:del")
-            parent = elem.parentNode
-            parent.insertBefore(del_wrapper, elem)
-            parent.removeChild(elem)
-            del_wrapper.appendChild(elem)
+            del_wrapper = self._create_element("w:del")
+            self._wrap(elem, del_wrapper)
 
-            # Inject attributes to the deletion wrapper
-            self._inject_attributes_to_nodes([del_wrapper])
+            # Inject attributes to the deletion wrapper and index it
+            self._nodes_inserted([del_wrapper])
 
             return del_wrapper
 
-        elif elem.nodeName == "w:p":
+        elif tag == "w:p":
             # Check for existing tracked changes
-            if elem.getElementsByTagName("w:ins") or elem.getElementsByTagName("w:del"):
+            if self._find_all(elem, "w:ins") or self._find_all(elem, "w:del"):
                 raise ValueError("w:p element already contains tracked changes")
 
             # Check if it's a numbered list item
-            pPr_list = elem.getElementsByTagName("w:pPr")
-            is_numbered = pPr_list and pPr_list[0].getElementsByTagName("w:numPr")
+            pPr_list = self._find_all(elem, "w:pPr")
+            is_numbered = pPr_list and self._find_all(pPr_list[0], "w:numPr")
 
             if is_numbered:
                 # Add <w:del/> to w:rPr in w:pPr
                 pPr = pPr_list[0]
-                rPr_list = pPr.getElementsByTagName("w:rPr")
+                rPr_list = self._find_all(pPr, "w:rPr")
 
                 if not rPr_list:
-                    rPr = self.dom.createElement("w:rPr")
-                    pPr.appendChild(rPr)
+                    rPr = self._create_element("w:rPr")
+                    self._append_child(pPr, rPr)
                 else:
                     rPr = rPr_list[0]
 
                 # Add <w:del/> marker
-                del_marker = self.dom.createElement("w:del")
-                rPr.insertBefore(
-                    del_marker, rPr.firstChild
-                ) if rPr.firstChild else rPr.appendChild(del_marker)
-
-            # Convert w:t → w:delText in all runs
-            for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
-                # Copy ALL child nodes (not just firstChild) to handle entities
-                while t_elem.firstChild:
-                    del_text.appendChild(t_elem.firstChild)
-                # Preserve attributes like xml:space
-                for i in range(t_elem.attributes.length):
-                    attr = t_elem.attributes.item(i)
-                    del_text.setAttribute(attr.name, attr.value)
-                t_elem.parentNode.replaceChild(del_text, t_elem)
+                del_marker = self._create_element("w:del")
+                self._insert_first(rPr, del_marker)
+                self._index_nodes([rPr])
+
+            # Convert w:t → w:delText in all runs (keeps attributes like xml:space)
+            for t_elem in self._find_all(elem, "w:t"):
+                self._rename(t_elem, "w:delText")
 
             # Update run attributes: w:rsidR → w:rsidDel
-            for run in elem.getElementsByTagName("w:r"):
-                if run.hasAttribute("w:rsidR"):
-                    run.setAttribute("w:rsidDel", run.getAttribute("w:rsidR"))
-                    run.removeAttribute("w:rsidR")
-                elif not run.hasAttribute("w:rsidDel"):
-                    run.setAttribute("w:rsidDel", self.rsid)
+            for run in self._find_all(elem, "w:r"):
+                if self._has_attr(run, "w:rsidR"):
+                    self._set_attr(run, "w:rsidDel", self._get_attr(run, "w:rsidR"))
+                    self._remove_attr(run, "w:rsidR")
+                elif not self._has_attr(run, "w:rsidDel"):
+                    self._set_attr(run, "w:rsidDel", self.rsid)
 
             # Wrap all non-pPr children in <w:del>
-            del_wrapper = self.dom.createElement("w:del")
-            for child in [c for c in elem.childNodes if c.nodeName != "w:pPr"]:
-                elem.removeChild(child)
-                del_wrapper.appendChild(child)
-            elem.appendChild(del_wrapper)
+            del_wrapper = self._create_element("w:del")
+            self._move_children(elem, del_wrapper, keep_tag="w:pPr")
+            self._append_child(elem, del_wrapper)
 
-            # Inject attributes to the deletion wrapper
-            self._inject_attributes_to_nodes([del_wrapper])
+            # Inject attributes to the deletion wrapper and index it
+            self._nodes_inserted([del_wrapper])
 
             return elem
 
         else:
-            raise ValueError(f"Element must be w:r or w:p, got {elem.nodeName}")
+            raise ValueError(f"Element must be w:r or w:p, got {tag}")
+
+    def suggest_replacements(self, edits):
+        """Replace text throughout the part as tracked changes, in one pass.
+
+        Every occurrence of each match becomes <w:del> (keeping each run's w:rPr)
+        followed by <w:ins> with the replacement, formatted like the run the match
+        starts in. Text before and after a match stays in copies of its original
+        run. Matches may span several runs of a paragraph or hyperlink; runs
+        holding anything besides w:rPr and w:t (tabs, breaks, fields, drawings)
+        and runs already inside tracked changes end a span and are never edited.
+
+        All matches are found with a single regular expression, so the cost grows
+        with the size of the part, not with the number of edits.
+
+        Args:
+            edits: Iterable of (match, replacement) string pairs. Overlapping
+                matches resolve to the leftmost, then longest one. An empty
+                replacement makes a plain deletion.
+
+        Returns:
+            dict: Each match to the number of occurrences replaced
+
+        Raises:
+            ValueError: If a match is empty or is given two different replacements
+
+        Example:
+            counts = editor.suggest_replacements([
+                ("30 days", "60 days"),
+                ("Acme Corp", "Acme Corporation"),
+            ])
+        """
+        replacements = {}
+        for match, replacement in edits:
+            if not match:
+                raise ValueError("Match text must not be empty")
+            if replacements.setdefault(match, replacement) != replacement:
+                raise ValueError(f"Conflicting replacements for {match!r}")
+        counts = dict.fromkeys(replacements, 0)
+        if not replacements:
+            return counts
+
+        pattern = re.compile(_literal_pattern(replacements))
+        root = self._root()
+        containers = self._find_all(root, "w:p") + self._find_all(root, "w:hyperlink")
+        inserted = []
+        for container in containers:
+            span = []
+            for child in self._children_of(container) + [None]:
+                text = self._plain_run_text(child) if child is not None else None
+                if text is not None:
+                    span.append((child, text))
+                    continue
+                if span:
+                    text = "".join(run_text for _, run_text in span)
+                    run_edits = []
+                    for found in pattern.finditer(text):
+                        run_edits.append(
+                            (found.start(), found.end(), replacements[found.group()])
+                        )
+                        counts[found.group()] += 1
+                    inserted += self._edit_runs(span, run_edits)
+                    span = []
+
+        if inserted:
+            self._run_edits_inserted(inserted)
+        return counts
+
+    def _plain_run_text(self, elem):
+        """Return the text of a w:r holding only w:rPr and w:t, else None."""
+        if self._tag_of(elem) != "w:r":
+            return None
+        text = []
+        for child in self._children_of(elem):
+            tag = self._tag_of(child)
+            if tag == "w:t":
+                text += [c for c in self._content_of(child) if isinstance(c, str)]
+            elif tag != "w:rPr":
+                return None
+        return "".join(text) if text else None
+
+    def _edit_runs(self, span, edits):
+        """Rewrite adjacent plain runs so each edit becomes a w:del/w:ins pair.
+
+        Deleted text moves into w:del (keeping each run's w:rPr); the
+        replacement follows in w:ins, formatted like the run the edit starts in.
+        An insertion at the boundary of two runs is formatted like the first.
+
+        Args:
+            span: List of (w:r, text) for consecutive sibling runs
+            edits: Sorted, non-overlapping (start, end, replacement) offsets into
+                the span's joined text. start == end inserts; an empty
+                replacement deletes.
+
+        Returns:
+            List: The new top-level nodes, not yet injected or indexed
+        """
+        if not edits:
+            return []
+        text = "".join(run_text for _, run_text in span)
+
+        inserted = []
+        current = 0  # Index into edits
+        open_del = None  # w:del of an edit that continues into the next run
+        edit_run = None  # Run the current edit starts in
+        run_end = 0
+        for run, run_text in span:
+            cursor, run_end = run_end, run_end + len(run_text)
+            if current == len(edits):
+                break
+            start, end, _ = edits[current]
+            if start > run_end or (start == run_end and end > start):
+                continue  # Untouched run
+
+            pieces = []
+            while current < len(edits):
+                start, end, replacement = edits[current]
+                if start > run_end or (start == run_end and end > start):
+                    break
+                if cursor < start:
+                    pieces.append(self._copy_run(run, text[cursor:start]))
+                    cursor = start
+
+                piece_end = min(end, run_end)
+                if cursor < piece_end:
+                    if open_del is None:
+                        open_del = self._create_element("w:del")
+                        pieces.append(open_del)
+                        edit_run = run
+                    self._append_child(
+                        open_del,
+                        self._copy_run(run, text[cursor:piece_end], "w:delText"),
+                    )
+                    cursor = piece_end
+                elif open_del is None:
+                    edit_run = run  # Pure insertion
+                if cursor < end:
+                    break  # Continues into the next run
+                if replacement:
+                    ins = self._create_element("w:ins")
+                    self._append_child(
+                        ins, self._copy_run(edit_run, replacement, new=True)
+                    )
+                    pieces.append(ins)
+                open_del = None
+                current += 1
+            if cursor < run_end:
+                pieces.append(self._copy_run(run, text[cursor:run_end]))
+
+            for piece in pieces:
+                self._insert_before_node(run, piece)
+            self._unindex_node(run)
+            self._remove_node(run)
+            inserted += pieces
+        return inserted
+
+    def _run_edits_inserted(self, nodes):
+        """Like _nodes_inserted, but leave top-level w:r nodes unstamped.
+
+        Those are _edit_runs copies of unchanged text, which keep exactly the
+        RSIDs (or lack of them) of the run they were split from.
+        """
+        self._inject_attributes_to_nodes(
+            [
+                node
+                for node in nodes
+                if not (self._is_element(node) and self._tag_of(node) == "w:r")
+            ]
+        )
+        super()._nodes_inserted(nodes)
+
+    def _copy_run(self, run, text, text_tag="w:t", new=False):
+        """Copy a plain run (keeping w:rPr) with its text replaced.
+
+        Args:
+            run: w:r element holding only w:rPr and w:t
+            text: Text of the copy
+            text_tag: "w:t", or "w:delText" for a run inside w:del
+            new: If True, drop the run's RSIDs so it gets the current one
+        """
+        copy = self._clone(run)
+        text_elems = [c for c in self._children_of(copy) if self._tag_of(c) == "w:t"]
+        for extra in text_elems[1:]:
+            self._remove_node(extra)
+        text_elem = text_elems[0]
+        self._set_text(text_elem, text)
+        if text[0].isspace() or text[-1].isspace():
+            self._set_attr(text_elem, "xml:space", "preserve")
+        if text_tag != "w:t":
+            self._rename(text_elem, text_tag)
+            # Same RSID bookkeeping as suggest_deletion
+            if self._has_attr(copy, "w:rsidR"):
+                self._set_attr(copy, "w:rsidDel", self._get_attr(copy, "w:rsidR"))
+                self._remove_attr(copy, "w:rsidR")
+        if new:
+            for name in ("w:rsidR", "w:rsidRPr", "w:rsidDel"):
+                if self._has_attr(copy, name):
+                    self._remove_attr(copy, name)
+        return copy
+
+    def suggest_diff(self, revised, import_node=None):
+        """Turn this part into a redline against a revised version, as tracked changes.
+
+        The blocks (paragraphs, tables, content controls) of both bodies are
+        aligned by their text, so each unchanged block costs one hash lookup.
+        Only the paragraphs that changed are diffed, word by word: the changed
+        words become <w:del>/<w:ins> within the original runs, keeping their
+        formatting. Paragraphs holding more than plain runs (tabs, fields,
+        drawings, tracked changes) have their whole content redlined, and pairs
+        too different to diff usefully are deleted and reinserted. Tables of the
+        same shape are compared cell by cell; others are deleted and reinserted.
+
+        Formatting-only changes are not redlined. Inserted content is copied from
+        revised with its tracked changes accepted, and without its RSIDs,
+        paraIds, bookmarks, comment markers and footnote/endnote references.
+
+        Args:
+            revised: DocxXMLEditor (either backend) holding the revised part
+            import_node: Optional callback called with each element copied from
+                revised once it is in this part, e.g. to carry over the
+                relationships it references
+
+        Returns:
+            dict: Number of "equal", "changed", "inserted" and "deleted" blocks
+
+        Example:
+            counts = editor.suggest_diff(DocxXMLEditor("v2/word/document.xml", rsid))
+        """
+        counts = dict.fromkeys(("equal", "changed", "inserted", "deleted"), 0)
+        body = self._child(self._root(), "w:body")
+        revised_body = revised._child(revised._root(), "w:body")
+        nodes = []
+        self._diff_blocks(body, revised, revised_body, nodes, counts, import_node)
+        if nodes:
+            self._run_edits_inserted(nodes)
+        return counts
+
+    def _diff_blocks(
+        self, container, revised, revised_container, nodes, counts, import_node
+    ):
+        """Redline the blocks of container against those of revised_container.
+
+        New revision elements and copied blocks are appended to nodes, for
+        attribute injection and indexing in one go.
+        """
+        old = self._blocks_of(container)
+        new = revised._blocks_of(revised_container)
+        opcodes = _block_opcodes(
+            [self._block_key(block) for block in old],
+            [revised._block_key(block) for block in new],
+        )
+        for op, i1, i2, j1, j2 in opcodes:
+            if op == "equal":
+                counts["equal"] += i2 - i1
+                continue
+
+            # New blocks go after the last block kept so far
+            anchor = old[i1 - 1] if i1 else None
+            following = old[i1] if i1 < len(old) else None
+            for old_block, new_block in self._pair_blocks(
+                old[i1:i2], revised, new[j1:j2]
+            ):
+                if (
+                    old_block is not None
+                    and new_block is not None
+                    and self._diff_pair(
+                        old_block, revised, new_block, nodes, counts, import_node
+                    )
+                ):
+                    anchor = old_block
+                    continue
+                if old_block is not None:
+                    nodes.extend(self._mark_block(old_block, "w:del"))
+                    anchor = old_block
+                    counts["deleted"] += 1
+                if new_block is not None:
+                    copy = self._import_node(new_block)
+                    if anchor is not None:
+                        self._insert_after_node(anchor, copy)
+                    elif following is not None:
+                        self._insert_before_node(following, copy)
+                    else:
+                        self._append_block(container, copy)
+                    self._prepare_inserted(copy, import_node)
+                    self._mark_block(copy, "w:ins")
+                    anchor = copy
+                    nodes.append(copy)
+                    counts["inserted"] += 1
+
+    def _pair_blocks(self, blocks, revised, revised_blocks):
+        """Pair up changed blocks with similar revised blocks, in document order.
+
+        Each block takes the most similar revised block of the same kind among
+        the next PAIR_LOOKAHEAD not yet paired, if they share enough words.
+
+        Returns:
+            list: (block, revised block) pairs; either is None for a block only
+                in one version
+        """
+        revised_words = [revised._block_text(b).split() for b in revised_blocks]
+        pairs = []
+        j = 0
+        for block in blocks:
+            tag = self._tag_of(block)
+            words = self._block_text(block).split()
+            best, best_score = None, MIN_DIFF_SIMILARITY
+            for k in range(j, min(j + PAIR_LOOKAHEAD, len(revised_blocks))):
+                if revised._tag_of(revised_blocks[k]) != tag:
+                    continue
+                score = SequenceMatcher(None, words, revised_words[k]).quick_ratio()
+                if score >= best_score and (best is None or score > best_score):
+                    best, best_score = k, score
+            if best is None:
+                pairs.append((block, None))
+                continue
+            pairs += [(None, revised_block) for revised_block in revised_blocks[j:best]]
+            pairs.append((block, revised_blocks[best]))
+            j = best + 1
+        pairs += [(None, revised_block) for revised_block in revised_blocks[j:]]
+        return pairs
+
+    def _diff_pair(self, block, revised, revised_block, nodes, counts, import_node):
+        """Redline a changed block in place, if it is close enough to its revision.
+
+        Returns:
+            bool: False if the block should be deleted and reinserted instead
+        """
+        tag = self._tag_of(block)
+        if tag != revised._tag_of(revised_block):
+            return False
+        if tag == "w:tbl":
+            rows = self._table_cells(block)
+            revised_rows = revised._table_cells(revised_block)
+            if [len(r) for r in rows] != [len(r) for r in revised_rows]:
+                return False
+            for row, revised_row in zip(rows, revised_rows):
+                for cell, revised_cell in zip(row, revised_row):
+                    self._diff_blocks(
+                        cell, revised, revised_cell, nodes, counts, import_node
+                    )
+            return True
+        if tag != "w:p":
+            return False
+
+        spans = self._paragraph_spans(block)
+        revised_spans = revised._paragraph_spans(revised_block)
+        if spans is None or revised_spans is None:
+            text = self._block_text(block)
+            revised_text = revised._block_text(revised_block)
+        else:
+            text = "".join(run_text for span in spans for _, run_text in span)
+            revised_text = "".join(t for span in revised_spans for _, t in span)
+        tokens = DIFF_TOKEN.findall(text)
+        revised_tokens = DIFF_TOKEN.findall(revised_text)
+        matcher = SequenceMatcher(None, tokens, revised_tokens, autojunk=False)
+        if matcher.ratio() < MIN_DIFF_SIMILARITY:
+            return False
+        counts["changed"] += 1
+
+        if spans is None or revised_spans is None:
+            # Redline the whole content, keeping the paragraph (and its mark)
+            nodes.extend(self._wrap_runs(block, "w:del"))
+            copy = self._import_node(revised_block)
+            self._prepare_inserted(copy, import_node)
+            for child in self._children_of(copy):
+                if self._tag_of(child) != "w:pPr":
+                    self._append_child(block, child)
+            nodes.extend(self._wrap_runs(block, "w:ins"))
+            return True
+
+        edits = _token_edits(matcher.get_opcodes(), tokens, revised_tokens)
+        offset = 0
+        bounds = []
+        for span in spans:
+            length = sum(len(run_text) for _, run_text in span)
+            bounds.append((offset, offset + length))
+            offset += length
+        span_edits = [[] for _ in spans]
+        for start, end, replacement in edits:
+            if start == end:
+                # An insertion between two spans goes with the first
+                index = next(i for i, (_, b) in enumerate(bounds) if start <= b)
+                a = bounds[index][0]
+                span_edits[index].append((start - a, start - a, replacement))
+                continue
+            hit = [i for i, (a, b) in enumerate(bounds) if a < end and start < b]
+            for i in hit:
+                a, b = bounds[i]
+                span_edits[i].append(
+                    (
+                        max(start, a) - a,
+                        min(end, b) - a,
+                        replacement if i == hit[-1] else "",
+                    )
+                )
+        for span, edits in zip(spans, span_edits):
+            nodes.extend(self._edit_runs(span, edits))
+        return True
+
+    def _blocks_of(self, container):
+        """Return the paragraphs, tables and content controls directly in container."""
+        return [
+            child
+            for child in self._children_of(container)
+            if self._tag_of(child) in ("w:p", "w:tbl", "w:sdt")
+        ]
+
+    def _block_key(self, block):
+        """Return the string blocks are aligned by: their tag and text."""
+        return f"{self._tag_of(block)}\x00{self._block_text(block)}"
+
+    def _block_text(self, block):
+        """Return the current text of a block, with paragraph and cell breaks."""
+        parts = []
+        for elem in self._iter_elements(block):
+            tag = self._tag_of(elem)
+            if tag == "w:t":
+                parts += [c for c in self._content_of(elem) if isinstance(c, str)]
+            elif tag in ("w:p", "w:tc"):
+                parts.append("\x1f")
+            elif tag in ("w:br", "w:cr"):
+                parts.append("\n")
+            elif tag == "w:tab" and self._tag_of(self._parent_of(elem)) == "w:r":
+                parts.append("\t")  # Not a tab stop definition in w:pPr
+        return "".join(parts)
+
+    def _table_cells(self, table):
+        """Return a table's cells as a list of rows."""
+        return [
+            [c for c in self._children_of(row) if self._tag_of(c) == "w:tc"]
+            for row in self._children_of(table)
+            if self._tag_of(row) == "w:tr"
+        ]
+
+    def _paragraph_spans(self, p):
+        """Return the text runs of a paragraph, grouped into spans of adjacent runs.
+
+        Markup without text (bookmarks, proofing marks, comment ranges) splits
+        spans.
+
+        Returns:
+            List of spans, each a list of (w:r, text), or None if the paragraph
+            holds anything besides plain runs and such markup
+        """
+        spans = [[]]
+        for child in self._children_of(p):
+            tag = self._tag_of(child)
+            if tag == "w:pPr":
+                continue
+            text = self._plain_run_text(child)
+            if text is not None:
+                spans[-1].append((child, text))
+            elif tag in TEXTLESS_MARKUP:
+                if spans[-1]:
+                    spans.append([])
+            else:
+                return None
+        return [span for span in spans if span]
+
+    def _append_block(self, container, block):
+        """Append a block to a container, keeping a body's w:sectPr last."""
+        children = self._children_of(container)
+        if children and self._tag_of(children[-1]) == "w:sectPr":
+            self._insert_before_node(children[-1], block)
+        else:
+            self._append_child(container, block)
+
+    def _prepare_inserted(self, block, import_node):
+        """Ready a block copied from another document for marking as inserted.
+
+        Its tracked changes are accepted: their text stands as it reads in the
+        other document, and becomes part of this insertion. Markup referring to
+        the other document (bookmarks, comment markers, note references) is
+        dropped, and its RSIDs and paraIds, which attribute injection then
+        fills in anew.
+        """
+        for elem in list(self._iter_elements(block)):
+            tag = self._tag_of(elem)
+            if tag in DROPPED_ON_IMPORT or tag in ("w:del", "w:moveFrom"):
+                self._remove_node(elem)
+                continue
+            if tag in ("w:ins", "w:moveTo"):
+                for child in self._children_of(elem):
+                    self._insert_before_node(elem, child)
+                self._remove_node(elem)
+                continue
+            for name in RESET_ON_IMPORT:
+                if self._has_attr(elem, name):
+                    self._remove_attr(elem, name)
+        if import_node is not None:
+            import_node(block)
 
+    def _mark_block(self, block, tag):
+        """Mark all content of a block, paragraph marks and table rows included,
+        as inserted or deleted.
 
-def _generate_hex_id() -> str:
-    """Generate random 8-character hex ID for para/durable IDs.
+        Args:
+            block: w:p, w:tbl or w:sdt element (or inline content of a paragraph)
+            tag: "w:ins" or "w:del"
 
-    Values are constrained to be less than 0x7FFFFFFF per OOXML spec:
-    - paraId must be < 0x80000000
-    - durableId must be < 0x7FFFFFFF
-    We use the stricter constraint (0x7FFFFFFF) for both.
+        Returns:
+            List: The new w:ins/w:del elements, not yet injected or indexed
+        """
+        marks = self._wrap_runs(block, tag)
+        own_tag = self._tag_of(block)
+        paragraphs = self._find_all(block, "w:p")
+        if own_tag == "w:p":
+            paragraphs.insert(0, block)
+        rows = [block] if own_tag == "w:tr" else self._find_all(block, "w:tr")
+        for row in rows:
+            marks.append(self._mark_row(row, tag))
+        for paragraph in paragraphs:
+            marks.append(self._mark_paragraph(paragraph, tag))
+        return marks
+
+    def _wrap_runs(self, node, tag):
+        """Wrap each group of adjacent runs in node in a new w:ins or w:del.
+
+        Deleted runs get w:delText/w:delInstrText and w:rsidDel, as in
+        suggest_deletion. Runs already inside a deletion are left alone; runs in
+        an insertion are only wrapped in a deletion, nested inside it.
+
+        Returns:
+            List: The new wrapper elements
+        """
+        containers = RUN_CONTAINERS if tag == "w:del" else RUN_CONTAINERS[:-2]
+        wrappers = []
+        for elem in list(self._iter_elements(node)):
+            if self._tag_of(elem) not in containers:
+                continue
+            group = []
+            for child in self._children_of(elem) + [None]:
+                if child is not None and self._tag_of(child) == "w:r":
+                    group.append(child)
+                    continue
+                if not group:
+                    continue
+                wrapper = self._create_element(tag)
+                self._wrap(group[0], wrapper)
+                for run in group[1:]:
+                    self._append_child(wrapper, run)
+                if tag == "w:del":
+                    for run in group:
+                        self._mark_run_deleted(run)
+                wrappers.append(wrapper)
+                group = []
+        return wrappers
+
+    def _mark_run_deleted(self, run):
+        for name, deleted in (("w:t", "w:delText"), ("w:instrText", "w:delInstrText")):
+            for elem in self._find_all(run, name):
+                self._rename(elem, deleted)
+        if self._has_attr(run, "w:rsidR"):
+            self._set_attr(run, "w:rsidDel", self._get_attr(run, "w:rsidR"))
+            self._remove_attr(run, "w:rsidR")
+
+    def _mark_paragraph(self, p, tag):
+        """Add a w:ins/w:del marker to a paragraph mark; returns the marker."""
+        ppr = self._child(p, "w:pPr")
+        if ppr is None:
+            ppr = self._create_element("w:pPr")
+            self._insert_first(p, ppr)
+        rpr = self._child(ppr, "w:rPr")
+        if rpr is None:
+            rpr = self._create_element("w:rPr")
+            # w:rPr precedes w:sectPr and w:pPrChange
+            following = self._child(ppr, "w:sectPr") or self._child(ppr, "w:pPrChange")
+            if following is not None:
+                self._insert_before_node(following, rpr)
+            else:
+                self._append_child(ppr, rpr)
+        marker = self._create_element(tag)
+        self._insert_first(rpr, marker)
+        return marker
+
+    def _mark_row(self, row, tag):
+        """Add a w:ins/w:del marker to a table row's w:trPr; returns the marker."""
+        trpr = self._child(row, "w:trPr")
+        if trpr is None:
+            trpr = self._create_element("w:trPr")
+            exceptions = self._child(row, "w:tblPrEx")
+            if exceptions is not None:
+                self._insert_after_node(exceptions, trpr)
+            else:
+                self._insert_first(row, trpr)
+        marker = self._create_element(tag)
+        change = self._child(trpr, "w:trPrChange")
+        if change is not None:
+            self._insert_before_node(change, marker)
+        else:
+            self._append_child(trpr, marker)
+        return marker
+
+    def _child(self, elem, tag):
+        """Return the first child element with the given tag, or None."""
+        for child in self._children_of(elem):
+            if self._tag_of(child) == tag:
+                return child
+        return None
+
+
+class LxmlDocxXMLEditor(DocxXMLEditor, LxmlXMLEditor):
+    """DocxXMLEditor on an lxml tree (see LxmlXMLEditor).
+
+    Attributes:
+        dom (lxml.etree._ElementTree): The tree for direct manipulation
     """
-    return f"{random.randint(1, 0x7FFFFFFE):08X}"
 
 
-def _generate_rsid() -> str:
-    """Generate random 8-character hex RSID."""
-    return "".join(random.choices("0123456789ABCDEF", k=8))
+def _literal_pattern(words):
+    """Return a regex matching any of words, preferring the longest at a position.
+
+    The words are merged into a prefix tree, so a regex engine tries at most one
+    branch per distinct next character instead of every word in turn.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End of a word
+
+    def build(node):
+        branches = []
+        for char, child in sorted(node.items()):
+            if not char:
+                continue
+            # Follow single-child chains iteratively to keep recursion shallow
+            literal = char
+            while len(child) == 1 and "" not in child:
+                ((char, child),) = child.items()
+                literal += char
+            branches.append(re.escape(literal) + build(child))
+        if not branches:
+            return ""
+        pattern = "(?:" + "|".join(branches) + ")"
+        # Greedy optional: try the longer words first, fall back to this one
+        return pattern + "?" if "" in node else pattern
+
+    return build(trie)
+
+
+def _block_opcodes(keys, revised_keys):
+    """Return SequenceMatcher-style opcodes aligning two lists of block keys.
+
+    SequenceMatcher alone is quadratic in the number of changes on long
+    lists. Blocks whose key occurs once in each list are matched first, in
+    the longest run that keeps document order (as in patience diff);
+    SequenceMatcher then only aligns the short stretches between them.
+    """
+    counts = Counter(keys)
+    revised_counts = Counter(revised_keys)
+    positions = {
+        key: j for j, key in enumerate(revised_keys) if revised_counts[key] == 1
+    }
+    unique = [
+        (i, positions[key])
+        for i, key in enumerate(keys)
+        if counts[key] == 1 and key in positions
+    ]
+
+    # Longest subsequence of unique matches increasing in both lists
+    tails, tail_indexes, previous = [], [], [None] * len(unique)
+    for n, (_, j) in enumerate(unique):
+        k = bisect_left(tails, j)
+        previous[n] = tail_indexes[k - 1] if k else None
+        if k == len(tails):
+            tails.append(j)
+            tail_indexes.append(n)
+        else:
+            tails[k] = j
+            tail_indexes[k] = n
+    anchors = []
+    n = tail_indexes[-1] if tail_indexes else None
+    while n is not None:
+        anchors.append(unique[n])
+        n = previous[n]
+    anchors.reverse()
+
+    opcodes = []
+    i0 = j0 = 0
+    for i, j in [*anchors, (len(keys), len(revised_keys))]:
+        if i > i0 or j > j0:
+            matcher = SequenceMatcher(
+                None, keys[i0:i], revised_keys[j0:j], autojunk=False
+            )
+            opcodes += [
+                (op, i0 + i1, i0 + i2, j0 + j1, j0 + j2)
+                for op, i1, i2, j1, j2 in matcher.get_opcodes()
+            ]
+        if i < len(keys):
+            opcodes.append(("equal", i, i + 1, j, j + 1))
+        i0, j0 = i + 1, j + 1
+    return opcodes
+
+
+def _token_edits(opcodes, tokens, revised_tokens):
+    """Turn token-level diff opcodes into (start, end, replacement) text edits.
+
+    Changes separated only by whitespace merge into one edit, so a rewritten
+    phrase reads as one deletion and one insertion rather than word by word.
+    """
+    offsets = list(accumulate(map(len, tokens), initial=0))
+    revised_offsets = list(accumulate(map(len, revised_tokens), initial=0))
+    text = "".join(tokens)
+    revised_text = "".join(revised_tokens)
+
+    edits = []
+    previous = None  # (start, end, revised start, revised end) of the last edit
+    for op, i1, i2, j1, j2 in opcodes:
+        if op == "equal":
+            continue
+        start, end = offsets[i1], offsets[i2]
+        revised_start, revised_end = revised_offsets[j1], revised_offsets[j2]
+        if previous is not None and text[previous[1] : start].isspace():
+            edits.pop()
+            start, revised_start = previous[0], previous[2]
+        previous = (start, end, revised_start, revised_end)
+        edits.append((start, end, revised_text[revised_start:revised_end]))
+    return edits
+
+
+def _read_relationships(package, rels_part):
+    """Map the relationship IDs of a .rels part to (type, target, target mode)."""
+    if rels_part not in package:
+        return {}
+    dom = minidom.parseString(package.read(rels_part))
+    return {
+        rel.getAttribute("Id"): (
+            rel.getAttribute("Type"),
+            rel.getAttribute("Target"),
+            rel.getAttribute("TargetMode"),
+        )
+        for rel in dom.getElementsByTagName("Relationship")
+    }
+
+
+def _link_or_copy(src, dst):
+    """Hardlink an XML part from src to dst; copy any other file.
+
+    XML parts are only ever rewritten through the package, which replaces
+    files instead of writing through them, so sharing them by hardlink is
+    safe. Other files (media, embeddings, fonts) are copied, since callers
+    may overwrite them in place (e.g. shutil.copy onto word/media/image1.png).
+    Hardlinking falls back to a copy (e.g. across filesystems).
+    """
+    dst = Path(dst)
+    if dst.exists():
+        if dst.samefile(src):
+            return dst
+        dst.unlink()
+    if not str(src).endswith(XML_SUFFIXES):
+        shutil.copy2(src, dst)
+        return dst
+    return _link(src, dst)
+
+
+def _link(src, dst):
+    """Hardlink src to dst, falling back to a copy (e.g. across filesystems)."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return Path(dst)
+
+
+def _skip_non_xml(directory, names):
+    """copytree ignore function leaving out every file but XML parts."""
+    return [
+        name
+        for name in names
+        if not name.endswith(XML_SUFFIXES)
+        and os.path.isfile(os.path.join(directory, name))
+    ]
+
+
+class IdAllocator:
+    """Hands out unique IDs for one document in O(1).
+
+    Seeded once from the raw XML of the document's parts; after that no
+    allocation looks at the DOM again. Tracks:
+    - change IDs: w:id of w:ins, w:del and other revision elements
+    - comment IDs: w:id of w:comment
+    - hex IDs: paraId, textId and durableId values, unique across all parts
+    - RSIDs: w:rsid* attribute values and the settings.xml w:rsid list
+    """
+
+    REVISION_ID = re.compile(
+        rb"<w:(?:ins|del|moveFrom|moveTo|cellIns|cellDel|cellMerge|\w+Change)\b"
+        rb'[^>]*?\sw:id="(\d+)"'
+    )
+    COMMENT_ID = re.compile(rb'<w:comment\b[^>]*?\sw:id="(\d+)"')
+    HEX_ID = re.compile(
+        rb'\s\w+:(?:paraId|textId|durableId|paraIdParent)="([0-9A-Fa-f]{1,8})"'
+    )
+    RSID = re.compile(rb'(?:\sw:rsid\w*=|<w:rsid(?:Root)?\s+w:val=)"([0-9A-Fa-f]{8})"')
+
+    def __init__(self):
+        self._next_change_id = 0
+        self._next_comment_id = 0
+        self._hex_ids = set()
+        self._rsids = set()
+
+    def seed(self, content):
+        """Record the IDs already used in a part's XML bytes."""
+        for match in self.REVISION_ID.finditer(content):
+            self._next_change_id = max(self._next_change_id, int(match[1]) + 1)
+        for match in self.COMMENT_ID.finditer(content):
+            self._next_comment_id = max(self._next_comment_id, int(match[1]) + 1)
+        self._hex_ids.update(
+            int(match[1], 16) for match in self.HEX_ID.finditer(content)
+        )
+        self._rsids.update(
+            match[1].decode().upper() for match in self.RSID.finditer(content)
+        )
+
+    def change_id(self):
+        """Return the next unused revision ID."""
+        change_id = self._next_change_id
+        self._next_change_id += 1
+        return change_id
+
+    def comment_id(self):
+        """Return the next unused comment ID."""
+        comment_id = self._next_comment_id
+        self._next_comment_id += 1
+        return comment_id
+
+    def hex_id(self):
+        """Return an unused 8-character hex ID for paraId/textId/durableId.
+
+        Values are constrained to be less than 0x7FFFFFFF per OOXML spec:
+        - paraId must be < 0x80000000
+        - durableId must be < 0x7FFFFFFF
+        We use the stricter constraint (0x7FFFFFFF) for both.
+        """
+        while True:
+            value = random.randint(1, 0x7FFFFFFE)
+            if value not in self._hex_ids:
+                self._hex_ids.add(value)
+                return f"{value:08X}"
+
+    def rsid(self):
+        """Return an unused random 8-character hex RSID."""
+        while True:
+            rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+            if rsid not in self._rsids:
+                self._rsids.add(rsid)
+                return rsid
 
 
 class Document:
-    """Manages comments in unpacked Word documents."""
+    """Manages comments in Word documents (unpacked directory, .docx, or package)."""
 
     def __init__(
         self,
@@ -619,36 +1464,92 @@ class Document:
         track_revisions=False,
         author="Claude",
         initials="C",
+        backend="minidom",
     ):
         """
-        Initialize with path to unpacked Word document directory.
-        Automatically sets up comment infrastructure (people.xml, RSIDs).
+        Initialize with an unpacked Word document directory, a .docx file, or an
+        OfficePackage. Automatically sets up comment infrastructure (people.xml, RSIDs).
+
+        A directory is edited in a temporary tree of hardlinked XML parts
+        (unchanged parts cost no copying or disk space); other files are read
+        from the original directory unless replaced in the tree. It is saved
+        back as a directory. A .docx file or OfficePackage is edited in memory and saved
+        straight to a .docx; no unpacked tree is written. With the minidom
+        backend a .docx file is loaded pretty-printed, so line numbers match
+        unpack.py output. The lxml backend skips that minidom pass and reads
+        parts as stored, so look nodes up by attrs or contains= instead of
+        line_number (or open the unpacked directory).
 
         Args:
-            unpacked_dir: Path to unpacked DOCX directory (must contain word/ subdirectory)
+            unpacked_dir: Path to unpacked DOCX directory (must contain word/
+                subdirectory), path to a .docx file, or an OfficePackage
             rsid: Optional RSID to use for all comment elements. If not provided, one will be generated.
             track_revisions: If True, enables track revisions in settings.xml (default: False)
             author: Default author name for comments (default: "Claude")
             initials: Default author initials for comments (default: "C")
+            backend: XML backend for word/document.xml, "minidom" or "lxml"
+                (default: "minidom"). lxml loads and saves large documents faster
+                with far less memory, and .docx parts are not pretty-printed;
+                other parts always use minidom.
         """
-        self.original_path = Path(unpacked_dir)
+        if backend not in ("minidom", "lxml"):
+            raise ValueError(f"Unknown backend: {backend}")
+        self.backend = backend
 
-        if not self.original_path.exists() or not self.original_path.is_dir():
-            raise ValueError(f"Directory not found: {unpacked_dir}")
+        if isinstance(unpacked_dir, OfficePackage):
+            self.package = unpacked_dir
+            self.original_path = unpacked_dir.path
+        else:
+            self.original_path = Path(unpacked_dir)
+            if self.original_path.is_file():
+                # Pretty-printing parses every XML part with minidom; lxml
+                # sessions skip it, so they never pay for a minidom parse
+                self.package = OfficePackage.open(
+                    self.original_path, pretty=backend == "minidom"
+                )
+            elif self.original_path.is_dir():
+                self.package = None
+            else:
+                raise ValueError(f"Directory not found: {unpacked_dir}")
+
+        if self.package is None:
+            # Create temporary directory with subdirectories for unpacked content and baseline.
+            # XML parts are hardlinked and replaced (never written through) when
+            # saved. Other files (media, fonts, ...) are left out and read from
+            # the original directory until the caller adds a file of that name,
+            # so the original stays untouched and nothing is copied.
+            self.temp_dir = tempfile.mkdtemp(prefix="docx_")
+            self.unpacked_path = Path(self.temp_dir) / "unpacked"
+            shutil.copytree(
+                self.original_path,
+                self.unpacked_path,
+                ignore=_skip_non_xml,
+                copy_function=_link,
+            )
 
-        # Create temporary directory with subdirectories for unpacked content and baseline
-        self.temp_dir = tempfile.mkdtemp(prefix="docx_")
-        self.unpacked_path = Path(self.temp_dir) / "unpacked"
-        shutil.copytree(self.original_path, self.unpacked_path)
+            # Validation baseline, packed from the original directory on first validate()
+            self.original_docx = None
 
-        # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
-        self.original_docx = Path(self.temp_dir) / "original.docx"
-        pack_document(self.original_path, self.original_docx, validate=False)
+            self.package = OfficePackage.from_directory(
+                self.unpacked_path, underlay=self.original_path
+            )
+        else:
+            # In-memory session: the baseline (package.original()) is only
+            # materialized to validate
+            self.unpacked_path = None
+            self.original_docx = None
 
-        self.word_path = self.unpacked_path / "word"
+        # Part names at session start, to find added/removed parts when validating
+        self._original_names = set(self.package.names())
+
+        # Seed IDs from every part once, so allocations never rescan the DOM
+        self.ids = IdAllocator()
+        for name in self.package.names():
+            if name.startswith("word/") and name.endswith(".xml"):
+                self.ids.seed(self.package.read(name))
 
         # Generate RSID if not provided
-        self.rsid = rsid if rsid else _generate_rsid()
+        self.rsid = rsid if rsid else self.ids.rsid()
         print(f"Using RSID: {self.rsid}")
 
         # Set default author and initials
@@ -658,15 +1559,8 @@ class Document:
         # Cache for lazy-loaded editors
         self._editors = {}
 
-        # Comment file paths
-        self.comments_path = self.word_path / "comments.xml"
-        self.comments_extended_path = self.word_path / "commentsExtended.xml"
-        self.comments_ids_path = self.word_path / "commentsIds.xml"
-        self.comments_extensible_path = self.word_path / "commentsExtensible.xml"
-
-        # Load existing comments and determine next ID (before setup modifies files)
+        # Load existing comments (before setup modifies files)
         self.existing_comments = self._load_existing_comments()
-        self.next_comment_id = self._get_next_comment_id()
 
         # Convenient access to document.xml editor (semi-private)
         self._document = self["word/document.xml"]
@@ -691,7 +1585,7 @@ class Document:
             DocxXMLEditor instance for the specified file
 
         Raises:
-            ValueError: If the file does not exist
+            ValueError: If the part does not exist
 
         Example:
             # Get node from document.xml
@@ -701,12 +1595,19 @@ class Document:
             comment = doc["word/comments.xml"].get_node(tag="w:comment", attrs={"w:id": "0"})
         """
         if xml_path not in self._editors:
-            file_path = self.unpacked_path / xml_path
-            if not file_path.exists():
+            if xml_path not in self.package:
                 raise ValueError(f"XML file not found: {xml_path}")
             # Use DocxXMLEditor with RSID, author, and initials for all editors
-            self._editors[xml_path] = DocxXMLEditor(
-                file_path, rsid=self.rsid, author=self.author, initials=self.initials
+            editor_class = DocxXMLEditor
+            if self.backend == "lxml" and xml_path == "word/document.xml":
+                editor_class = LxmlDocxXMLEditor
+            self._editors[xml_path] = editor_class(
+                xml_path,
+                rsid=self.rsid,
+                author=self.author,
+                initials=self.initials,
+                package=self.package,
+                ids=self.ids,
             )
         return self._editors[xml_path]
 
@@ -727,40 +1628,74 @@ class Document:
             end_node = cm.get_document_node(tag="w:ins", id="2")
             cm.add_comment(start=start_node, end=end_node, text="Explanation")
         """
-        comment_id = self.next_comment_id
-        para_id = _generate_hex_id()
-        durable_id = _generate_hex_id()
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return self.add_comments([{"start": start, "end": end, "text": text}])[0]
 
-        # Add comment ranges to document.xml immediately
-        self._document.insert_before(start, self._comment_range_start_xml(comment_id))
+    def add_comments(self, comments) -> list:
+        """
+        Add many comments at once, touching each comments part a single time.
 
-        # If end node is a paragraph, append comment markup inside it
-        # Otherwise insert after it (for run-level anchors)
-        if end.tagName == "w:p":
-            self._document.append_to(end, self._comment_range_end_xml(comment_id))
-        else:
-            self._document.insert_after(end, self._comment_range_end_xml(comment_id))
+        IDs and the timestamp are allocated up front; the anchors for all
+        comments are parsed as one fragment, and comments.xml and its companion
+        parts each get one append. Much faster than calling add_comment in a
+        loop when adding hundreds of comments.
 
-        # Add to comments.xml immediately
-        self._add_to_comments_xml(
-            comment_id, para_id, text, self.author, self.initials, timestamp
-        )
+        Args:
+            comments: Iterable of dicts with the add_comment arguments
+                ("start", "end", "text")
+
+        Returns:
+            List of the comment IDs created, in input order
 
-        # Add to commentsExtended.xml immediately
-        self._add_to_comments_extended_xml(para_id, parent_para_id=None)
+        Example:
+            cm.add_comments([
+                {"start": del_node, "end": del_node, "text": "Why remove this?"},
+                {"start": para, "end": para, "text": "Needs a citation"},
+            ])
+        """
+        comments = list(comments)
+        if not comments:
+            return []
+
+        comment_ids = [self.ids.comment_id() for _ in comments]
+        entries = [
+            (comment_id, self.ids.hex_id(), self.ids.hex_id(), comment["text"], None)
+            for comment_id, comment in zip(comment_ids, comments)
+        ]
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-        # Add to commentsIds.xml immediately
-        self._add_to_comments_ids_xml(para_id, durable_id)
+        # Add comment ranges to document.xml: one parse for all anchors, then
+        # attribute injection and indexing for all of them at once
+        document = self._document
+        fragment = "".join(map(self._comment_range_start_xml, comment_ids))
+        fragment += "".join(map(self._comment_range_end_xml, comment_ids))
+        nodes = [
+            node
+            for node in document._parse_fragment(fragment)
+            if document._is_element(node)
+        ]
+        range_starts, range_ends = nodes[: len(comments)], nodes[len(comments) :]
+        for i, comment in enumerate(comments):
+            document._insert_before_node(comment["start"], range_starts[i])
+
+            # If end node is a paragraph, append comment markup inside it
+            # Otherwise insert after it (for run-level anchors)
+            range_end, ref_run = range_ends[2 * i], range_ends[2 * i + 1]
+            end = comment["end"]
+            if document._tag_of(end) == "w:p":
+                document._append_child(end, range_end)
+                document._append_child(end, ref_run)
+            else:
+                document._insert_after_node(end, range_end)
+                document._insert_after_node(range_end, ref_run)
+        document._nodes_inserted(nodes)
 
-        # Add to commentsExtensible.xml immediately
-        self._add_to_comments_extensible_xml(durable_id)
+        self._add_to_comment_parts(entries, timestamp)
 
         # Update existing_comments so replies work
-        self.existing_comments[comment_id] = {"para_id": para_id}
+        for comment_id, para_id, *_ in entries:
+            self.existing_comments[comment_id] = {"para_id": para_id}
 
-        self.next_comment_id += 1
-        return comment_id
+        return comment_ids
 
     def reply_to_comment(
         self,
@@ -784,23 +1719,23 @@ class Document:
             raise ValueError(f"Parent comment with id={parent_comment_id} not found")
 
         parent_info = self.existing_comments[parent_comment_id]
-        comment_id = self.next_comment_id
-        para_id = _generate_hex_id()
-        durable_id = _generate_hex_id()
+        comment_id = self.ids.comment_id()
+        para_id = self.ids.hex_id()
+        durable_id = self.ids.hex_id()
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
         # Add comment ranges to document.xml immediately
-        parent_start_elem = self._document.get_node(
+        parent_start_elem = self._document._get_node(
             tag="w:commentRangeStart", attrs={"w:id": str(parent_comment_id)}
         )
-        parent_ref_elem = self._document.get_node(
+        parent_ref_elem = self._document._get_node(
             tag="w:commentReference", attrs={"w:id": str(parent_comment_id)}
         )
 
         self._document.insert_after(
             parent_start_elem, self._comment_range_start_xml(comment_id)
         )
-        parent_ref_run = parent_ref_elem.parentNode
+        parent_ref_run = self._document._parent_of(parent_ref_elem)
         self._document.insert_after(
             parent_ref_run, f'<w:commentRangeEnd w:id="{comment_id}"/>'
         )
@@ -808,28 +1743,61 @@ class Document:
             parent_ref_run, self._comment_ref_run_xml(comment_id)
         )
 
-        # Add to comments.xml immediately
-        self._add_to_comments_xml(
-            comment_id, para_id, text, self.author, self.initials, timestamp
+        # Add to comments.xml and its companion parts immediately
+        self._add_to_comment_parts(
+            [(comment_id, para_id, durable_id, text, parent_info["para_id"])],
+            timestamp,
         )
 
-        # Add to commentsExtended.xml immediately (with parent)
-        self._add_to_comments_extended_xml(
-            para_id, parent_para_id=parent_info["para_id"]
-        )
-
-        # Add to commentsIds.xml immediately
-        self._add_to_comments_ids_xml(para_id, durable_id)
-
-        # Add to commentsExtensible.xml immediately
-        self._add_to_comments_extensible_xml(durable_id)
-
         # Update existing_comments so replies work
         self.existing_comments[comment_id] = {"para_id": para_id}
 
-        self.next_comment_id += 1
         return comment_id
 
+    def suggest_diff(self, revised) -> dict:
+        """
+        Redline word/document.xml against a revised version of the document.
+
+        The document becomes the revised version, with every difference in the
+        body shown as tracked changes by this session's author (see
+        DocxXMLEditor.suggest_diff). Hyperlinks and images in inserted content
+        keep working: their relationships, and image parts, are copied over.
+        Other related parts (charts, embedded objects) are not; references to
+        them are dropped.
+
+        Args:
+            revised: The revised document: unpacked directory, .docx file or
+                OfficePackage
+
+        Returns:
+            dict: Number of "equal", "changed", "inserted" and "deleted" blocks
+
+        Example:
+            doc = Document("contract-v1.docx")
+            doc.suggest_diff("contract-v2.docx")
+            doc.save("contract-redline.docx")
+        """
+        if isinstance(revised, OfficePackage):
+            revised_package = revised
+        elif Path(revised).is_file():
+            revised_package = OfficePackage.open(revised)
+        elif Path(revised).is_dir():
+            revised_package = OfficePackage.from_directory(revised)
+        else:
+            raise ValueError(f"Revised document not found: {revised}")
+
+        editor_class = type(self._document)
+        revised_editor = editor_class(
+            "word/document.xml",
+            rsid=self.rsid,
+            author=self.author,
+            initials=self.initials,
+            package=revised_package,
+        )
+        return self._document.suggest_diff(
+            revised_editor, import_node=self._relationship_importer(revised_package)
+        )
+
     def __del__(self):
         """Clean up temporary directory on deletion."""
         if hasattr(self, "temp_dir") and Path(self.temp_dir).exists():
@@ -839,77 +1807,149 @@ class Document:
         """
         Validate the document against XSD schema and redlining rules.
 
+        Only the checks relevant to parts changed in this session run: per-file
+        checks on changed parts, package-wide reference checks if relationships,
+        content types or the set of parts changed, and redlining checks if
+        word/document.xml changed.
+
         Raises:
             ValueError: If validation fails.
         """
+        parts = self._changed_parts()
+        if not parts:
+            return
+
+        if self.unpacked_path is not None:
+            self._flush()
+            # Validators check references on disk, so show them the whole tree;
+            # the links only live while no caller code runs
+            linked = self._add_source_files(self.unpacked_path, _link)
+            try:
+                self._run_validators(self.unpacked_path, self._baseline_docx(), parts)
+            finally:
+                for file in linked:
+                    file.unlink()
+            return
+
+        # In-memory session: validators work on files, so materialize both sides
+        with tempfile.TemporaryDirectory(prefix="docx_") as temp_dir:
+            unpacked_path = Path(temp_dir) / "unpacked"
+            original_docx = Path(temp_dir) / "original.docx"
+            self.package.extract(unpacked_path)
+            self.package.original().save(original_docx)
+            self._run_validators(unpacked_path, original_docx, parts)
+
+    def _run_validators(self, unpacked_path, original_docx, parts=None):
+        """Run schema and redlining validation on an unpacked tree."""
         # Create validators with current state
         schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            unpacked_path, original_docx, verbose=False, parts=parts
         )
         redlining_validator = RedliningValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            unpacked_path, original_docx, verbose=False
         )
 
         # Run validations
         if not schema_validator.validate():
             raise ValueError("Schema validation failed")
-        if not redlining_validator.validate():
-            raise ValueError("Redlining validation failed")
+        if parts is None or "word/document.xml" in parts:
+            if not redlining_validator.validate():
+                raise ValueError("Redlining validation failed")
+
+    def _changed_parts(self):
+        """Return the parts modified, added or removed in this session."""
+        names = set(self.package.names())
+        return self.package.modified | (names ^ self._original_names)
 
     def save(self, destination=None, validate=True) -> None:
         """
         Save all modified XML files to disk and copy to destination directory.
 
         This persists all changes made via add_comment() and reply_to_comment().
+        Only parts changed in this session are serialized; unchanged XML parts
+        are hardlinked (other files copied), or skipped when the destination
+        already has them. Sessions opened from a .docx or OfficePackage are
+        written as a .docx when the destination ends in .docx, otherwise as an
+        unpacked directory.
 
         Args:
-            destination: Optional path to save to. If None, saves back to original directory.
+            destination: Optional path to save to. If None, saves back to the
+                original directory or .docx file.
             validate: If True, validates document before saving (default: True).
         """
         # Only ensure comment relationships and content types if comment files exist
-        if self.comments_path.exists():
+        if "word/comments.xml" in self.package:
             self._ensure_comment_relationships()
             self._ensure_comment_content_types()
 
-        # Save all modified XML files in temp directory
-        for editor in self._editors.values():
-            editor.save()
-
         # Validate by default
         if validate:
             self.validate()
 
-        # Copy contents from temp directory to destination (or original directory)
         target_path = Path(destination) if destination else self.original_path
-        shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+        if target_path is None:
+            raise ValueError("No destination given and package has no source file")
+
+        if self.unpacked_path is not None:
+            if target_path.resolve() == self.original_path.resolve():
+                # Keep the baseline available for later validate() calls
+                self._baseline_docx()
+            # Write modified parts to temp directory, then copy to destination
+            self._flush()
+            shutil.copytree(
+                self.unpacked_path,
+                target_path,
+                dirs_exist_ok=True,
+                copy_function=_link_or_copy,
+            )
+            if target_path.resolve() != self.original_path.resolve():
+                self._add_source_files(target_path, _link_or_copy)
+        elif target_path.suffix.lower() == ".docx":
+            self.package.save(target_path)
+        else:
+            self.package.extract(target_path)
 
-    # ==================== Private: Initialization ====================
+    def _add_source_files(self, directory, copy_function):
+        """Put the original's files missing from the session tree into directory.
 
-    def _get_next_comment_id(self):
-        """Get the next available comment ID."""
-        if not self.comments_path.exists():
-            return 0
+        Those are the non-XML files the session has not replaced, which the
+        session tree leaves out.
 
-        editor = self["word/comments.xml"]
-        max_id = -1
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
-            comment_id = comment_elem.getAttribute("w:id")
-            if comment_id:
-                try:
-                    max_id = max(max_id, int(comment_id))
-                except ValueError:
-                    pass
-        return max_id + 1
+        Returns:
+            list: Paths of the files added
+        """
+        added = []
+        for file in self.original_path.rglob("*"):
+            name = file.relative_to(self.original_path)
+            if not file.is_file() or (self.unpacked_path / name).exists():
+                continue
+            target = directory / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            added.append(copy_function(file, target))
+        return added
+
+    def _flush(self):
+        """Write parts modified in memory to the temporary unpacked directory."""
+        self.package.extract(self.unpacked_path, names=sorted(self.package.modified))
+
+    def _baseline_docx(self):
+        """Pack the original directory into the validation baseline, once."""
+        if self.original_docx is None:
+            self.original_docx = Path(self.temp_dir) / "original.docx"
+            pack_document(self.original_path, self.original_docx, validate=False)
+        return self.original_docx
+
+    # ==================== Private: Initialization ====================
 
     def _load_existing_comments(self):
         """Load existing comments from files to enable replies."""
-        if not self.comments_path.exists():
+        if "word/comments.xml" not in self.package:
             return {}
 
         editor = self["word/comments.xml"]
         existing = {}
 
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
+        for comment_elem in editor._dom.getElementsByTagName("w:comment"):
             comment_id = comment_elem.getAttribute("w:id")
             if not comment_id:
                 continue
@@ -931,31 +1971,29 @@ class Document:
     # ==================== Private: Setup Methods ====================
 
     def _setup_tracking(self, track_revisions=False):
-        """Set up comment infrastructure in unpacked directory.
+        """Set up comment infrastructure in the document package.
 
         Args:
             track_revisions: If True, enables track revisions in settings.xml
         """
         # Create or update word/people.xml
-        people_file = self.word_path / "people.xml"
-        self._update_people_xml(people_file)
+        self._update_people_xml("word/people.xml")
 
         # Update XML files
-        self._add_content_type_for_people(self.unpacked_path / "[Content_Types].xml")
-        self._add_relationship_for_people(
-            self.word_path / "_rels" / "document.xml.rels"
-        )
+        self._add_content_type_for_people("[Content_Types].xml")
+        self._add_relationship_for_people("word/_rels/document.xml.rels")
 
         # Always add RSID to settings.xml, optionally enable trackRevisions
-        self._update_settings(
-            self.word_path / "settings.xml", track_revisions=track_revisions
-        )
+        self._update_settings("word/settings.xml", track_revisions=track_revisions)
 
     def _update_people_xml(self, path):
         """Create people.xml if it doesn't exist."""
-        if not path.exists():
-            # Copy from template
-            shutil.copy(TEMPLATE_DIR / "people.xml", path)
+        self._ensure_part_from_template(path, "people.xml")
+
+    def _ensure_part_from_template(self, part_name, template_name):
+        """Add a part copied from TEMPLATE_DIR if the package doesn't have it yet."""
+        if part_name not in self.package:
+            self.package.write(part_name, (TEMPLATE_DIR / template_name).read_bytes())
 
     def _add_content_type_for_people(self, path):
         """Add people.xml content type to [Content_Types].xml if not already present."""
@@ -965,7 +2003,7 @@ class Document:
             return
 
         # Add Override element
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
         override_xml = '<Override PartName="/word/people.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.people+xml"/>'
         editor.append_to(root, override_xml)
 
@@ -976,7 +2014,7 @@ class Document:
         if self._has_relationship(editor, "people.xml"):
             return
 
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
         root_tag = root.tagName  # type: ignore
         prefix = root_tag.split(":")[0] + ":" if ":" in root_tag else ""
         next_rid = editor.get_next_rid()
@@ -989,7 +2027,7 @@ class Document:
         """Add RSID and optionally enable track revisions in settings.xml.
 
         Args:
-            path: Path to settings.xml
+            path: Part name of settings.xml
             track_revisions: If True, adds trackRevisions element
 
         Places elements per OOXML schema order:
@@ -997,14 +2035,14 @@ class Document:
         - rsids: late (after compat)
         """
         editor = self["word/settings.xml"]
-        root = editor.get_node(tag="w:settings")
+        root = editor._get_node(tag="w:settings")
         prefix = root.tagName.split(":")[0] if ":" in root.tagName else "w"
 
         # Conditionally add trackRevisions if requested
         if track_revisions:
             track_revisions_exists = any(
                 elem.tagName == f"{prefix}:trackRevisions"
-                for elem in editor.dom.getElementsByTagName(f"{prefix}:trackRevisions")
+                for elem in editor._dom.getElementsByTagName(f"{prefix}:trackRevisions")
             )
 
             if not track_revisions_exists:
@@ -1012,7 +2050,7 @@ class Document:
                 # Try to insert before documentProtection, defaultTabStop, or at start
                 inserted = False
                 for tag in [f"{prefix}:documentProtection", f"{prefix}:defaultTabStop"]:
-                    elements = editor.dom.getElementsByTagName(tag)
+                    elements = editor._dom.getElementsByTagName(tag)
                     if elements:
                         editor.insert_before(elements[0], track_rev_xml)
                         inserted = True
@@ -1025,7 +2063,7 @@ class Document:
                         editor.append_to(root, track_rev_xml)
 
         # Always check if rsids section exists
-        rsids_elements = editor.dom.getElementsByTagName(f"{prefix}:rsids")
+        rsids_elements = editor._dom.getElementsByTagName(f"{prefix}:rsids")
 
         if not rsids_elements:
             # Add new rsids section
@@ -1036,13 +2074,13 @@ class Document:
 
             # Try to insert after compat, before clrSchemeMapping, or before closing tag
             inserted = False
-            compat_elements = editor.dom.getElementsByTagName(f"{prefix}:compat")
+            compat_elements = editor._dom.getElementsByTagName(f"{prefix}:compat")
             if compat_elements:
                 editor.insert_after(compat_elements[0], rsids_xml)
                 inserted = True
 
             if not inserted:
-                clr_elements = editor.dom.getElementsByTagName(
+                clr_elements = editor._dom.getElementsByTagName(
                     f"{prefix}:clrSchemeMapping"
                 )
                 if clr_elements:
@@ -1065,70 +2103,90 @@ class Document:
 
     # ==================== Private: XML File Creation ====================
 
-    def _add_to_comments_xml(
-        self, comment_id, para_id, text, author, initials, timestamp
-    ):
-        """Add a single comment to comments.xml."""
-        if not self.comments_path.exists():
-            shutil.copy(TEMPLATE_DIR / "comments.xml", self.comments_path)
+    def _add_to_comment_parts(self, entries, timestamp):
+        """Add comments to comments.xml, commentsExtended.xml, commentsIds.xml
+        and commentsExtensible.xml, with one parse and append per part.
 
-        editor = self["word/comments.xml"]
-        root = editor.get_node(tag="w:comments")
+        Args:
+            entries: List of (comment_id, para_id, durable_id, text,
+                parent_para_id) tuples; parent_para_id is None for top-level
+                comments
+            timestamp: Date stamped on every comment
+        """
+        parts = [
+            (
+                "comments.xml",
+                "w:comments",
+                [
+                    self._comment_xml(comment_id, para_id, text, timestamp)
+                    for comment_id, para_id, _, text, _ in entries
+                ],
+            ),
+            (
+                "commentsExtended.xml",
+                "w15:commentsEx",
+                [
+                    self._comment_ex_xml(para_id, parent_para_id)
+                    for _, para_id, _, _, parent_para_id in entries
+                ],
+            ),
+            (
+                "commentsIds.xml",
+                "w16cid:commentsIds",
+                [
+                    self._comment_id_xml(para_id, durable_id)
+                    for _, para_id, durable_id, _, _ in entries
+                ],
+            ),
+            (
+                "commentsExtensible.xml",
+                "w16cex:commentsExtensible",
+                [
+                    self._comment_extensible_xml(durable_id, timestamp)
+                    for _, _, durable_id, _, _ in entries
+                ],
+            ),
+        ]
+        for template_name, root_tag, fragments in parts:
+            part_name = f"word/{template_name}"
+            self._ensure_part_from_template(part_name, template_name)
 
+            editor = self[part_name]
+            root = editor._get_node(tag=root_tag)
+            editor.append_to(root, "".join(fragments))
+
+    # ==================== Private: XML Fragments ====================
+
+    def _comment_xml(self, comment_id, para_id, text, timestamp):
+        """Generate XML for a comment in comments.xml.
+
+        Note: w:rsidR, w:rsidRDefault, w:rsidP on w:p, w:rsidR on w:r,
+        and w:author, w:initials on w:comment are automatically added by
+        DocxXMLEditor.
+        """
         escaped_text = (
             text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
         )
-        # Note: w:rsidR, w:rsidRDefault, w:rsidP on w:p, w:rsidR on w:r,
-        # and w:author, w:date, w:initials on w:comment are automatically added by DocxXMLEditor
-        comment_xml = f'''<w:comment w:id="{comment_id}">
+        return f'''<w:comment w:id="{comment_id}" w:date="{timestamp}">
   <w:p w14:paraId="{para_id}" w14:textId="77777777">
     <w:r><w:rPr><w:rStyle w:val="CommentReference"/></w:rPr><w:annotationRef/></w:r>
     <w:r><w:rPr><w:color w:val="000000"/><w:sz w:val="20"/><w:szCs w:val="20"/></w:rPr><w:t>{escaped_text}</w:t></w:r>
   </w:p>
 </w:comment>'''
-        editor.append_to(root, comment_xml)
-
-    def _add_to_comments_extended_xml(self, para_id, parent_para_id):
-        """Add a single comment to commentsExtended.xml."""
-        if not self.comments_extended_path.exists():
-            shutil.copy(
-                TEMPLATE_DIR / "commentsExtended.xml", self.comments_extended_path
-            )
-
-        editor = self["word/commentsExtended.xml"]
-        root = editor.get_node(tag="w15:commentsEx")
 
+    def _comment_ex_xml(self, para_id, parent_para_id):
+        """Generate XML for a comment in commentsExtended.xml."""
         if parent_para_id:
-            xml = f'<w15:commentEx w15:paraId="{para_id}" w15:paraIdParent="{parent_para_id}" w15:done="0"/>'
-        else:
-            xml = f'<w15:commentEx w15:paraId="{para_id}" w15:done="0"/>'
-        editor.append_to(root, xml)
-
-    def _add_to_comments_ids_xml(self, para_id, durable_id):
-        """Add a single comment to commentsIds.xml."""
-        if not self.comments_ids_path.exists():
-            shutil.copy(TEMPLATE_DIR / "commentsIds.xml", self.comments_ids_path)
-
-        editor = self["word/commentsIds.xml"]
-        root = editor.get_node(tag="w16cid:commentsIds")
-
-        xml = f'<w16cid:commentId w16cid:paraId="{para_id}" w16cid:durableId="{durable_id}"/>'
-        editor.append_to(root, xml)
-
-    def _add_to_comments_extensible_xml(self, durable_id):
-        """Add a single comment to commentsExtensible.xml."""
-        if not self.comments_extensible_path.exists():
-            shutil.copy(
-                TEMPLATE_DIR / "commentsExtensible.xml", self.comments_extensible_path
-            )
-
-        editor = self["word/commentsExtensible.xml"]
-        root = editor.get_node(tag="w16cex:commentsExtensible")
+            return f'<w15:commentEx w15:paraId="{para_id}" w15:paraIdParent="{parent_para_id}" w15:done="0"/>'
+        return f'<w15:commentEx w15:paraId="{para_id}" w15:done="0"/>'
 
-        xml = f'<w16cex:commentExtensible w16cex:durableId="{durable_id}"/>'
-        editor.append_to(root, xml)
+    def _comment_id_xml(self, para_id, durable_id):
+        """Generate XML for a comment in commentsIds.xml."""
+        return f'<w16cid:commentId w16cid:paraId="{para_id}" w16cid:durableId="{durable_id}"/>'
 
-    # ==================== Private: XML Fragments ====================
+    def _comment_extensible_xml(self, durable_id, timestamp):
+        """Generate XML for a comment in commentsExtensible.xml."""
+        return f'<w16cex:commentExtensible w16cex:durableId="{durable_id}" w16cex:dateUtc="{timestamp}"/>'
 
     def _comment_range_start_xml(self, comment_id):
         """Generate XML for comment range start."""
@@ -1155,39 +2213,147 @@ class Document:
   <w:commentReference w:id="{comment_id}"/>
 </w:r>'''
 
-    # ==================== Private: Metadata Updates ====================
+    # ==================== Private: Imported Content ====================
+
+    def _relationship_importer(self, revised_package):
+        """Return an import_node callback re-pointing r:* references at copies.
+
+        Each relationship of the revised word/document.xml that copied content
+        uses is added to this document once (with its part, for internal
+        targets without relationships of their own, e.g. images).
+        """
+        editor = self._document
+        relationships = None
+        imported = {}
+
+        def import_node(node):
+            nonlocal relationships
+            for elem in editor._iter_elements(node):
+                for name in RELATIONSHIP_ATTRIBUTES:
+                    if not editor._has_attr(elem, name):
+                        continue
+                    rel_id = editor._get_attr(elem, name)
+                    if rel_id not in imported:
+                        if relationships is None:
+                            relationships = _read_relationships(
+                                revised_package, "word/_rels/document.xml.rels"
+                            )
+                        imported[rel_id] = self._import_relationship(
+                            revised_package, relationships.get(rel_id)
+                        )
+                    if imported[rel_id] is None:
+                        editor._remove_attr(elem, name)
+                    else:
+                        editor._set_attr(elem, name, imported[rel_id])
+
+        return import_node
+
+    def _import_relationship(self, revised_package, relationship):
+        """Add a relationship of the revised document to this one.
+
+        Args:
+            revised_package: OfficePackage of the revised document
+            relationship: (type, target, target mode) from _read_relationships
+
+        Returns:
+            str: The new relationship ID, or None if it cannot be carried over
+        """
+        if relationship is None:
+            return None
+        rel_type, target, target_mode = relationship
+        if target_mode != "External":
+            source = posixpath.normpath(posixpath.join("word", target))
+            folder, name = posixpath.split(source)
+            if source not in revised_package or (
+                f"{folder}/_rels/{name}.rels" in revised_package
+            ):
+                return None
+            data = revised_package.read(source)
+            part_name = self._free_part_name(source, data)
+            if part_name not in self.package:
+                self.package.write(part_name, data)
+                self._ensure_content_type(revised_package, source, part_name)
+            target = posixpath.relpath(part_name, "word")
+
+        editor = self["word/_rels/document.xml.rels"]
+        root = editor._dom.documentElement
+        root_tag = root.tagName  # type: ignore
+        prefix = root_tag.split(":")[0] + ":" if ":" in root_tag else ""
+        rel_id = editor.get_next_rid()
+        mode = ' TargetMode="External"' if target_mode == "External" else ""
+        rel_xml = (
+            f'<{prefix}Relationship Id="{rel_id}" '
+            f'Type="{html.escape(rel_type, quote=True)}" '
+            f'Target="{html.escape(target, quote=True)}"{mode}/>'
+        )
+        editor.append_to(root, rel_xml)
+        return rel_id
+
+    def _free_part_name(self, part_name, data):
+        """Return part_name, or a numbered variant, that is unused or holds data."""
+        stem, extension = posixpath.splitext(part_name)
+        candidate = part_name
+        number = 1
+        while candidate in self.package and self.package.read(candidate) != data:
+            candidate = f"{stem}_{number}{extension}"
+            number += 1
+        return candidate
+
+    def _ensure_content_type(self, revised_package, source, part_name):
+        """Give a copied part the content type it had in the revised document."""
+        editor = self["[Content_Types].xml"]
+        revised_types = minidom.parseString(revised_package.read("[Content_Types].xml"))
+        for override in revised_types.getElementsByTagName("Override"):
+            if override.getAttribute("PartName") == f"/{source}":
+                content_type = html.escape(override.getAttribute("ContentType"), True)
+                editor.append_to(
+                    editor._dom.documentElement,
+                    f'<Override PartName="/{part_name}" ContentType="{content_type}"/>',
+                )
+                return
+
+        extension = posixpath.splitext(part_name)[1][1:].lower()
+        for default in editor._dom.getElementsByTagName("Default"):
+            if default.getAttribute("Extension").lower() == extension:
+                return
+        for default in revised_types.getElementsByTagName("Default"):
+            if default.getAttribute("Extension").lower() == extension:
+                content_type = html.escape(default.getAttribute("ContentType"), True)
+                editor.append_to(
+                    editor._dom.documentElement,
+                    f'<Default Extension="{extension}" ContentType="{content_type}"/>',
+                )
+                return
 
     def _has_relationship(self, editor, target):
         """Check if a relationship with given target exists."""
-        for rel_elem in editor.dom.getElementsByTagName("Relationship"):
+        for rel_elem in editor._dom.getElementsByTagName("Relationship"):
             if rel_elem.getAttribute("Target") == target:
                 return True
         return False
 
     def _has_override(self, editor, part_name):
         """Check if an override with given part name exists."""
-        for override_elem in editor.dom.getElementsByTagName("Override"):
+        for override_elem in editor._dom.getElementsByTagName("Override"):
             if override_elem.getAttribute("PartName") == part_name:
                 return True
         return False
 
     def _has_author(self, editor, author):
         """Check if an author already exists in people.xml."""
-        for person_elem in editor.dom.getElementsByTagName("w15:person"):
+        for person_elem in editor._dom.getElementsByTagName("w15:person"):
             if person_elem.getAttribute("w15:author") == author:
                 return True
         return False
 
     def _add_author_to_people(self, author):
         """Add author to people.xml (called during initialization)."""
-        people_path = self.word_path / "people.xml"
-
         # people.xml should already exist from _setup_tracking
-        if not people_path.exists():
+        if "word/people.xml" not in self.package:
             raise ValueError("people.xml should exist after _setup_tracking")
 
         editor = self["word/people.xml"]
-        root = editor.get_node(tag="w15:people")
+        root = editor._get_node(tag="w15:people")
 
         # Check if author already exists
         if self._has_author(editor, author):
@@ -1207,7 +2373,7 @@ class Document:
         if self._has_relationship(editor, "comments.xml"):
             return
 
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
         root_tag = root.tagName  # type: ignore
         prefix = root_tag.split(":")[0] + ":" if ":" in root_tag else ""
         next_rid_num = int(editor.get_next_rid()[3:])
@@ -1247,7 +2413,7 @@ class Document:
         if self._has_override(editor, "/word/comments.xml"):
             return
 
-        root = editor.dom.documentElement
+        root = editor._dom.documentElement
 
         # Add Override elements
         overrides = [
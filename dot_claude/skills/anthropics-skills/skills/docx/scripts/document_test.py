@@ -0,0 +1,191 @@
+import shutil
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from xml.dom import minidom
+
+from scripts.document import Document
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types"><Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/><Default Extension="xml" ContentType="application/xml"/><Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/><Override PartName="/word/settings.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/></Types>"""
+
+PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships"><Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/></Relationships>"""
+
+DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships"><Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/settings" Target="settings.xml"/></Relationships>"""
+
+DOCUMENT = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body><w:p><w:r><w:t>Hello</w:t></w:r></w:p><w:sectPr><w:pgSz w:w="11906" w:h="16838"/></w:sectPr></w:body></w:document>"""
+
+SETTINGS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:settings xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:compat/></w:settings>"""
+
+
+class TestDirectDomEdits(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.source = Path(self.temp_dir.name) / "source.docx"
+        self.output = Path(self.temp_dir.name) / "output.docx"
+        with zipfile.ZipFile(self.source, "w") as zf:
+            zf.writestr("[Content_Types].xml", CONTENT_TYPES)
+            zf.writestr("_rels/.rels", PACKAGE_RELS)
+            zf.writestr("word/document.xml", DOCUMENT)
+            zf.writestr("word/_rels/document.xml.rels", DOCUMENT_RELS)
+            zf.writestr("word/settings.xml", SETTINGS)
+
+    def saved_document_xml(self):
+        with zipfile.ZipFile(self.output) as zf:
+            return zf.read("word/document.xml").decode("utf-8")
+
+    def test_get_node_edit_survives_save(self):
+        """Editing a node returned by get_node is saved without reindex()"""
+        doc = Document(str(self.source))
+        doc["word/document.xml"].get_node(tag="w:pgSz").setAttribute("w:w", "12000")
+        doc.save(str(self.output), validate=False)
+        self.assertIn('w:w="12000"', self.saved_document_xml())
+
+    def test_dom_edit_survives_save(self):
+        """Editing editor.dom directly is saved without reindex()"""
+        doc = Document(str(self.source))
+        dom = doc["word/document.xml"].dom
+        dom.getElementsByTagName("w:pgSz")[0].setAttribute("w:h", "15840")
+        doc.save(str(self.output), validate=False)
+        self.assertIn('w:h="15840"', self.saved_document_xml())
+
+    def test_no_op_session_modifies_nothing(self):
+        """Reading parts during setup and save does not mark them modified"""
+        for backend in ("minidom", "lxml"):
+            with self.subTest(backend=backend):
+                doc = Document(str(self.source), rsid="00112233", backend=backend)
+                run = doc["word/document.xml"].get_node(tag="w:r", contains="Hello")
+                doc.add_comment(run, run, "Note")
+                doc.save(str(self.output), validate=False)
+
+                # Every part setup needs now exists and holds the RSID
+                doc = Document(str(self.output), rsid="00112233", backend=backend)
+                self.assertEqual(doc.package.modified, set())
+                doc.save(str(Path(self.temp_dir.name) / "again.docx"))
+                self.assertEqual(doc.package.modified, set())
+
+
+class TestSessionBaseline(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.source = self.root / "source.docx"
+        with zipfile.ZipFile(self.source, "w") as zf:
+            zf.writestr("[Content_Types].xml", CONTENT_TYPES)
+            zf.writestr("_rels/.rels", PACKAGE_RELS)
+            zf.writestr("word/document.xml", DOCUMENT)
+            zf.writestr("word/_rels/document.xml.rels", DOCUMENT_RELS)
+            zf.writestr("word/settings.xml", SETTINGS)
+            zf.writestr("word/media/image1.png", b"original image")
+
+    def test_overwriting_media_leaves_original_directory_untouched(self):
+        """Files overwritten in place in the session copy are not shared"""
+        unpacked = self.root / "unpacked"
+        with zipfile.ZipFile(self.source) as zf:
+            zf.extractall(unpacked)
+        replacement = self.root / "replacement.png"
+        replacement.write_bytes(b"new image")
+
+        doc = Document(str(unpacked))
+        shutil.copy(replacement, doc.unpacked_path / "word/media/image1.png")
+        self.assertEqual(
+            (unpacked / "word/media/image1.png").read_bytes(), b"original image"
+        )
+
+        output = self.root / "output"
+        doc.save(str(output), validate=False)
+        self.assertEqual((output / "word/media/image1.png").read_bytes(), b"new image")
+        self.assertEqual(
+            (unpacked / "word/media/image1.png").read_bytes(), b"original image"
+        )
+
+    def test_untouched_media_is_read_from_original_directory(self):
+        """Media is not copied into the session tree, yet saved with it"""
+        unpacked = self.root / "unpacked"
+        with zipfile.ZipFile(self.source) as zf:
+            zf.extractall(unpacked)
+
+        doc = Document(str(unpacked))
+        self.assertFalse((doc.unpacked_path / "word/media/image1.png").exists())
+        self.assertEqual(
+            doc.package.read("word/media/image1.png"), b"original image"
+        )
+
+        output = self.root / "output"
+        doc.save(str(output), validate=False)
+        saved = output / "word/media/image1.png"
+        self.assertEqual(saved.read_bytes(), b"original image")
+        self.assertFalse(saved.samefile(unpacked / "word/media/image1.png"))
+
+    def test_in_memory_baseline_is_content_as_loaded(self):
+        """The validation baseline of an in-memory session ignores later edits"""
+        doc = Document(str(self.source))
+        doc["word/document.xml"].get_node(tag="w:pgSz").setAttribute("w:w", "12000")
+        doc.package.write("word/media/image1.png", b"new image")
+
+        original = doc.package.original()
+        self.assertIn(b'w:w="11906"', original.read("word/document.xml"))
+        self.assertEqual(original.read("word/media/image1.png"), b"original image")
+        self.assertNotIn("word/people.xml", original)
+
+    def test_lxml_session_skips_pretty_printing(self):
+        """Only minidom sessions pretty-print parts to match unpack.py lines"""
+        doc = Document(str(self.source), backend="lxml")
+        self.assertEqual(doc.package.read("word/document.xml"), DOCUMENT.encode())
+        doc = Document(str(self.source))
+        self.assertNotEqual(doc.package.read("word/document.xml"), DOCUMENT.encode())
+
+
+class TestSuggestReplacements(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.source = Path(self.temp_dir.name) / "source.docx"
+        document = DOCUMENT.replace(
+            "<w:r><w:t>Hello</w:t></w:r>",
+            '<w:r w:rsidR="00AA0001" w:rsidRPr="00BB0002"><w:t>Hello</w:t></w:r>'
+            "<w:r><w:t>World</w:t></w:r>",
+        )
+        with zipfile.ZipFile(self.source, "w") as zf:
+            zf.writestr("[Content_Types].xml", CONTENT_TYPES)
+            zf.writestr("_rels/.rels", PACKAGE_RELS)
+            zf.writestr("word/document.xml", document)
+            zf.writestr("word/_rels/document.xml.rels", DOCUMENT_RELS)
+            zf.writestr("word/settings.xml", SETTINGS)
+
+    def test_split_runs_keep_source_rsids(self):
+        """Unchanged halves of a split run keep the source run's RSIDs"""
+        for backend in ("minidom", "lxml"):
+            with self.subTest(backend=backend):
+                doc = Document(str(self.source), backend=backend)
+                editor = doc["word/document.xml"]
+                counts = editor.suggest_replacements([("ell", "ELL"), ("orl", "ORL")])
+                self.assertEqual(counts, {"ell": 1, "orl": 1})
+
+                kept = {}
+                dom = minidom.parseString(editor.serialize())
+                for run in dom.getElementsByTagName("w:r"):
+                    if run.parentNode.tagName == "w:p":
+                        text = run.getElementsByTagName("w:t")[0].firstChild.data
+                        kept[text.strip()] = (
+                            run.getAttribute("w:rsidR"),
+                            run.getAttribute("w:rsidRPr"),
+                        )
+                self.assertEqual(kept["H"], ("00AA0001", "00BB0002"))
+                self.assertEqual(kept["o"], ("00AA0001", "00BB0002"))
+                self.assertEqual(kept["W"], ("", ""))
+                self.assertEqual(kept["d"], ("", ""))
+
+
+if __name__ == '__main__':
+    unittest.main()
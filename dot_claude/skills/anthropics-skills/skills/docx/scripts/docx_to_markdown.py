@@ -0,0 +1,690 @@
+#!/usr/bin/env python3
+"""
+Convert a Word document to markdown in one streaming pass, without pandoc.
+
+word/document.xml is parsed incrementally and each top-level paragraph or
+table is rendered and then discarded, so memory stays flat however long the
+document is. Styles, numbering and relationships are read up front (they are
+small) for headings, list markers and hyperlinks; footnotes and endnotes are
+appended at the end.
+
+Tracked changes are shown the way `pandoc --track-changes=all` shows them:
+    [new text]{.insertion author="Jane" date="2025-03-01T00:00:00Z"}
+    [old text]{.deletion author="Jane" date="2025-03-01T00:00:00Z"}
+
+Each paragraph ends with an anchor comment naming the w:p it came from, for
+XMLEditor.get_node:
+    Payment is due in 30 days. <!-- w:p paraId=1A2B3C4D line=42 -->
+
+    editor.get_node(tag="w:p", attrs={"w14:paraId": "1A2B3C4D"})
+    editor.get_node(tag="w:p", line_number=42)
+
+Line numbers refer to the XML file as unpack.py writes it, so they are only
+given when converting an unpacked directory.
+
+Usage:
+    python docx_to_markdown.py <input.docx|unpacked_dir> [output.md]
+
+Example usage:
+    # Markdown with tracked changes and anchors
+    python docx_to_markdown.py contract.docx contract.md
+
+    # Text as it reads with every change accepted, no anchors
+    python docx_to_markdown.py contract.docx --track-changes=accept --no-anchors
+
+    # From Python
+    from docx_to_markdown import docx_to_markdown
+    docx_to_markdown("contract.docx", "contract.md")
+"""
+
+import argparse
+import re
+import sys
+import zipfile
+from contextlib import contextmanager
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+
+from lxml import etree
+
+W_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W14_NAMESPACE = "http://schemas.microsoft.com/office/word/2010/wordml"
+R_NAMESPACE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+RELS_NAMESPACE = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+TRACK_CHANGES = ("all", "accept", "reject")
+
+INSERTIONS = ("ins", "moveTo")
+DELETIONS = ("del", "moveFrom")
+
+# Inline wrappers whose content is rendered as if they were not there
+TRANSPARENT = ("smartTag", "customXml", "sdt", "sdtContent", "fldSimple", "dir", "bdo")
+
+W = f"{{{W_NAMESPACE}}}"
+
+# Inline content by full tag name, looked up once per element on the hot path
+REVISION_TAGS = {W + name: name in INSERTIONS for name in INSERTIONS + DELETIONS}
+TRANSPARENT_TAGS = {W + name for name in TRANSPARENT}
+TEXT_TAGS = {W + "t", W + "delText"}
+RUN_CHARACTERS = {
+    W + "tab": "\t",
+    W + "ptab": "\t",
+    W + "br": "\n",
+    W + "cr": "\n",
+    W + "noBreakHyphen": "-",
+}
+NOTE_REFERENCES = {W + "footnoteReference": "[^{}]", W + "endnoteReference": "[^en{}]"}
+# Run properties shown as emphasis, by index into (bold, italic, strike)
+EMPHASIS = {W + "b": 0, W + "i": 1, W + "strike": 2, W + "dstrike": 2}
+SWITCHED_OFF = ("0", "false", "off")
+
+# Top-level paragraphs and tables are rendered as soon as they are complete
+BLOCKS = ("p", "tbl")
+
+# Markdown characters escaped in document text
+ESCAPED = re.compile(r"([\\`*_\[\]])")
+
+HEADING_NAME = re.compile(r"heading (\d)", re.IGNORECASE)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert a .docx file to markdown with tracked changes.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python docx_to_markdown.py contract.docx contract.md
+    Markdown with tracked changes and paragraph anchors
+
+  python docx_to_markdown.py unpacked/ --track-changes=reject
+    The original text, with anchors including unpacked line numbers
+        """,
+    )
+    parser.add_argument("input", help="Input .docx file or unpacked directory")
+    parser.add_argument("output", nargs="?", help="Output .md file (default: stdout)")
+    parser.add_argument(
+        "--track-changes",
+        choices=TRACK_CHANGES,
+        default="all",
+        help="Show tracked changes (all), or the text with them accepted or rejected",
+    )
+    parser.add_argument(
+        "--no-anchors",
+        dest="anchors",
+        action="store_false",
+        help="Omit the paragraph ID / line number comments",
+    )
+    args = parser.parse_args()
+
+    try:
+        docx_to_markdown(
+            args.input,
+            args.output,
+            track_changes=args.track_changes,
+            anchors=args.anchors,
+        )
+    except (OSError, KeyError, zipfile.BadZipFile, etree.XMLSyntaxError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def docx_to_markdown(source, destination=None, track_changes="all", anchors=True):
+    """Write the markdown of a .docx to a file, or to stdout.
+
+    Args:
+        source: .docx file or unpacked directory
+        destination: Output .md file (default: stdout)
+        track_changes: "all" to annotate changes, "accept" or "reject" to
+            show the text with every change accepted or rejected
+        anchors: If True, end each paragraph with its paraId/line comment
+
+    Returns:
+        int: Number of blocks (paragraphs, tables, notes) written
+    """
+    blocks = iter_markdown(source, track_changes=track_changes, anchors=anchors)
+    count = 0
+    with _open_output(destination) as output:
+        for block in blocks:
+            if count:
+                output.write("\n")
+            output.write(block)
+            output.write("\n")
+            count += 1
+    return count
+
+
+def iter_markdown(source, track_changes="all", anchors=True):
+    """Yield the markdown of a .docx block by block, in document order.
+
+    Args:
+        source: .docx file or unpacked directory
+        track_changes: "all", "accept" or "reject" (see docx_to_markdown)
+        anchors: If True, end each paragraph with its paraId/line comment
+
+    Yields:
+        str: One paragraph, table or note, without a trailing newline
+
+    Raises:
+        ValueError: If track_changes is not one of "all", "accept", "reject"
+    """
+    if track_changes not in TRACK_CHANGES:
+        raise ValueError(f"track_changes must be one of {', '.join(TRACK_CHANGES)}")
+    with _Package(source) as package:
+        extractor = _Extractor(package, track_changes, anchors)
+        yield from extractor.blocks()
+
+
+class _Package:
+    """Read-only access to the parts of a .docx or an unpacked directory."""
+
+    def __init__(self, source):
+        self.source = Path(source)
+        self.unpacked = self.source.is_dir()
+        self._zip = None
+
+    def __enter__(self):
+        if not self.unpacked:
+            self._zip = zipfile.ZipFile(self.source)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._zip is not None:
+            self._zip.close()
+
+    def open(self, name):
+        """Return a binary file object for a part, or None if it does not exist."""
+        if self.unpacked:
+            path = self.source / name
+            return path.open("rb") if path.is_file() else None
+        try:
+            return self._zip.open(name)
+        except KeyError:
+            return None
+
+    def parse(self, name):
+        """Parse a (small) part completely; None if it does not exist."""
+        part = self.open(name)
+        if part is None:
+            return None
+        with part:
+            return etree.parse(part, _parser()).getroot()
+
+
+class _Extractor:
+    """Renders the blocks of one package as markdown."""
+
+    def __init__(self, package, track_changes, anchors):
+        self.package = package
+        self.track_changes = track_changes
+        self.anchors = anchors
+        self.with_lines = anchors and package.unpacked
+        self._tags = {}
+        self.styles = self._load_styles()
+        self.numbering = self._load_numbering()
+        self.links = self._load_links()
+
+    # ==================== Streaming ====================
+
+    def blocks(self):
+        """Yield the body's blocks, then footnotes and endnotes."""
+        part = self.package.open("word/document.xml")
+        if part is None:
+            raise KeyError("word/document.xml not found")
+        with part:
+            yield from self._body_blocks(part)
+        for name, note, label in (
+            ("word/footnotes.xml", "footnote", "{}"),
+            ("word/endnotes.xml", "endnote", "en{}"),
+        ):
+            part = self.package.open(name)
+            if part is not None:
+                with part:
+                    yield from self._notes(part, note, label)
+
+    def _body_blocks(self, part):
+        pending = ""  # Text of a paragraph whose mark was removed
+        for elem in self._iter_top_level(part, *BLOCKS):
+            if elem.tag == self._w("tbl"):
+                if pending:
+                    yield pending
+                    pending = ""
+                table = self._table(elem)
+                if table:
+                    yield table
+                continue
+
+            prefix, text, suffix = self._paragraph(elem)
+            if self._mark_removed(elem):
+                pending += text
+                continue
+            text = pending + text
+            pending = ""
+            if text or suffix.strip():
+                yield f"{prefix}{text}{suffix}"
+        if pending:
+            yield pending
+
+    def _notes(self, part, note, label):
+        for elem in self._iter_top_level(part, note):
+            if elem.get(self._w("type")) in ("separator", "continuationSeparator"):
+                continue
+            paragraphs = [
+                prefix + text + suffix
+                for prefix, text, suffix in map(self._paragraph, self._paragraphs(elem))
+            ]
+            body = "\n\n    ".join(p.strip() for p in paragraphs if p.strip())
+            yield f"[^{label.format(elem.get(self._w('id')))}]: {body}"
+
+    def _iter_top_level(self, part, *names):
+        """Yield complete elements with one of the given names, outermost only.
+
+        Each element is cleared once the caller is done with it, and earlier
+        siblings are dropped, so only the current block stays in memory.
+        """
+        tags = {self._w(name) for name in names}
+        depth = 0
+        events = etree.iterparse(
+            part,
+            events=("start", "end"),
+            tag=tags,
+            resolve_entities=False,
+            no_network=True,
+            load_dtd=False,
+            huge_tree=True,
+        )
+        for event, elem in events:
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            if depth:
+                continue
+            yield elem
+            elem.clear(keep_tail=True)
+            parent = elem.getparent()
+            while elem.getprevious() is not None:
+                del parent[0]
+
+    # ==================== Blocks ====================
+
+    def _paragraph(self, p, in_table=False):
+        """Render a paragraph as (prefix, text, suffix).
+
+        The prefix is the heading or list marker, the suffix the paragraph
+        mark's tracked change and the anchor comment.
+        """
+        ppr = p.find(self._w("pPr"))
+        style = num_id = level = None
+        if ppr is not None:
+            style = ppr.find(self._w("pStyle"))
+            style = style.get(self._w("val")) if style is not None else None
+            num_pr = ppr.find(self._w("numPr"))
+            if num_pr is not None:
+                num_id = _val(num_pr.find(self._w("numId")), self._w("val"))
+                level = _val(num_pr.find(self._w("ilvl")), self._w("val"))
+        heading, style_num = self.styles.get(style, (None, None))
+        if num_id is None and style_num is not None:
+            num_id, style_level = style_num
+            level = level or style_level
+
+        segments = []
+        self._segments(p, None, None, segments)
+        text = self._render(segments)
+        if in_table:
+            text = text.replace("|", "\\|").replace("\n", "<br>")
+        else:
+            text = text.replace("\n", "\\\n")
+
+        prefix = ""
+        if in_table:
+            # Cells hold inline content only
+            heading = num_id = None
+        if heading:
+            prefix = "#" * heading + " "
+        elif num_id not in (None, "0"):
+            marker = self._list_marker(num_id, level or "0")
+            if marker:
+                prefix = "    " * int(level or 0) + marker + " "
+
+        suffix = ""
+        mark = self._mark_revision(ppr)
+        if mark is not None and self.track_changes == "all":
+            kind = (
+                "insertion" if etree.QName(mark).localname in INSERTIONS else "deletion"
+            )
+            suffix += f"[]{{.paragraph-{kind}{_attributes(mark)}}}"
+        if self.anchors:
+            anchor = self._anchor(p)
+            if anchor:
+                suffix += f" <!-- {anchor} -->"
+        return prefix, text, suffix
+
+    def _table(self, tbl):
+        rows = []
+        for tr in self._children(tbl, "tr"):
+            trpr = tr.find(self._w("trPr"))
+            if self._removed(trpr):
+                continue
+            cells = []
+            for tc in self._children(tr, "tc"):
+                tcpr = tc.find(self._w("tcPr"))
+                if self._removed(tcpr):
+                    continue
+                span = 1
+                merged = False
+                if tcpr is not None:
+                    span = int(
+                        _val(tcpr.find(self._w("gridSpan")), self._w("val")) or 1
+                    )
+                    v_merge = tcpr.find(self._w("vMerge"))
+                    merged = v_merge is not None and v_merge.get(self._w("val")) in (
+                        None,
+                        "continue",
+                    )
+                text = ""
+                if not merged:
+                    paragraphs = [
+                        "".join(self._paragraph(p, in_table=True)).strip()
+                        for p in self._paragraphs(tc)
+                    ]
+                    text = "<br>".join(p for p in paragraphs if p)
+                cells.append(text)
+                cells.extend([""] * (span - 1))
+            rows.append(cells)
+        if not rows:
+            return ""
+
+        width = max(len(row) for row in rows)
+        lines = []
+        for i, row in enumerate(rows):
+            row = row + [""] * (width - len(row))
+            lines.append("| " + " | ".join(row) + " |")
+            if i == 0:
+                lines.append("|" + " --- |" * width)
+        return "\n".join(lines)
+
+    def _children(self, parent, name):
+        """Yield the name children of parent, looking through sdt/customXml."""
+        tag = self._w(name)
+        for child in parent:
+            if child.tag == tag:
+                yield child
+            elif child.tag in (
+                self._w("sdt"),
+                self._w("sdtContent"),
+                self._w("customXml"),
+            ):
+                yield from self._children(child, name)
+
+    def _paragraphs(self, parent):
+        """Yield the paragraphs of a cell or note, nested tables included."""
+        for child in parent:
+            if child.tag == self._w("p"):
+                yield child
+            elif child.tag == self._w("tbl"):
+                for tr in self._children(child, "tr"):
+                    for tc in self._children(tr, "tc"):
+                        yield from self._paragraphs(tc)
+            elif child.tag in (
+                self._w("sdt"),
+                self._w("sdtContent"),
+                self._w("customXml"),
+            ):
+                yield from self._paragraphs(child)
+
+    # ==================== Inline content ====================
+
+    def _segments(self, parent, revision, link, segments):
+        """Collect (text, style, revision, link) segments of inline content."""
+        for child in parent:
+            tag = child.tag
+            if tag == W + "r":
+                self._run(child, revision, link, segments)
+            elif tag in REVISION_TAGS:
+                inserted = REVISION_TAGS[tag]
+                if self.track_changes == "all":
+                    kind = "insertion" if inserted else "deletion"
+                    self._segments(child, (kind, _attributes(child)), link, segments)
+                elif inserted == (self.track_changes == "accept"):
+                    self._segments(child, revision, link, segments)
+            elif tag == W + "hyperlink":
+                target = self.links.get(child.get(f"{{{R_NAMESPACE}}}id"))
+                if target is None and child.get(W + "anchor"):
+                    target = "#" + child.get(W + "anchor")
+                self._segments(child, revision, target, segments)
+            elif tag in TRANSPARENT_TAGS:
+                self._segments(child, revision, link, segments)
+
+    def _run(self, run, revision, link, segments):
+        style = None
+        parts = []
+        for child in run:
+            tag = child.tag
+            if tag in TEXT_TAGS:
+                parts.append(ESCAPED.sub(r"\\\1", child.text or ""))
+            elif tag in RUN_CHARACTERS:
+                parts.append(RUN_CHARACTERS[tag])
+            elif tag == W + "rPr":
+                style = _style(child)
+            elif tag in NOTE_REFERENCES:
+                segments.append(("".join(parts), style, revision, link))
+                parts = []
+                reference = NOTE_REFERENCES[tag].format(child.get(W + "id"))
+                segments.append((reference, None, revision, link))
+        segments.append(("".join(parts), style, revision, link))
+
+    def _render(self, segments):
+        """Join segments into markdown, merging neighbours with equal markup."""
+        out = []
+        for (revision, link), group in groupby(segments, key=itemgetter(2, 3)):
+            text = "".join(
+                _emphasize("".join(s[0] for s in same), style)
+                for style, same in groupby(group, key=itemgetter(1))
+            )
+            if not text:
+                continue
+            if link is not None:
+                text = f"[{text}]({link})"
+            if revision is not None:
+                kind, attributes = revision
+                text = f"[{text}]{{.{kind}{attributes}}}"
+            out.append(text)
+        return "".join(out)
+
+    # ==================== Revisions ====================
+
+    def _mark_revision(self, ppr):
+        """Return the w:ins/w:del on a paragraph mark, if any."""
+        if ppr is None:
+            return None
+        rpr = ppr.find(self._w("rPr"))
+        if rpr is None:
+            return None
+        revisions = {self._w(name) for name in INSERTIONS + DELETIONS}
+        for child in rpr:
+            if child.tag in revisions:
+                return child
+        return None
+
+    def _mark_removed(self, p):
+        """True if accepting/rejecting removes the mark, merging p into the next."""
+        if self.track_changes == "all":
+            return False
+        mark = self._mark_revision(p.find(self._w("pPr")))
+        if mark is None:
+            return False
+        inserted = etree.QName(mark).localname in INSERTIONS
+        return inserted != (self.track_changes == "accept")
+
+    def _removed(self, properties):
+        """True if a row or cell is gone once changes are accepted/rejected."""
+        if properties is None or self.track_changes == "all":
+            return False
+        for child in properties:
+            if child.tag in (self._w("ins"), self._w("cellIns")):
+                return self.track_changes == "reject"
+            if child.tag in (self._w("del"), self._w("cellDel")):
+                return self.track_changes == "accept"
+        return False
+
+    def _anchor(self, p):
+        parts = ["w:p"]
+        para_id = p.get(f"{{{W14_NAMESPACE}}}paraId")
+        if para_id:
+            parts.append(f"paraId={para_id}")
+        if self.with_lines and p.sourceline:
+            parts.append(f"line={p.sourceline}")
+        return " ".join(parts) if len(parts) > 1 else ""
+
+    # ==================== Styles, numbering, links ====================
+
+    def _load_styles(self):
+        """Map paragraph style IDs to (heading level, (numId, ilvl))."""
+        root = self.package.parse("word/styles.xml")
+        if root is None:
+            return {}
+        raw = {}
+        for style in root.iter(self._w("style")):
+            if style.get(self._w("type")) != "paragraph":
+                continue
+            name = _val(style.find(self._w("name")), self._w("val")) or ""
+            ppr = style.find(self._w("pPr"))
+            outline = num = None
+            if ppr is not None:
+                outline = _val(ppr.find(self._w("outlineLvl")), self._w("val"))
+                num_pr = ppr.find(self._w("numPr"))
+                if num_pr is not None:
+                    num = (
+                        _val(num_pr.find(self._w("numId")), self._w("val")),
+                        _val(num_pr.find(self._w("ilvl")), self._w("val")),
+                    )
+            based_on = _val(style.find(self._w("basedOn")), self._w("val"))
+            raw[style.get(self._w("styleId"))] = (name, outline, num, based_on)
+
+        styles = {}
+        for style_id in raw:
+            heading = num = None
+            seen = set()
+            current = style_id
+            # Inherit through basedOn; the nearest definition wins
+            while current in raw and current not in seen:
+                seen.add(current)
+                name, outline, style_num, based_on = raw[current]
+                if heading is None:
+                    match = HEADING_NAME.fullmatch(name)
+                    if match:
+                        heading = int(match.group(1))
+                    elif name.lower() == "title":
+                        heading = 1
+                    elif outline is not None and int(outline) < 9:
+                        heading = int(outline) + 1
+                if num is None:
+                    num = style_num
+                current = based_on
+            styles[style_id] = (heading, num)
+        return styles
+
+    def _load_numbering(self):
+        """Map numIds to {ilvl: numFmt}."""
+        root = self.package.parse("word/numbering.xml")
+        if root is None:
+            return {}
+        abstract = {}
+        for abstract_num in root.iter(self._w("abstractNum")):
+            abstract[abstract_num.get(self._w("abstractNumId"))] = {
+                lvl.get(self._w("ilvl")): _val(
+                    lvl.find(self._w("numFmt")), self._w("val")
+                )
+                for lvl in abstract_num.iter(self._w("lvl"))
+            }
+        return {
+            num.get(self._w("numId")): abstract.get(
+                _val(num.find(self._w("abstractNumId")), self._w("val")), {}
+            )
+            for num in root.iter(self._w("num"))
+        }
+
+    def _list_marker(self, num_id, level):
+        fmt = self.numbering.get(num_id, {}).get(level, "decimal")
+        if fmt == "none":
+            return ""
+        return "-" if fmt == "bullet" else "1."
+
+    def _load_links(self):
+        """Map relationship IDs of word/document.xml to hyperlink targets."""
+        root = self.package.parse("word/_rels/document.xml.rels")
+        if root is None:
+            return {}
+        return {
+            rel.get("Id"): rel.get("Target")
+            for rel in root.iter(f"{{{RELS_NAMESPACE}}}Relationship")
+            if rel.get("Type", "").endswith("/hyperlink")
+        }
+
+    def _w(self, local):
+        tag = self._tags.get(local)
+        if tag is None:
+            tag = self._tags[local] = f"{{{W_NAMESPACE}}}{local}"
+        return tag
+
+
+def _parser():
+    return etree.XMLParser(
+        resolve_entities=False, no_network=True, load_dtd=False, huge_tree=True
+    )
+
+
+@contextmanager
+def _open_output(destination):
+    if destination is None:
+        yield sys.stdout
+        return
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    with destination.open("w", encoding="utf-8") as output:
+        yield output
+
+
+def _val(elem, attribute):
+    return elem.get(attribute) if elem is not None else None
+
+
+def _style(rpr):
+    """Return the (bold, italic, strike) emphasis of run properties, or None."""
+    style = None
+    for child in rpr:
+        index = EMPHASIS.get(child.tag)
+        if index is not None and child.get(W + "val") not in SWITCHED_OFF:
+            style = style or [False, False, False]
+            style[index] = True
+    return tuple(style) if style else None
+
+
+def _attributes(revision):
+    """Render a revision's author and date as pandoc span attributes."""
+    out = ""
+    for name in ("author", "date"):
+        value = revision.get(W + name)
+        if value:
+            value = value.replace("\\", "\\\\").replace('"', '\\"')
+            out += f' {name}="{value}"'
+    return out
+
+
+def _emphasize(text, style):
+    """Wrap text in markdown emphasis, keeping edge whitespace outside it."""
+    if style is None or not text.strip():
+        return text
+    bold, italic, strike = style
+    marker = ("**" if bold else "") + ("*" if italic else "")
+    core = text.strip()
+    if strike:
+        core = f"~~{core}~~"
+    start = text[: len(text) - len(text.lstrip())]
+    end = text[len(text.rstrip()) :]
+    return f"{start}{marker}{core}{marker[::-1]}{end}"
+
+
+if __name__ == "__main__":
+    main()
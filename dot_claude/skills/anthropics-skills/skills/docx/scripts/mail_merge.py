@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Fill a Word template's {{placeholders}} once per record, for bulk mail merge.
+
+The template is parsed once. Every placeholder is moved into a single w:t,
+including placeholders Word has split across several runs (it does after
+spell-checking or when part of one is reformatted), and each part holding
+placeholders is serialized into byte fragments around them. Rendering a
+record is then a join of those fragments with the escaped values, with no
+XML parsing; parts without placeholders are copied into each output zip
+without being recompressed. Documents are rendered by a pool of worker
+processes.
+
+Placeholders are {{name}} (spaces inside the braces are allowed) in the body,
+headers, footers, footnotes and endnotes. A placeholder takes the formatting
+of the run its first character is in. Line breaks and tabs in a value become
+<w:br/> and <w:tab/>. Merge fields (MERGEFIELD) are not filled.
+
+Usage:
+    python mail_merge.py <template.docx|unpacked_dir> <records> <output_dir>
+
+Records are a .csv file with a header row, a .json list of objects, or a
+.jsonl file with one object per line.
+
+Example usage:
+    # One letter per CSV row, named after its "id" column
+    python mail_merge.py letter.docx clients.csv letters/ --name "letter-{id}.docx"
+
+    # Leave placeholders a record has no value for empty instead of failing
+    python mail_merge.py letter.docx clients.jsonl letters/ --missing ""
+
+    # From Python
+    from mail_merge import MergeTemplate, mail_merge
+    template = MergeTemplate("letter.docx")
+    template.render({"name": "Ada Lovelace"}, "ada.docx")
+    stats = mail_merge("letter.docx", records, "letters/")
+"""
+
+import argparse
+import csv
+import io
+import json
+import multiprocessing
+import re
+import sys
+import time
+import zipfile
+from bisect import bisect_right
+from functools import partial
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from lxml import etree
+
+W_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+W = f"{{{W_NAMESPACE}}}"
+
+# Parts whose text is searched for placeholders
+MERGE_PARTS = re.compile(r"word/(document|header\d*|footer\d*|footnotes|endnotes)\.xml")
+
+PLACEHOLDER = re.compile(r"\{\{\s*([^{}]*?)\s*\}\}")
+
+# Stands in for a placeholder in serialized XML: private-use characters around
+# the placeholder's index into MergeTemplate.fields
+MARKER = "\ue000{}\ue001"
+MARKER_BYTES = re.compile("\ue000(\\d+)\ue001".encode())
+
+# Run content a value's control characters become, inside the placeholder's w:t
+VALUE_CHARACTERS = {
+    "\n": '</w:t><w:br/><w:t xml:space="preserve">',
+    "\t": '</w:t><w:tab/><w:t xml:space="preserve">',
+}
+VALUE_CHARACTER = re.compile("\r\n|[\n\t]")
+
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fill a .docx template's {{placeholders}} once per record.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python mail_merge.py letter.docx clients.csv letters/
+    One document per row: letters/00001.docx, letters/00002.docx, ...
+
+  python mail_merge.py letter.docx clients.json letters/ --name "{last_name}.docx"
+    Output names formatted from each record ({n} is the record number, even
+    if the record has an "n" column)
+        """,
+    )
+    parser.add_argument("template", help="Template .docx file or unpacked directory")
+    parser.add_argument("records", help="Records: .csv, .json or .jsonl file")
+    parser.add_argument("output_dir", help="Directory for the merged documents")
+    parser.add_argument(
+        "--name",
+        default="{n:05d}.docx",
+        help="Output file name, formatted with the record and n, which overrides "
+        "a record field of that name (default: {n:05d}.docx)",
+    )
+    parser.add_argument(
+        "--missing",
+        help="Text for placeholders a record has no value for (default: error)",
+    )
+    parser.add_argument(
+        "--processes", type=int, help="Worker processes (default: one per CPU)"
+    )
+    args = parser.parse_args()
+
+    try:
+        stats = mail_merge(
+            args.template,
+            read_records(args.records),
+            args.output_dir,
+            name=args.name,
+            missing=args.missing,
+            processes=args.processes,
+        )
+    except (
+        OSError,
+        KeyError,
+        ValueError,
+        zipfile.BadZipFile,
+        etree.XMLSyntaxError,
+    ) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(
+        f"Merged {stats['documents']} documents into {args.output_dir} in "
+        f"{stats['seconds']:.2f}s ({stats['docs_per_second']:.0f} docs/s, "
+        f"{stats['processes']} worker process(es))"
+    )
+
+
+def mail_merge(
+    template, records, output_dir, name="{n:05d}.docx", missing=None, processes=None
+):
+    """Render one .docx per record into a directory.
+
+    Args:
+        template: Template .docx file, unpacked directory or MergeTemplate
+        records: Iterable of dicts mapping placeholder names to values
+        output_dir: Directory for the documents (created if missing)
+        name: Output file name, formatted with the record's values and n, the
+            record's 1-based number (which wins over a record field named n)
+        missing: Text for placeholders a record has no value for (default:
+            raise KeyError)
+        processes: Worker processes (default: one per CPU; 1 renders in this
+            process)
+
+    Returns:
+        dict: "documents" written, "seconds" taken, "docs_per_second" and
+            "processes" used
+    """
+    start = time.perf_counter()
+    if not isinstance(template, MergeTemplate):
+        template = MergeTemplate(template)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    processes = processes or multiprocessing.cpu_count()
+
+    jobs = enumerate(records, 1)
+    render = partial(_render_job, output_dir=output_dir, name=name, missing=missing)
+    if processes == 1:
+        _init_worker(template)
+        count = sum(map(render, jobs))
+    else:
+        # Each worker receives the compiled template once, not once per record
+        with multiprocessing.Pool(
+            processes, initializer=_init_worker, initargs=(template,)
+        ) as pool:
+            count = sum(pool.imap_unordered(render, jobs, chunksize=16))
+
+    seconds = time.perf_counter() - start
+    return {
+        "documents": count,
+        "seconds": seconds,
+        "docs_per_second": count / seconds if seconds else 0.0,
+        "processes": processes,
+    }
+
+
+def read_records(path):
+    """Yield the records of a .csv, .json or .jsonl file as dicts.
+
+    Raises:
+        ValueError: If the file type is not supported
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        with path.open(newline="", encoding="utf-8-sig") as f:
+            yield from csv.DictReader(f)
+    elif suffix == ".json":
+        with path.open(encoding="utf-8") as f:
+            yield from json.load(f)
+    elif suffix == ".jsonl":
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        raise ValueError(f"Records must be a .csv, .json or .jsonl file: {path}")
+
+
+class MergeTemplate:
+    """A template compiled for rendering: byte fragments around placeholders.
+
+    Attributes:
+        fields: Placeholder names, in order of first appearance
+    """
+
+    def __init__(self, source):
+        """
+        Read and compile a template.
+
+        Args:
+            source: .docx file or unpacked directory (whose pretty-printed XML
+                is condensed as pack.py does)
+        """
+        self.fields = []
+        self._field_index = {}
+        # Part name to a list alternating bytes and field indexes
+        self._fragments = {}
+        static = {}
+        for name, data in _read_parts(source):
+            if MERGE_PARTS.fullmatch(name) and b"{" in data:
+                fragments = self._compile_part(data)
+                if len(fragments) > 1:
+                    self._fragments[name] = fragments
+                    continue
+                data = fragments[0]
+            static[name] = data
+
+        # Parts without placeholders are compressed once, into a zip every
+        # document starts from
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, data in static.items():
+                zf.writestr(_zip_info(name), data)
+        self._static_zip = buffer.getvalue()
+
+    def render_parts(self, record, missing=None):
+        """Return the bytes of each part holding placeholders, filled from record.
+
+        Args:
+            record: Dict mapping placeholder names to values (None is empty)
+            missing: Text for placeholders the record has no value for
+                (default: raise KeyError)
+        """
+        values = []
+        for field in self.fields:
+            value = record.get(field, missing)
+            if value is None and field not in record:
+                raise KeyError(f"no value for placeholder {{{{{field}}}}}")
+            values.append(_escape_value(value))
+        return {
+            name: b"".join(
+                values[piece] if isinstance(piece, int) else piece
+                for piece in fragments
+            )
+            for name, fragments in self._fragments.items()
+        }
+
+    def render(self, record, destination, missing=None):
+        """Write the document for one record.
+
+        Args:
+            record: Dict mapping placeholder names to values
+            destination: Output .docx file
+            missing: Text for placeholders the record has no value for
+                (default: raise KeyError)
+        """
+        buffer = io.BytesIO(self._static_zip)
+        buffer.seek(0, io.SEEK_END)
+        with zipfile.ZipFile(buffer, "a", zipfile.ZIP_DEFLATED) as zf:
+            for name, data in self.render_parts(record, missing).items():
+                zf.writestr(_zip_info(name), data)
+        Path(destination).write_bytes(buffer.getvalue())
+
+    def _compile_part(self, data):
+        """Split a part's XML into fragments around its placeholders."""
+        if MARKER_BYTES.search(data):
+            raise ValueError("Template text contains reserved characters U+E000/E001")
+        root = etree.fromstring(data, _parser())
+
+        # The w:t elements of each paragraph; a text box's paragraphs are
+        # separate from the paragraph holding the text box
+        paragraphs = {}
+        for t in root.iter(W + "t"):
+            paragraph = next(t.iterancestors(W + "p"), None)
+            if paragraph is not None:
+                paragraphs.setdefault(paragraph, []).append(t)
+        for texts in paragraphs.values():
+            self._mark_placeholders(texts)
+
+        tree = root.getroottree()
+        data = etree.tostring(
+            tree,
+            xml_declaration=True,
+            encoding="UTF-8",
+            standalone=tree.docinfo.standalone,
+        )
+        fragments = MARKER_BYTES.split(data)
+        for i in range(1, len(fragments), 2):
+            fragments[i] = int(fragments[i])
+        return fragments
+
+    def _mark_placeholders(self, texts):
+        """Replace the placeholders in a paragraph's w:t elements with markers.
+
+        A placeholder split across several w:t is moved into the first one.
+        """
+        strings = [t.text or "" for t in texts]
+        text = "".join(strings)
+        if "{{" not in text:
+            return
+        starts = []
+        offset = 0
+        for string in strings:
+            starts.append(offset)
+            offset += len(string)
+
+        matches = [
+            (match, self._field(match[1])) for match in PLACEHOLDER.finditer(text)
+        ]
+        # Right to left, so the offsets of earlier matches stay valid
+        for match, index in reversed(matches):
+            first = _locate(starts, match.start())
+            last = _locate(starts, match.end() - 1)
+            head = strings[first][: match.start() - starts[first]]
+            tail = strings[last][match.end() - starts[last] :]
+            marker = MARKER.format(index)
+            if first == last:
+                strings[first] = head + marker + tail
+            else:
+                strings[first] = head + marker
+                for i in range(first + 1, last):
+                    strings[i] = ""
+                strings[last] = tail
+            texts[first].set(f"{{{XML_NAMESPACE}}}space", "preserve")
+
+        for t, string in zip(texts, strings):
+            t.text = string
+
+    def _field(self, name):
+        """Return the index of a placeholder name in fields, adding it if new."""
+        index = self._field_index.get(name)
+        if index is None:
+            index = self._field_index[name] = len(self.fields)
+            self.fields.append(name)
+        return index
+
+
+_template = None
+
+
+def _init_worker(template):
+    global _template
+    _template = template
+
+
+def _render_job(job, output_dir, name, missing):
+    n, record = job
+    try:
+        # n is the record number, even if the record has its own "n" field
+        destination = output_dir / name.format_map({**record, "n": n})
+    except KeyError as e:
+        raise KeyError(
+            f"Record {n}: no value for {{{e.args[0]}}} in the output name"
+        ) from None
+    try:
+        _template.render(record, destination, missing)
+    except KeyError as e:
+        raise KeyError(f"Record {n}: {e.args[0]}") from None
+    return 1
+
+
+def _read_parts(source):
+    """Yield (part name, bytes) pairs, [Content_Types].xml first."""
+    source = Path(source)
+    if source.is_dir():
+        files = sorted(
+            (f for f in source.rglob("*") if f.is_file()),
+            key=lambda f: f.name != "[Content_Types].xml",
+        )
+        for file in files:
+            data = file.read_bytes()
+            if file.suffix in (".xml", ".rels"):
+                data = _condense(data)
+            yield file.relative_to(source).as_posix(), data
+    else:
+        with zipfile.ZipFile(source) as zf:
+            for info in zf.infolist():
+                if not info.is_dir():
+                    yield info.filename, zf.read(info)
+
+
+def _zip_info(name):
+    # Fixed timestamps, as Word writes them, so equal records give equal files
+    info = zipfile.ZipInfo(name, date_time=ZIP_DATE_TIME)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    return info
+
+
+def _condense(data):
+    """Strip pretty-printing whitespace and comments, leaving *:t text alone."""
+    root = etree.fromstring(data, _parser())
+    for comment in list(root.iter(etree.Comment)):
+        _remove(comment)
+    for elem in root.iter(tag=etree.Element):
+        if elem.text and not elem.text.strip() and not elem.tag.endswith("}t"):
+            elem.text = None
+        if elem.tail and not elem.tail.strip():
+            elem.tail = None
+    tree = root.getroottree()
+    return etree.tostring(
+        tree,
+        xml_declaration=True,
+        encoding="UTF-8",
+        standalone=tree.docinfo.standalone,
+    )
+
+
+def _remove(elem):
+    """Remove an element, keeping the text that follows it."""
+    parent = elem.getparent()
+    if elem.tail:
+        previous = elem.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or "") + elem.tail
+        else:
+            parent.text = (parent.text or "") + elem.tail
+    parent.remove(elem)
+
+
+def _locate(starts, offset):
+    """Return the index of the string that a paragraph text offset falls in."""
+    return bisect_right(starts, offset) - 1
+
+
+def _escape_value(value):
+    """Return a value as UTF-8 w:t content, its breaks and tabs as run content."""
+    if value is None:
+        return b""
+    text = escape(str(value))
+    text = VALUE_CHARACTER.sub(lambda m: VALUE_CHARACTERS[m[0][-1]], text)
+    return text.encode("utf-8")
+
+
+def _parser():
+    return etree.XMLParser(
+        resolve_entities=False, no_network=True, load_dtd=False, huge_tree=True
+    )
+
+
+if __name__ == "__main__":
+    main()
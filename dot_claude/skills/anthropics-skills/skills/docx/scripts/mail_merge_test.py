@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from scripts.mail_merge import mail_merge
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types"><Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/><Default Extension="xml" ContentType="application/xml"/><Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>"""
+
+PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships"><Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/></Relationships>"""
+
+DOCUMENT = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body><w:p><w:r><w:t>Dear {{name}},</w:t></w:r></w:p></w:body></w:document>"""
+
+
+class TestOutputNames(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.template = Path(self.temp_dir.name) / "letter.docx"
+        self.output_dir = Path(self.temp_dir.name) / "letters"
+        with zipfile.ZipFile(self.template, "w") as zf:
+            zf.writestr("[Content_Types].xml", CONTENT_TYPES)
+            zf.writestr("_rels/.rels", PACKAGE_RELS)
+            zf.writestr("word/document.xml", DOCUMENT)
+
+    def test_record_number_wins_over_n_field(self):
+        """A record field named n does not clash with the record number"""
+        records = [
+            {"name": "Ada", "n": "x"},
+            {"name": "Grace", "n": "y"},
+        ]
+        stats = mail_merge(
+            self.template,
+            records,
+            self.output_dir,
+            name="{n:03d}-{name}.docx",
+            processes=1,
+        )
+        self.assertEqual(stats["documents"], 2)
+        self.assertEqual(
+            sorted(f.name for f in self.output_dir.iterdir()),
+            ["001-Ada.docx", "002-Grace.docx"],
+        )
+        with zipfile.ZipFile(self.output_dir / "002-Grace.docx") as zf:
+            self.assertIn(b"Dear Grace,", zf.read("word/document.xml"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""
+Accept or reject all tracked changes in a Word document in one streaming pass.
+
+Each part that can hold revisions (document, headers, footers, footnotes,
+endnotes, comments, styles, numbering) is parsed incrementally and written
+straight into the output zip. Only one block-level element (a top-level
+paragraph, table row, section properties, ...) is held in memory at a time, so
+memory stays flat however long the document is. All other parts are copied
+through unchanged.
+
+Resolved revisions:
+- w:ins / w:del / w:moveTo / w:moveFrom around runs
+- Paragraph marks inserted or deleted (w:pPr/w:rPr/w:ins, w:del); a removed
+  mark merges the paragraph into the following one, as Word does
+- Inserted or deleted table rows (w:trPr/w:ins, w:del) and cells
+  (w:cellIns, w:cellDel)
+- Formatting changes (w:rPrChange, w:pPrChange, w:sectPrChange, w:tblPrChange,
+  w:trPrChange, w:tcPrChange, w:tblGridChange, ...)
+
+Usage:
+    python revisions.py accept <input.docx|unpacked_dir> <output.docx>
+    python revisions.py reject <input.docx|unpacked_dir> <output.docx>
+
+Example usage:
+    # Clean copy with every change accepted
+    python revisions.py accept reviewed.docx clean.docx
+
+    # Reject only Jane Smith's changes made after 1 March 2025
+    python revisions.py reject reviewed.docx out.docx --author "Jane Smith" --after 2025-03-01
+
+    # From Python
+    from revisions import resolve_revisions
+    counts = resolve_revisions("reviewed.docx", "clean.docx", accept=True)
+"""
+
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+import zipfile
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+from lxml import etree
+
+W_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+# Parts that can contain tracked changes
+REVISION_PARTS = re.compile(
+    r"word/(glossary/)?(document|styles|numbering|footnotes|endnotes|comments"
+    r"|header\d*|footer\d*)\.xml"
+)
+
+# Elements streamed through tag by tag; every other child of one of these is a
+# block resolved (and held in memory) as a whole
+CONTAINERS = {
+    f"{{{W_NAMESPACE}}}{name}"
+    for name in (
+        "document",
+        "body",
+        "tbl",
+        "sdt",
+        "sdtContent",
+        "customXml",
+        "hdr",
+        "ftr",
+        "footnotes",
+        "footnote",
+        "endnotes",
+        "endnote",
+        "comments",
+        "comment",
+        "glossaryDocument",
+        "docParts",
+        "docPart",
+        "docPartBody",
+    )
+}
+
+INSERTIONS = ("ins", "moveTo", "cellIns")
+DELETIONS = ("del", "moveFrom", "cellDel")
+MOVE_RANGE_STARTS = ("moveFromRangeStart", "moveToRangeStart")
+MOVE_RANGE_ENDS = ("moveFromRangeEnd", "moveToRangeEnd")
+PROPERTY_CHANGES = (
+    "rPrChange",
+    "pPrChange",
+    "sectPrChange",
+    "tblPrChange",
+    "tblPrExChange",
+    "trPrChange",
+    "tcPrChange",
+    "tblGridChange",
+    "numberingChange",
+)
+
+# Children of a properties element that its *PrChange does not record, and so
+# survive rejecting it, kept before or after the restored properties
+KEEP_BEFORE = {
+    "rPr": {"ins", "del", "moveFrom", "moveTo"},
+    "sectPr": {"headerReference", "footerReference"},
+}
+KEEP_AFTER = {
+    "pPr": {"rPr", "sectPr"},
+    "trPr": {"ins", "del"},
+    "tcPr": {"cellIns", "cellDel", "cellMerge"},
+}
+
+# Markup moved out of removed content so comments and bookmarks stay anchored
+ANCHORS = ("commentRangeStart", "commentRangeEnd", "bookmarkStart", "bookmarkEnd")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Accept or reject all tracked changes in a .docx file.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python revisions.py accept reviewed.docx clean.docx
+    Accepts every tracked change
+
+  python revisions.py reject reviewed.docx out.docx --author Claude
+    Rejects only the changes made by Claude
+
+Dates are ISO 8601 (2025-03-01 or 2025-03-01T12:00:00Z), compared in UTC.
+        """,
+    )
+    parser.add_argument("action", choices=["accept", "reject"])
+    parser.add_argument("input", help="Input .docx file or unpacked directory")
+    parser.add_argument("output", help="Output .docx file (may equal input)")
+    parser.add_argument(
+        "--author",
+        action="append",
+        help="Only resolve changes by this author (repeatable)",
+    )
+    parser.add_argument("--after", help="Only resolve changes made at or after")
+    parser.add_argument("--before", help="Only resolve changes made before")
+    args = parser.parse_args()
+
+    try:
+        counts = resolve_revisions(
+            args.input,
+            args.output,
+            accept=args.action == "accept",
+            authors=args.author,
+            after=_parse_date(args.after),
+            before=_parse_date(args.before),
+        )
+    except (OSError, ValueError, zipfile.BadZipFile, etree.XMLSyntaxError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    verb = "Accepted" if args.action == "accept" else "Rejected"
+    summary = ", ".join(f"{n} {tag}" for tag, n in sorted(counts.items()))
+    print(f"{verb} {sum(counts.values())} revisions ({summary or 'none'})")
+    print(f"Wrote {args.output}")
+
+
+def resolve_revisions(
+    source, destination, accept=True, authors=None, after=None, before=None
+):
+    """Write a copy of a .docx with tracked changes accepted or rejected.
+
+    Args:
+        source: .docx file or unpacked directory
+        destination: Output .docx file; may be the same file as source
+        accept: True to accept changes, False to reject them
+        authors: Optional iterable of author names; other authors' changes stay
+        after: Optional datetime; earlier changes (or undated ones) stay
+        before: Optional datetime; later changes (or undated ones) stay
+
+    Returns:
+        dict: Revision element name (e.g. "ins", "rPrChange") to number resolved
+    """
+    resolver = _Resolver(accept, authors, after, before)
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write next to the destination and move into place, so source may equal it
+    fd, temp_path = tempfile.mkstemp(suffix=".docx", dir=destination.parent)
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED) as zout:
+            for name, open_part in _iter_parts(source):
+                with open_part() as part_in, zout.open(name, "w") as part_out:
+                    if REVISION_PARTS.fullmatch(name):
+                        resolver.resolve_part(part_in, part_out)
+                    else:
+                        shutil.copyfileobj(part_in, part_out)
+        os.replace(temp_path, destination)
+    finally:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+    return dict(resolver.counts)
+
+
+def _iter_parts(source):
+    """Yield (part name, opener) pairs, [Content_Types].xml first."""
+    source = Path(source)
+    if source.is_dir():
+        files = sorted(
+            (f for f in source.rglob("*") if f.is_file()),
+            key=lambda f: f.name != "[Content_Types].xml",
+        )
+        for file in files:
+            yield file.relative_to(source).as_posix(), lambda f=file: f.open("rb")
+    else:
+        with zipfile.ZipFile(source) as zf:
+            for info in zf.infolist():
+                if not info.is_dir():
+                    yield info.filename, lambda info=info: zf.open(info)
+
+
+def _parse_date(value):
+    """Parse an ISO 8601 date or timestamp into an aware UTC datetime."""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class _Resolver:
+    """Streams parts, resolving the revisions that match the filters."""
+
+    def __init__(self, accept, authors, after, before):
+        self.accept = accept
+        self.authors = set(authors) if authors is not None else None
+        self.after = after
+        self.before = before
+        self.counts = Counter()
+        self._removed_move_ranges = set()
+        self._marks_removed = set()
+        self._tags = {}
+
+    # ==================== Streaming ====================
+
+    def resolve_part(self, source, output):
+        """Copy one XML part from source to output, resolving revisions.
+
+        Args:
+            source: Binary file object to read the part from
+            output: Binary file object to write the resolved part to
+        """
+        self._removed_move_ranges.clear()
+        output.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n')
+
+        open_containers = []
+        block = None  # Element being collected, resolved on its end event
+        pending = None  # Paragraph whose mark was removed, merged into the next
+        events = etree.iterparse(
+            source,
+            events=("start", "end"),
+            resolve_entities=False,
+            no_network=True,
+            load_dtd=False,
+            huge_tree=True,
+        )
+        for event, elem in events:
+            if block is not None:
+                if event != "end" or elem is not block:
+                    continue
+                block = None
+                container = open_containers[-1]
+                for resolved in self._resolve_block(elem, container):
+                    container.remove(resolved)
+                    if pending is not None:
+                        if resolved.tag == self._w("p"):
+                            self._merge_paragraphs(pending, resolved)
+                        else:
+                            self._write_block(pending, container, output)
+                        pending = None
+                    if resolved in self._marks_removed:
+                        self._marks_removed.discard(resolved)
+                        pending = resolved
+                    else:
+                        self._write_block(resolved, container, output)
+                continue
+
+            if event == "start":
+                if open_containers and elem.tag not in CONTAINERS:
+                    block = elem
+                    continue
+                if pending is not None:
+                    self._write_block(pending, open_containers[-1], output)
+                    pending = None
+                output.write(self._start_tag(elem))
+                open_containers.append(elem)
+            else:
+                if pending is not None:
+                    self._write_block(pending, elem, output)
+                    pending = None
+                output.write(f"</{self._qualified_name(elem)}>".encode())
+                open_containers.pop()
+                if open_containers:
+                    open_containers[-1].remove(elem)
+
+    def _write_block(self, elem, container, output):
+        elem.tail = None
+        data = etree.tostring(elem, encoding="UTF-8", xml_declaration=False)
+        output.write(_strip_inherited_namespaces(data, container.nsmap))
+
+    def _start_tag(self, elem):
+        """Serialize an element's start tag, declaring only new namespaces."""
+        shallow = etree.Element(elem.tag, elem.attrib, nsmap=elem.nsmap)
+        shallow.text = ""
+        data = etree.tostring(shallow, encoding="UTF-8", xml_declaration=False)
+        start = data[: data.index(b">") + 1]
+        parent = elem.getparent()
+        if parent is None:
+            return start
+        return _strip_inherited_namespaces(start, parent.nsmap)
+
+    def _qualified_name(self, elem):
+        local = etree.QName(elem).localname
+        return f"{elem.prefix}:{local}" if elem.prefix else local
+
+    # ==================== Resolving ====================
+
+    def _resolve_block(self, block, container):
+        """Resolve all matching revisions inside a block element.
+
+        Top-level paragraphs whose mark was removed are added to
+        _marks_removed, for the streaming loop to merge into the next block.
+
+        Returns:
+            List of elements now in the block's place in container: the block
+            itself, nothing if it was removed, or its children if it was an
+            unwrapped w:ins/w:del
+        """
+        # The parser may already have added the following siblings
+        previous, following = block.getprevious(), block.getnext()
+
+        for change in list(block.iter(*map(self._w, PROPERTY_CHANGES))):
+            if self._matches(change):
+                self._resolve_property_change(change)
+
+        # Move ranges: remove the start markers, then the matching ends
+        for marker in list(block.iter(*map(self._w, MOVE_RANGE_STARTS))):
+            if self._matches(marker):
+                self._removed_move_ranges.add(marker.get(self._w("id")))
+                self.counts[etree.QName(marker).localname] += 1
+                _remove(marker)
+        for marker in list(block.iter(*map(self._w, MOVE_RANGE_ENDS))):
+            if marker.get(self._w("id")) in self._removed_move_ranges:
+                _remove(marker)
+
+        # Innermost first, so an outer change never hides an inner one
+        marks_removed = []
+        revisions = list(block.iter(*map(self._w, INSERTIONS + DELETIONS)))
+        for revision in reversed(revisions):
+            if self._matches(revision):
+                paragraph = self._resolve_revision(revision)
+                if paragraph is not None:
+                    marks_removed.append(paragraph)
+
+        # Nested paragraphs merge into their next sibling here, in document order
+        for paragraph in reversed(marks_removed):
+            if paragraph.getparent() is container:
+                self._marks_removed.add(paragraph)
+                continue
+            following = paragraph.getnext()
+            if following is not None and following.tag == self._w("p"):
+                self._merge_paragraphs(paragraph, following)
+
+        resolved = []
+        if previous is not None:
+            node = previous.getnext()
+        else:
+            # Earlier blocks are already written and gone from the container
+            node = container[0] if len(container) else None
+        while node is not None and node is not following:
+            if isinstance(node.tag, str):
+                resolved.append(node)
+            node = node.getnext()
+        return resolved
+
+    def _resolve_revision(self, revision):
+        """Accept or reject one insertion or deletion.
+
+        Returns:
+            The w:p whose paragraph mark was removed, if any
+        """
+        local = etree.QName(revision).localname
+        self.counts[local] += 1
+        inserted = local in INSERTIONS
+        keep = inserted == self.accept
+        parent = revision.getparent()
+        parent_local = etree.QName(parent).localname
+
+        if parent_local == "rPr" and etree.QName(parent.getparent()).localname == "pPr":
+            # Paragraph mark
+            paragraph = parent.getparent().getparent()
+            _remove(revision)
+            return None if keep else paragraph
+        if parent_local in ("trPr", "tcPr"):
+            # Table row (w:ins/w:del) or cell (w:cellIns/w:cellDel)
+            _remove(revision)
+            if not keep:
+                _remove(parent.getparent())
+            return None
+
+        if keep:
+            if not inserted:
+                for name, restored in (("delText", "t"), ("delInstrText", "instrText")):
+                    for elem in revision.iter(self._w(name)):
+                        elem.tag = self._w(restored)
+                # Undo the RSID bookkeeping of the deletion
+                for run in revision.iter(self._w("r")):
+                    rsid = run.attrib.pop(self._w("rsidDel"), None)
+                    if rsid and run.get(self._w("rsidR")) is None:
+                        run.set(self._w("rsidR"), rsid)
+            _unwrap(revision)
+        else:
+            for anchor in list(revision.iter(*map(self._w, ANCHORS))):
+                revision.addprevious(anchor)
+                anchor.tail = None
+            for reference in list(revision.iter(self._w("commentReference"))):
+                run = reference.getparent()
+                if run.tag == self._w("r"):
+                    revision.addprevious(run)
+            _remove(revision)
+        return None
+
+    def _resolve_property_change(self, change):
+        """Accept (drop) or reject (restore the recorded properties) a *PrChange."""
+        local = etree.QName(change).localname
+        self.counts[local] += 1
+        parent = change.getparent()
+        if self.accept:
+            _remove(change)
+            return
+
+        parent_local = etree.QName(parent).localname
+        children = [c for c in parent if isinstance(c.tag, str) and c is not change]
+        before = [
+            c
+            for c in children
+            if etree.QName(c).localname in KEEP_BEFORE.get(parent_local, ())
+        ]
+        after = [
+            c
+            for c in children
+            if etree.QName(c).localname in KEEP_AFTER.get(parent_local, ())
+        ]
+        recorded = change[0] if len(change) else None
+        restored = list(recorded) if recorded is not None else []
+        for child in list(parent):
+            parent.remove(child)
+        parent.text = None
+        for child in before + restored + after:
+            child.tail = None
+            parent.append(child)
+
+    def _merge_paragraphs(self, paragraph, following):
+        """Move a paragraph's content to the start of the following paragraph.
+
+        The merged paragraph keeps the following paragraph's properties, since
+        the paragraph mark that carried the first one's is gone.
+        """
+        anchor = following.find(self._w("pPr"))
+        content = [c for c in paragraph if c.tag != self._w("pPr")]
+        for child in content:
+            if anchor is None:
+                following.insert(0, child)
+            else:
+                anchor.addnext(child)
+            anchor = child
+        if paragraph.getparent() is not None:
+            _remove(paragraph)
+
+    def _matches(self, revision):
+        """Return True if the revision passes the author and date filters."""
+        if (
+            self.authors is not None
+            and revision.get(self._w("author")) not in self.authors
+        ):
+            return False
+        if self.after is None and self.before is None:
+            return True
+        date = revision.get(self._w("date"))
+        if not date:
+            return False
+        try:
+            date = _parse_date(date)
+        except ValueError:
+            return False
+        if self.after is not None and date < self.after:
+            return False
+        return self.before is None or date < self.before
+
+    def _w(self, local):
+        tag = self._tags.get(local)
+        if tag is None:
+            tag = self._tags[local] = f"{{{W_NAMESPACE}}}{local}"
+        return tag
+
+
+def _remove(elem):
+    """Remove an element, keeping the text that follows it."""
+    parent = elem.getparent()
+    if elem.tail:
+        previous = elem.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or "") + elem.tail
+        else:
+            parent.text = (parent.text or "") + elem.tail
+    parent.remove(elem)
+
+
+def _unwrap(elem):
+    """Replace an element with its children."""
+    parent = elem.getparent()
+    previous = elem.getprevious()
+    if elem.text:
+        if previous is not None:
+            previous.tail = (previous.tail or "") + elem.text
+        else:
+            parent.text = (parent.text or "") + elem.text
+    children = list(elem)
+    if children:
+        children[-1].tail = (children[-1].tail or "") + (elem.tail or "")
+        elem.tail = None
+    for child in children:
+        elem.addprevious(child)
+    _remove(elem)
+
+
+def _strip_inherited_namespaces(data, nsmap):
+    """Drop namespace declarations in the first start tag that nsmap already has."""
+    end = data.index(b">")
+
+    def keep(match):
+        prefix = match[1].decode() if match[1] else None
+        return b"" if nsmap.get(prefix) == match[2].decode() else match[0]
+
+    start = re.sub(rb' xmlns(?::([\w.-]+))?="([^"]*)"', keep, data[:end])
+    return start + data[end:]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from scripts.revisions import resolve_revisions
+
+DOCUMENT = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>{}</w:body></w:document>"""
+
+CHANGE = 'w:id="{}" w:author="Jane Smith" w:date="2025-03-01T00:00:00Z"'
+
+
+def row(text, tr_pr=""):
+    return (
+        f"<w:tr>{tr_pr}<w:tc><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:tc></w:tr>"
+    )
+
+
+class TestBlocksRemovingThemselves(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.source = Path(self.temp_dir.name) / "source.docx"
+        self.output = Path(self.temp_dir.name) / "output.docx"
+
+    def resolve(self, body, accept):
+        with zipfile.ZipFile(self.source, "w") as zf:
+            zf.writestr("word/document.xml", DOCUMENT.format(body))
+        counts = resolve_revisions(self.source, self.output, accept=accept)
+        with zipfile.ZipFile(self.output) as zf:
+            return counts, zf.read("word/document.xml").decode("utf-8")
+
+    def test_reject_inserted_last_table_row(self):
+        """Rejecting an inserted last row removes it"""
+        inserted = f"<w:trPr><w:ins {CHANGE.format(1)}/></w:trPr>"
+        body = f"<w:tbl>{row('kept')}{row('inserted', inserted)}</w:tbl>"
+        counts, xml = self.resolve(body, accept=False)
+        self.assertEqual(counts, {"ins": 1})
+        self.assertIn("kept", xml)
+        self.assertNotIn("inserted", xml)
+
+    def test_accept_deletion_as_last_body_block(self):
+        """Accepting a body-level w:del that is the last block removes it"""
+        body = (
+            "<w:p><w:r><w:t>kept</w:t></w:r></w:p>"
+            f"<w:del {CHANGE.format(1)}><w:p><w:r><w:delText>deleted</w:delText>"
+            "</w:r></w:p></w:del>"
+        )
+        counts, xml = self.resolve(body, accept=True)
+        self.assertEqual(counts, {"del": 1})
+        self.assertIn("kept", xml)
+        self.assertNotIn("deleted", xml)
+
+
+if __name__ == '__main__':
+    unittest.main()
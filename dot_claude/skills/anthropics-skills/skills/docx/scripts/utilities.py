@@ -6,6 +6,18 @@ This module provides XMLEditor, a tool for manipulating XML files with support f
 line-number-based node finding and DOM manipulation. Each element is automatically
 annotated with its original line and column position during parsing.
 
+Lookups go through tag, attribute-value and line indexes, and contains= searches
+through a per-paragraph text index. replace_node, insert_after, insert_before and
+append_to keep them current, so repeated get_node calls on a large document stay
+cheap. Editors also record whether they may have changed anything
+(editor.modified), so untouched package parts are never re-serialized. Handing
+out editor.dom or a node (get_node, get_run_range) counts as a change, since the
+caller may edit it directly. After such edits, call editor.reindex().
+
+LxmlXMLEditor offers the same API on an lxml tree (native sourceline tracking),
+which loads and saves large parts faster and with far less memory. Nodes it
+returns are lxml elements rather than minidom nodes.
+
 Example usage:
     editor = XMLEditor("document.xml")
 
@@ -22,20 +34,43 @@ Example usage:
     # Combine filters
     elem = editor.get_node(tag="w:p", line_number=range(1, 50), contains="text")
 
+    # Find the runs covering text that is split across several w:r elements
+    runs, start, end = editor.get_run_range("text split across runs")
+
     # Replace, insert, or manipulate
     new_elem = editor.replace_node(elem, "<w:r><w:t>new text</w:t></w:r>")
     editor.insert_after(new_elem, "<w:r><w:t>more</w:t></w:r>")
 
     # Save changes
     editor.save()
+
+    # Edit a part of an in-memory OfficePackage instead of a file on disk
+    editor = XMLEditor("word/document.xml", package=package)
+
+    # Same API on the lxml backend
+    editor = LxmlXMLEditor("document.xml")
 """
 
+import copy
 import html
+import io
+from bisect import bisect_left, bisect_right
 from pathlib import Path
 from typing import Optional, Union
 
 import defusedxml.minidom
 import defusedxml.sax
+from lxml import etree
+
+# Attributes with an exact-value index; filters on other attributes scan by tag
+INDEXED_ATTRIBUTES = ("w:id", "w14:paraId", "w:rsidR")
+
+# Units of the text index: text is indexed per (outermost) paragraph, by run
+PARAGRAPH_TAG = "w:p"
+RUN_TAG = "w:r"
+TEXT_TAG = "w:t"
+
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
 
 
 class XMLEditor:
@@ -47,31 +82,50 @@ class XMLEditor:
     file, which is useful when working with Read tool output.
 
     Attributes:
-        xml_path: Path to the XML file being edited
+        xml_path: Path to the XML file being edited (part name when package-backed)
+        package: OfficePackage holding the part, or None when editing a file
         encoding: Detected encoding of the XML file ('ascii' or 'utf-8')
         dom: Parsed DOM tree with parse_position attributes on elements
+        modified: True once the tree may have changed: it was edited through
+            the editor's methods, or dom or a node was handed out for direct edits
     """
 
-    def __init__(self, xml_path):
+    def __init__(self, xml_path, package=None):
         """
         Initialize with path to XML file and parse with line number tracking.
 
         Args:
-            xml_path: Path to XML file to edit (str or Path)
+            xml_path: Path to XML file to edit (str or Path), or the part name
+                (e.g. "word/document.xml") when package is given
+            package: Optional OfficePackage to edit in memory. The editor's DOM
+                becomes the part's live content; nothing is written to disk.
 
         Raises:
             ValueError: If the XML file does not exist
         """
         self.xml_path = Path(xml_path)
-        if not self.xml_path.exists():
-            raise ValueError(f"XML file not found: {xml_path}")
-
-        with open(self.xml_path, "rb") as f:
-            header = f.read(200).decode("utf-8", errors="ignore")
+        self.package = package
+        if package is not None:
+            part_name = self.xml_path.as_posix()
+            if part_name not in package:
+                raise ValueError(f"XML part not found: {part_name}")
+            content = package.read(part_name)
+        else:
+            if not self.xml_path.exists():
+                raise ValueError(f"XML file not found: {xml_path}")
+            content = self.xml_path.read_bytes()
+
+        header = content[:200].decode("utf-8", errors="ignore")
         self.encoding = "ascii" if 'encoding="ascii"' in header else "utf-8"
+        self._dom = self._parse(content)
+        self.modified = False
 
-        parser = _create_line_tracking_parser()
-        self.dom = defusedxml.minidom.parse(str(self.xml_path), parser)
+        if package is not None:
+            package.attach(part_name, self)
+
+        # Built on first lookup, then kept current by the mutation methods
+        self._index = None
+        self._text_index = None
 
     def get_node(
         self,
@@ -109,40 +163,18 @@ class XMLEditor:
             elem = editor.get_node(tag="w:t", contains="&#8220;Agreement")  # Entity notation
             elem = editor.get_node(tag="w:t", contains="\u201cAgreement")   # Unicode character
         """
-        matches = []
-        for elem in self.dom.getElementsByTagName(tag):
-            # Check line_number filter
-            if line_number is not None:
-                parse_pos = getattr(elem, "parse_position", (None,))
-                elem_line = parse_pos[0]
-
-                # Handle both single line number and range
-                if isinstance(line_number, range):
-                    if elem_line not in line_number:
-                        continue
-                else:
-                    if elem_line != line_number:
-                        continue
-
-            # Check attrs filter
-            if attrs is not None:
-                if not all(
-                    elem.getAttribute(attr_name) == attr_value
-                    for attr_name, attr_value in attrs.items()
-                ):
-                    continue
-
-            # Check contains filter
-            if contains is not None:
-                elem_text = self._get_element_text(elem)
-                # Normalize the search string: convert HTML entities to Unicode characters
-                # This allows searching for both "&#8220;Rowan" and ""Rowan"
-                normalized_contains = html.unescape(contains)
-                if normalized_contains not in elem_text:
-                    continue
-
-            # If all applicable filters passed, this is a match
-            matches.append(elem)
+        node = self._get_node(tag, attrs, line_number, contains)
+        # The caller may edit the node directly
+        self.modified = True
+        return node
+
+    def _get_node(self, tag, attrs=None, line_number=None, contains=None):
+        """get_node for read-only lookups: the part is not marked modified."""
+        matches = self._find_nodes(tag, attrs, line_number, contains)
+        if not matches:
+            # Untracked DOM edits can leave the index behind; rebuild before giving up
+            self._drop_indexes()
+            matches = self._find_nodes(tag, attrs, line_number, contains)
 
         if not matches:
             # Build descriptive error message
@@ -163,7 +195,12 @@ class XMLEditor:
             base_msg = f"Node not found: <{tag}> {filter_desc}".strip()
 
             # Add helpful hint based on filters used
-            if contains:
+            if contains and self._text_index.find(html.unescape(contains)):
+                hint = (
+                    f"Text exists but not within a single matching <{tag}>; "
+                    "if it is split across runs, use get_run_range()."
+                )
+            elif contains:
                 hint = "Text may be split across elements or use different wording."
             elif line_number:
                 hint = "Line numbers may have changed if document was modified."
@@ -180,48 +217,217 @@ class XMLEditor:
             )
         return matches[0]
 
+    def get_run_range(self, text: str, paragraph=None):
+        """
+        Find the runs covering a text span, including text split across runs.
+
+        The text must occur exactly once in the document (or in paragraph, if given).
+        Text is matched against the paragraph's concatenated run text, so
+        formatting boundaries between runs do not matter.
+
+        Args:
+            text: Text to find. Supports both entity notation (&#8220;) and
+                Unicode characters (\u201c), like get_node(contains=...).
+            paragraph: Optional w:p element to restrict the search to
+
+        Returns:
+            tuple: (runs, start, end) where runs is the list of w:r elements
+                covering the text in document order, start is the offset of the
+                text within the first run's text and end is the offset just past
+                the text within the last run's text
+
+        Raises:
+            ValueError: If the text is not found or found more than once
+
+        Example:
+            runs, start, end = editor.get_run_range("Section 2.1 applies")
+            # runs[0] text[start:] through runs[-1] text[:end] is the span
+        """
+        needle = html.unescape(text)
+        if not needle:
+            raise ValueError("Text to find must not be empty")
+        if self._text_index is None:
+            self._text_index = _TextIndex(self)
+
+        occurrences = self._text_index.find(needle, paragraph)
+        if not occurrences:
+            self._drop_indexes()
+            self._text_index = _TextIndex(self)
+            occurrences = self._text_index.find(needle, paragraph)
+        if not occurrences:
+            raise ValueError(
+                f"Text not found: '{text}'. Verify the wording, including spacing."
+            )
+        if len(occurrences) > 1:
+            raise ValueError(
+                f"Text found {len(occurrences)} times: '{text}'. "
+                "Pass paragraph= to narrow the search."
+            )
+        unit, offset = occurrences[0]
+        # The caller may edit the runs directly
+        self.modified = True
+        return self._text_index.run_range(unit, offset, offset + len(needle))
+
+    @property
+    def dom(self):
+        """Parsed DOM tree; accessing it marks the part modified (it may be edited)."""
+        self.modified = True
+        return self._dom
+
+    def reindex(self):
+        """
+        Discard the lookup indexes so the next get_node rebuilds them, and mark
+        the part modified so it is saved.
+
+        Only needed after changing editor.dom directly (createElement, appendChild,
+        setAttribute, ...); the editor's own methods keep the indexes current.
+        """
+        self._drop_indexes()
+        self.modified = True
+
+    def _drop_indexes(self):
+        self._index = None
+        self._text_index = None
+
+    def _find_nodes(self, tag, attrs, line_number, contains):
+        """Return all attached elements matching the get_node filters."""
+        if self._index is None:
+            self._index = _NodeIndex(self)
+
+        if contains is not None:
+            # Normalize the search string: convert HTML entities to Unicode characters
+            # This allows searching for both "&#8220;Rowan" and ""Rowan"
+            normalized_contains = html.unescape(contains)
+            if self._text_index is None:
+                self._text_index = _TextIndex(self)
+
+        if (
+            contains is not None
+            and line_number is None
+            and not (attrs and any(name in attrs for name in INDEXED_ATTRIBUTES))
+        ):
+            # Only paragraphs containing the text can hold matching elements
+            candidates = self._text_index.candidates(
+                tag, normalized_contains, self._index
+            )
+        else:
+            candidates = self._index.candidates(tag, attrs, line_number)
+
+        matches = []
+        for elem in candidates:
+            # Index entries can be stale; verify every candidate
+            if self._tag_of(elem) != tag or not self._is_attached(elem):
+                continue
+
+            # Check line_number filter
+            if line_number is not None:
+                elem_line = self._line_of(elem)
+
+                # Handle both single line number and range
+                if isinstance(line_number, range):
+                    if elem_line not in line_number:
+                        continue
+                else:
+                    if elem_line != line_number:
+                        continue
+
+            # Check attrs filter
+            if attrs is not None:
+                if not all(
+                    self._get_attr(elem, attr_name) == attr_value
+                    for attr_name, attr_value in attrs.items()
+                ):
+                    continue
+
+            # Check contains filter
+            if contains is not None:
+                elem_text = self._text_index.text(elem)
+                if elem_text is None:
+                    # Element is above paragraph level; walk it
+                    elem_text = self._get_element_text(elem)
+                if normalized_contains not in elem_text:
+                    continue
+
+            # If all applicable filters passed, this is a match
+            matches.append(elem)
+        return matches
+
+    def _index_nodes(self, nodes):
+        """Add nodes and their descendants to the lookup indexes."""
+        if self._index is not None:
+            for node in nodes:
+                self._index.add(node)
+        if self._text_index is not None:
+            self._text_index.add_all(nodes)
+
+    def _unindex_node(self, node):
+        """Drop a node about to be detached from the lookup indexes."""
+        for index in (self._index, self._text_index):
+            if index is not None:
+                index.remove(node)
+
+    def _nodes_inserted(self, nodes):
+        """
+        Hook called with the nodes of each insert_*/replace_node/append_to call.
+
+        Subclasses that modify new nodes (e.g. injecting attributes) should do so
+        before calling this, so the indexes see the final attribute values.
+        """
+        self.modified = True
+        self._index_nodes(nodes)
+
     def _get_element_text(self, elem):
         """
         Recursively extract all text content from an element.
 
         Skips text nodes that contain only whitespace (spaces, tabs, newlines),
-        which typically represent XML formatting rather than document content.
+        which typically represent XML formatting rather than document content,
+        except in w:t elements with xml:space="preserve" (e.g. a lone space run).
 
         Args:
-            elem: defusedxml.minidom.Element to extract text from
+            elem: Element to extract text from
 
         Returns:
             str: Concatenated text from all non-whitespace text nodes within the element
         """
         text_parts = []
-        for node in elem.childNodes:
-            if node.nodeType == node.TEXT_NODE:
+        preserve = self._preserves_space(elem)
+        for node in self._content_of(elem):
+            if isinstance(node, str):
                 # Skip whitespace-only text nodes (XML formatting)
-                if node.data.strip():
-                    text_parts.append(node.data)
-            elif node.nodeType == node.ELEMENT_NODE:
+                if preserve or node.strip():
+                    text_parts.append(node)
+            else:
                 text_parts.append(self._get_element_text(node))
         return "".join(text_parts)
 
+    def _preserves_space(self, elem):
+        """Return True if elem is a w:t whose whitespace is document content."""
+        return (
+            self._tag_of(elem) == TEXT_TAG
+            and self._get_attr(elem, "xml:space") == "preserve"
+        )
+
     def replace_node(self, elem, new_content):
         """
         Replace a DOM element with new XML content.
 
         Args:
-            elem: defusedxml.minidom.Element to replace
+            elem: Element to replace
             new_content: String containing XML to replace the node with
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            List: All inserted nodes
 
         Example:
             new_nodes = editor.replace_node(old_elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
         nodes = self._parse_fragment(new_content)
         for node in nodes:
-            parent.insertBefore(node, elem)
-        parent.removeChild(elem)
+            self._insert_before_node(elem, node)
+        self._unindex_node(elem)
+        self._remove_node(elem)
+        self._nodes_inserted(nodes)
         return nodes
 
     def insert_after(self, elem, xml_content):
@@ -229,23 +435,21 @@ class XMLEditor:
         Insert XML content after a DOM element.
 
         Args:
-            elem: defusedxml.minidom.Element to insert after
+            elem: Element to insert after
             xml_content: String containing XML to insert
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            List: All inserted nodes
 
         Example:
             new_nodes = editor.insert_after(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        next_sibling = elem.nextSibling
         nodes = self._parse_fragment(xml_content)
+        anchor = elem
         for node in nodes:
-            if next_sibling:
-                parent.insertBefore(node, next_sibling)
-            else:
-                parent.appendChild(node)
+            self._insert_after_node(anchor, node)
+            anchor = node
+        self._nodes_inserted(nodes)
         return nodes
 
     def insert_before(self, elem, xml_content):
@@ -253,19 +457,19 @@ class XMLEditor:
         Insert XML content before a DOM element.
 
         Args:
-            elem: defusedxml.minidom.Element to insert before
+            elem: Element to insert before
             xml_content: String containing XML to insert
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            List: All inserted nodes
 
         Example:
             new_nodes = editor.insert_before(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
         nodes = self._parse_fragment(xml_content)
         for node in nodes:
-            parent.insertBefore(node, elem)
+            self._insert_before_node(elem, node)
+        self._nodes_inserted(nodes)
         return nodes
 
     def append_to(self, elem, xml_content):
@@ -273,25 +477,26 @@ class XMLEditor:
         Append XML content as a child of a DOM element.
 
         Args:
-            elem: defusedxml.minidom.Element to append to
+            elem: Element to append to
             xml_content: String containing XML to append
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            List: All inserted nodes
 
         Example:
             new_nodes = editor.append_to(elem, "<w:r><w:t>text</w:t></w:r>")
         """
         nodes = self._parse_fragment(xml_content)
         for node in nodes:
-            elem.appendChild(node)
+            self._append_child(elem, node)
+        self._nodes_inserted(nodes)
         return nodes
 
     def get_next_rid(self):
         """Get the next available rId for relationships files."""
         max_id = 0
-        for rel_elem in self.dom.getElementsByTagName("Relationship"):
-            rel_id = rel_elem.getAttribute("Id")
+        for rel_elem in self._find_all(self._root(), "Relationship"):
+            rel_id = self._get_attr(rel_elem, "Id")
             if rel_id.startswith("rId"):
                 try:
                     max_id = max(max_id, int(rel_id[3:]))
@@ -299,15 +504,21 @@ class XMLEditor:
                     pass
         return f"rId{max_id + 1}"
 
+    def serialize(self):
+        """Serialize the DOM tree to bytes in the original encoding (ascii or utf-8)."""
+        return self._dom.toxml(encoding=self.encoding)
+
     def save(self):
         """
         Save the edited XML back to the file.
 
         Serializes the DOM tree and writes it back to the original file path,
-        preserving the original encoding (ascii or utf-8).
+        preserving the original encoding (ascii or utf-8). Package-backed editors
+        are already the live content of their part, so there is nothing to write.
         """
-        content = self.dom.toxml(encoding=self.encoding)
-        self.xml_path.write_bytes(content)
+        if self.package is not None:
+            return
+        self.xml_path.write_bytes(self.serialize())
 
     def _parse_fragment(self, xml_content):
         """
@@ -323,7 +534,7 @@ class XMLEditor:
             AssertionError: If fragment contains no element nodes
         """
         # Extract namespace declarations from the root document element
-        root_elem = self.dom.documentElement
+        root_elem = self._dom.documentElement
         namespaces = []
         if root_elem and root_elem.attributes:
             for i in range(root_elem.attributes.length):
@@ -335,13 +546,666 @@ class XMLEditor:
         wrapper = f"<root {ns_decl}>{xml_content}</root>"
         fragment_doc = defusedxml.minidom.parseString(wrapper)
         nodes = [
-            self.dom.importNode(child, deep=True)
+            self._dom.importNode(child, deep=True)
             for child in fragment_doc.documentElement.childNodes  # type: ignore
         ]
         elements = [n for n in nodes if n.nodeType == n.ELEMENT_NODE]
         assert elements, "Fragment must contain at least one element"
         return nodes
 
+    # ==================== Backend primitives ====================
+    # The indexes and DocxXMLEditor read and restructure the tree only through
+    # these methods, so a subclass can swap the DOM implementation underneath.
+
+    def _parse(self, content):
+        """Parse XML bytes into this backend's document with line tracking."""
+        parser = _create_line_tracking_parser()
+        return defusedxml.minidom.parse(io.BytesIO(content), parser)
+
+    def _root(self):
+        return self._dom.documentElement
+
+    def _is_element(self, node):
+        return node.nodeType == node.ELEMENT_NODE
+
+    def _tag_of(self, elem):
+        return elem.tagName
+
+    def _line_of(self, elem):
+        return getattr(elem, "parse_position", (None,))[0]
+
+    def _parent_of(self, elem):
+        parent = elem.parentNode
+        if parent is None or parent.nodeType != parent.ELEMENT_NODE:
+            return None
+        return parent
+
+    def _is_attached(self, elem):
+        """Check that an element is still part of this editor's document."""
+        node = elem
+        while node.parentNode is not None:
+            node = node.parentNode
+        return node is self._dom
+
+    def _get_attr(self, elem, name):
+        return elem.getAttribute(name)
+
+    def _has_attr(self, elem, name):
+        return elem.hasAttribute(name)
+
+    def _set_attr(self, elem, name, value):
+        elem.setAttribute(name, value)
+
+    def _remove_attr(self, elem, name):
+        elem.removeAttribute(name)
+
+    def _content_of(self, elem):
+        """Yield an element's children in order: text as str, elements as nodes."""
+        for child in elem.childNodes:
+            if child.nodeType == child.TEXT_NODE:
+                yield child.data
+            elif child.nodeType == child.ELEMENT_NODE:
+                yield child
+
+    def _children_of(self, elem):
+        return [c for c in elem.childNodes if c.nodeType == c.ELEMENT_NODE]
+
+    def _leading_text(self, elem):
+        """Return the text before an element's first child element, if any."""
+        first = elem.firstChild
+        if first is not None and first.nodeType == first.TEXT_NODE:
+            return first.data
+        return None
+
+    def _iter_elements(self, node):
+        """Yield a node (if an element) and its descendant elements in document order."""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.nodeType == current.ELEMENT_NODE:
+                yield current
+                stack.extend(reversed(current.childNodes))
+
+    def _walk(self, node):
+        """Yield ("start", elem) and ("end", elem) for node and its descendant elements."""
+        stack = [(node, False)]
+        while stack:
+            current, done = stack.pop()
+            if done:
+                yield "end", current
+            elif current.nodeType == current.ELEMENT_NODE:
+                yield "start", current
+                stack.append((current, True))
+                stack.extend((child, False) for child in reversed(current.childNodes))
+
+    def _find_all(self, elem, tag):
+        """Return descendant elements (not elem itself) with the given tag."""
+        return list(elem.getElementsByTagName(tag))
+
+    def _create_element(self, tag):
+        return self._dom.createElement(tag)
+
+    def _clone(self, elem):
+        return elem.cloneNode(True)
+
+    def _import_node(self, node):
+        """Return a deep copy, owned by this document, of a node from another one."""
+        return self._dom.importNode(node, True)
+
+    def _set_text(self, elem, text):
+        """Replace an element's content with a single text node."""
+        while elem.firstChild:
+            elem.removeChild(elem.firstChild)
+        elem.appendChild(self._dom.createTextNode(text))
+
+    def _rename(self, elem, tag):
+        """Change an element's tag in place; returns the element now in the tree."""
+        renamed = self._dom.createElement(tag)
+        # Copy ALL child nodes (not just firstChild) to handle entities
+        while elem.firstChild:
+            renamed.appendChild(elem.firstChild)
+        for i in range(elem.attributes.length):
+            attr = elem.attributes.item(i)
+            renamed.setAttribute(attr.name, attr.value)
+        elem.parentNode.replaceChild(renamed, elem)
+        return renamed
+
+    def _append_child(self, parent, node):
+        parent.appendChild(node)
+
+    def _insert_first(self, parent, node):
+        if parent.firstChild:
+            parent.insertBefore(node, parent.firstChild)
+        else:
+            parent.appendChild(node)
+
+    def _insert_before_node(self, elem, node):
+        elem.parentNode.insertBefore(node, elem)
+
+    def _insert_after_node(self, elem, node):
+        # insertBefore(node, None) appends
+        elem.parentNode.insertBefore(node, elem.nextSibling)
+
+    def _remove_node(self, elem):
+        elem.parentNode.removeChild(elem)
+
+    def _wrap(self, elem, wrapper):
+        """Put wrapper where elem is and move elem into it."""
+        parent = elem.parentNode
+        parent.insertBefore(wrapper, elem)
+        parent.removeChild(elem)
+        wrapper.appendChild(elem)
+
+    def _move_children(self, source, target, keep_tag=None):
+        """Move all children of source (except keep_tag elements) into target."""
+        for child in list(source.childNodes):
+            if keep_tag is not None and child.nodeName == keep_tag:
+                continue
+            source.removeChild(child)
+            target.appendChild(child)
+
+    def _ensure_namespace(self, prefix, uri):
+        """Declare a namespace prefix on the root element if missing."""
+        root = self._dom.documentElement
+        if not root.hasAttribute(f"xmlns:{prefix}"):  # type: ignore
+            root.setAttribute(f"xmlns:{prefix}", uri)  # type: ignore
+
+
+class LxmlXMLEditor(XMLEditor):
+    """
+    XMLEditor on an lxml tree instead of minidom.
+
+    Same API and lookup behaviour as XMLEditor, using lxml's native sourceline
+    for line numbers (for start tags spanning several lines, the line where the
+    tag ends; unpack.py output has one start tag per line). Parsing never
+    resolves entities or touches the network, and documents declaring entities
+    are rejected, matching the defusedxml guarantees of XMLEditor.
+
+    Text lives in .text/.tail rather than separate nodes, so insert/replace
+    methods return only the inserted elements.
+
+    Attributes:
+        dom: lxml.etree._ElementTree for direct manipulation
+    """
+
+    def __init__(self, xml_path, package=None):
+        # Prefixed name <-> Clark notation caches, per root namespace map
+        self._prefixed = {}
+        self._clark = {}
+        super().__init__(xml_path, package=package)
+
+    def serialize(self):
+        """Serialize the tree to bytes in the original encoding (ascii or utf-8)."""
+        declaration = f'<?xml version="1.0" encoding="{self.encoding}"?>'
+        body = etree.tostring(self._dom, encoding=self.encoding, xml_declaration=False)
+        return declaration.encode(self.encoding) + body
+
+    def _parse_fragment(self, xml_content):
+        namespaces = [
+            f'xmlns:{prefix}="{uri}"' if prefix else f'xmlns="{uri}"'
+            for prefix, uri in self._root().nsmap.items()
+        ]
+        wrapper = f"<root {' '.join(namespaces)}>{xml_content}</root>"
+        fragment = etree.fromstring(wrapper.encode("utf-8"), _create_lxml_parser())
+        if fragment.text and fragment.text.strip():
+            raise ValueError("Fragment must not start with text outside an element")
+
+        # Line numbers refer to the original file only
+        for elem in fragment.iter(etree.Element):
+            elem.sourceline = 0
+        nodes = list(fragment)
+        elements = [n for n in nodes if self._is_element(n)]
+        assert elements, "Fragment must contain at least one element"
+        return nodes
+
+    def _parse(self, content):
+        tree = etree.parse(io.BytesIO(content), _create_lxml_parser())
+        dtd = tree.docinfo.internalDTD
+        if dtd is not None and any(True for _ in dtd.iterentities()):
+            raise ValueError("Entity declarations are not allowed")
+        return tree
+
+    def _qualify(self, name, attribute=False):
+        """Return the Clark name ({uri}local) for a prefixed name, or None."""
+        key = (name, attribute)
+        if key not in self._clark:
+            prefix, _, local = name.rpartition(":")
+            if prefix == "xml":
+                uri = XML_NAMESPACE
+            elif prefix or not attribute:
+                # Unprefixed tags (e.g. Relationship) use the default namespace
+                uri = self._root().nsmap.get(prefix or None)
+                if uri is None and prefix:
+                    self._clark[key] = None
+                    return None
+            else:
+                uri = None
+            self._clark[key] = f"{{{uri}}}{local}" if uri else local
+        return self._clark[key]
+
+    def _require(self, name, attribute=False):
+        clark = self._qualify(name, attribute)
+        if clark is None:
+            raise ValueError(f"Namespace prefix of '{name}' is not declared")
+        return clark
+
+    def _root(self):
+        return self._dom.getroot()
+
+    def _is_element(self, node):
+        return isinstance(node.tag, str)
+
+    def _tag_of(self, elem):
+        tag = elem.tag
+        name = self._prefixed.get(tag)
+        if name is None:
+            if not isinstance(tag, str):
+                return ""  # Comment or processing instruction
+            local = etree.QName(tag).localname
+            name = f"{elem.prefix}:{local}" if elem.prefix else local
+            self._prefixed[tag] = name
+        return name
+
+    def _line_of(self, elem):
+        return elem.sourceline
+
+    def _parent_of(self, elem):
+        return elem.getparent()
+
+    def _is_attached(self, elem):
+        top = elem
+        while (parent := top.getparent()) is not None:
+            top = parent
+        return top is self._dom.getroot()
+
+    def _get_attr(self, elem, name):
+        clark = self._qualify(name, attribute=True)
+        return elem.get(clark, "") if clark else ""
+
+    def _has_attr(self, elem, name):
+        clark = self._qualify(name, attribute=True)
+        return clark is not None and clark in elem.attrib
+
+    def _set_attr(self, elem, name, value):
+        elem.set(self._require(name, attribute=True), value)
+
+    def _remove_attr(self, elem, name):
+        clark = self._qualify(name, attribute=True)
+        if clark:
+            elem.attrib.pop(clark, None)
+
+    def _content_of(self, elem):
+        if elem.text:
+            yield elem.text
+        for child in elem:
+            if isinstance(child.tag, str):
+                yield child
+            if child.tail:
+                yield child.tail
+
+    def _children_of(self, elem):
+        return [c for c in elem if isinstance(c.tag, str)]
+
+    def _leading_text(self, elem):
+        return elem.text
+
+    def _iter_elements(self, node):
+        if not isinstance(node.tag, str):
+            return iter(())
+        return node.iter(etree.Element)
+
+    def _walk(self, node):
+        if not isinstance(node.tag, str):
+            return iter(())
+        return etree.iterwalk(node, events=("start", "end"))
+
+    def _find_all(self, elem, tag):
+        clark = self._qualify(tag)
+        if clark is None:
+            return []
+        return [e for e in elem.iter(clark) if e is not elem]
+
+    def _create_element(self, tag):
+        return self._root().makeelement(self._require(tag))
+
+    def _clone(self, elem):
+        clone = copy.deepcopy(elem)
+        clone.tail = None
+        # Like minidom clones, copies have no source line
+        for node in clone.iter(etree.Element):
+            node.sourceline = 0
+        return clone
+
+    def _import_node(self, node):
+        return self._clone(node)
+
+    def _set_text(self, elem, text):
+        del elem[:]
+        elem.text = text
+
+    def _rename(self, elem, tag):
+        elem.tag = self._require(tag)
+        return elem
+
+    def _append_child(self, parent, node):
+        parent.append(node)
+
+    def _insert_first(self, parent, node):
+        parent.insert(0, node)
+
+    def _insert_before_node(self, elem, node):
+        elem.addprevious(node)
+
+    def _insert_after_node(self, elem, node):
+        elem.addnext(node)
+
+    def _remove_node(self, elem):
+        # The tail (text after elem) belongs to elem in lxml; keep it in place
+        if elem.tail:
+            previous = elem.getprevious()
+            if previous is not None:
+                previous.tail = (previous.tail or "") + elem.tail
+            else:
+                parent = elem.getparent()
+                parent.text = (parent.text or "") + elem.tail
+        elem.getparent().remove(elem)
+
+    def _wrap(self, elem, wrapper):
+        elem.addprevious(wrapper)
+        wrapper.tail, elem.tail = elem.tail, None
+        wrapper.append(elem)
+
+    def _move_children(self, source, target, keep_tag=None):
+        moved = [c for c in source if keep_tag is None or self._tag_of(c) != keep_tag]
+        if not moved:
+            return
+        # Text before the first moved child goes with it
+        previous = moved[0].getprevious()
+        if previous is None:
+            target.text, source.text = source.text, None
+        else:
+            target.text, previous.tail = previous.tail, None
+        for child in moved:
+            target.append(child)
+
+    def _ensure_namespace(self, prefix, uri):
+        root = self._dom.getroot()
+        if root.nsmap.get(prefix) == uri:
+            return
+        # lxml namespace maps are fixed at creation. Moving the children to a new
+        # root re-homes every node (minutes on large documents), so declare the
+        # namespace in place instead, keeping all existing root declarations.
+        etree.cleanup_namespaces(
+            root,
+            top_nsmap={prefix: uri},
+            keep_ns_prefixes=[p for p in root.nsmap if p] + [prefix],
+        )
+        self._prefixed.clear()
+        self._clark.clear()
+        self.modified = True
+
+
+class _NodeIndex:
+    """
+    Tag, attribute-value and line-number indexes over a DOM tree.
+
+    The indexes only narrow down candidates: entries for removed or changed
+    elements may linger, so callers must re-check each candidate. Line numbers
+    come from parsing and never change, so the per-tag line index is built once
+    as a sorted list and searched with bisect.
+    """
+
+    def __init__(self, editor):
+        self.editor = editor
+        self.by_tag = {}
+        self.by_attr = {}
+        self.lines = {}
+        root = editor._root()
+        if root is not None:
+            self.add(root)
+
+        # Elements are indexed in document order, which is line order after parsing
+        for tag, elems in self.by_tag.items():
+            positioned = [(editor._line_of(e), e) for e in elems]
+            positioned = [(line, e) for line, e in positioned if line is not None]
+            self.lines[tag] = (
+                [line for line, _ in positioned],
+                [e for _, e in positioned],
+            )
+
+    def add(self, node):
+        """Index a node and all of its descendant elements."""
+        editor = self.editor
+        for elem in editor._iter_elements(node):
+            self.by_tag.setdefault(editor._tag_of(elem), {})[elem] = None
+            for name in INDEXED_ATTRIBUTES:
+                value = editor._get_attr(elem, name)
+                if value:
+                    self.by_attr.setdefault((name, value), {})[elem] = None
+
+    def remove(self, node):
+        """Drop a node and all of its descendant elements from the indexes."""
+        editor = self.editor
+        for elem in editor._iter_elements(node):
+            self.by_tag.get(editor._tag_of(elem), {}).pop(elem, None)
+            for name in INDEXED_ATTRIBUTES:
+                value = editor._get_attr(elem, name)
+                if value:
+                    self.by_attr.get((name, value), {}).pop(elem, None)
+
+    def candidates(self, tag, attrs=None, line_number=None):
+        """Return elements that may match, using the most selective index."""
+        if attrs:
+            for name in INDEXED_ATTRIBUTES:
+                if name in attrs:
+                    return list(self.by_attr.get((name, attrs[name]), ()))
+
+        if line_number is not None:
+            line_list, elems = self.lines.get(tag, ([], []))
+            if isinstance(line_number, range):
+                lo = bisect_left(line_list, line_number.start)
+                hi = bisect_left(line_list, line_number.stop)
+            else:
+                lo = bisect_left(line_list, line_number)
+                hi = bisect_right(line_list, line_number)
+            return elems[lo:hi]
+
+        return list(self.by_tag.get(tag, ()))
+
+
+class _TextIndex:
+    """
+    Per-paragraph text index for contains= searches and run ranges.
+
+    Each outermost w:p is indexed as the concatenation of its non-whitespace text
+    nodes and preserved w:t whitespace (the same text _get_element_text
+    returns), with the (start, end) span
+    of every element inside it. An element's text is then a slice of its
+    paragraph's text, and text split across runs is found in one string search.
+    Elements above paragraph level (w:body, w:tbl, ...) are not indexed.
+    """
+
+    def __init__(self, editor):
+        self.editor = editor
+        self.paragraphs = {}  # outermost w:p -> text
+        self.spans = {}  # element -> (paragraph, start, end)
+        self.members = {}  # paragraph -> elements inside it, in document order
+        self.runs = {}  # paragraph -> [(w:r, start, end)] for innermost runs
+        self.outside_tags = set()  # tags that occur above paragraph level
+        root = editor._root()
+        if root is not None:
+            self.add(root)
+
+    def add(self, node):
+        """Index a node, re-indexing the paragraph it was inserted into."""
+        unit = self._paragraph_of(node)
+        if unit is not None:
+            self._index_paragraph(unit)
+            return
+
+        editor = self.editor
+        stack = [node] if editor._is_element(node) else []
+        while stack:
+            current = stack.pop()
+            tag = editor._tag_of(current)
+            if tag == PARAGRAPH_TAG:
+                self._index_paragraph(current)
+            else:
+                self.outside_tags.add(tag)
+                stack.extend(editor._children_of(current))
+
+    def add_all(self, nodes):
+        """Index several nodes, re-indexing each paragraph they touch once."""
+        reindexed = set()
+        for node in nodes:
+            unit = self._paragraph_of(node)
+            if unit is None:
+                self.add(node)
+            elif unit not in reindexed:
+                reindexed.add(unit)
+                self._index_paragraph(unit)
+
+    def remove(self, node):
+        """Drop a node that is about to be detached."""
+        unit = self._paragraph_of(node)
+        if unit is not None and unit is not node:
+            # Paragraph is re-indexed when the replacement content is inserted
+            for elem in self.editor._iter_elements(node):
+                self.spans.pop(elem, None)
+            return
+
+        for elem in self.editor._iter_elements(node):
+            if elem in self.paragraphs:
+                self._drop_paragraph(elem)
+
+    def text(self, elem):
+        """Return the indexed text of an element, or None if it is not indexed."""
+        span = self.spans.get(elem)
+        if span is None:
+            return None
+        unit, start, end = span
+        return self.paragraphs[unit][start:end]
+
+    def find(self, needle, paragraph=None):
+        """Return (paragraph, offset) for each occurrence of needle."""
+        if paragraph is not None:
+            span = self.spans.get(paragraph)
+            if span is None:
+                return []
+            units = [span]
+        else:
+            units = [(unit, 0, len(text)) for unit, text in self.paragraphs.items()]
+
+        occurrences = []
+        for unit, start, end in units:
+            text = self.paragraphs[unit]
+            offset = text.find(needle, start, end)
+            while offset != -1:
+                occurrences.append((unit, offset))
+                offset = text.find(needle, offset + 1, end)
+        return occurrences
+
+    def candidates(self, tag, needle, node_index):
+        """Return elements that may contain needle, without walking the DOM."""
+        tag_of = self.editor._tag_of
+        matches = []
+        for unit, text in self.paragraphs.items():
+            if needle in text:
+                matches.extend(e for e in self.members[unit] if tag_of(e) == tag)
+        if tag in self.outside_tags:
+            matches.extend(
+                e for e in node_index.by_tag.get(tag, ()) if e not in self.spans
+            )
+        return matches
+
+    def run_range(self, unit, start, end):
+        """Return (runs, start, end) for a span of a paragraph's text."""
+        runs = [
+            (run, run_start, run_end)
+            for run, run_start, run_end in self.runs[unit]
+            if run_start < end and run_end > start
+        ]
+        if not runs:
+            raise ValueError("Text is not inside any <w:r> element")
+        return (
+            [run for run, _, _ in runs],
+            start - runs[0][1],
+            end - runs[-1][1],
+        )
+
+    def _paragraph_of(self, node):
+        """Return the outermost w:p containing (or being) node, if any."""
+        editor = self.editor
+        if not editor._is_element(node):
+            return None
+        unit = None
+        current = node
+        while current is not None:
+            if editor._tag_of(current) == PARAGRAPH_TAG:
+                unit = current
+            current = editor._parent_of(current)
+        return unit
+
+    def _drop_paragraph(self, unit):
+        for elem in self.members.pop(unit, ()):
+            self.spans.pop(elem, None)
+        self.paragraphs.pop(unit, None)
+        self.runs.pop(unit, None)
+
+    def _index_paragraph(self, unit):
+        self._drop_paragraph(unit)
+        editor = self.editor
+        parts = []
+        members = []
+        nested_runs = set()
+        open_runs = []
+        length = 0
+
+        def visit(elem):
+            nonlocal length
+            members.append(elem)
+            start = length
+            tag = editor._tag_of(elem)
+            is_run = tag == RUN_TAG
+            if is_run:
+                nested_runs.update(open_runs)
+                open_runs.append(elem)
+            preserve = (
+                tag == TEXT_TAG and editor._get_attr(elem, "xml:space") == "preserve"
+            )
+            for child in editor._content_of(elem):
+                if isinstance(child, str):
+                    # Skip whitespace-only text nodes (XML formatting)
+                    if preserve or child.strip():
+                        parts.append(child)
+                        length += len(child)
+                else:
+                    visit(child)
+            if is_run:
+                open_runs.pop()
+            self.spans[elem] = (unit, start, length)
+
+        visit(unit)
+        self.paragraphs[unit] = "".join(parts)
+        self.members[unit] = members
+        self.runs[unit] = [
+            (elem, *self.spans[elem][1:])
+            for elem in members
+            if editor._tag_of(elem) == RUN_TAG and elem not in nested_runs
+        ]
+
+
+def _create_lxml_parser():
+    """
+    Create an lxml parser that never resolves entities or loads external resources.
+
+    Returns:
+        lxml.etree.XMLParser: Parser for untrusted OOXML parts
+    """
+    return etree.XMLParser(
+        resolve_entities=False, no_network=True, load_dtd=False, huge_tree=False
+    )
+
 
 def _create_line_tracking_parser():
     """
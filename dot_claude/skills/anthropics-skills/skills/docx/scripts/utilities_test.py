@@ -0,0 +1,46 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.utilities import LxmlXMLEditor, XMLEditor
+
+DOCUMENT = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">
+  <w:body>
+    <w:p>
+      <w:r>
+        <w:t>foo</w:t>
+      </w:r>
+      <w:r>
+        <w:t xml:space="preserve"> </w:t>
+      </w:r>
+      <w:r>
+        <w:t>bar</w:t>
+      </w:r>
+    </w:p>
+  </w:body>
+</w:document>"""
+
+
+class TestTextIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.xml_path = Path(self.temp_dir.name) / "document.xml"
+        self.xml_path.write_text(DOCUMENT)
+
+    def test_preserved_space_run_is_indexed(self):
+        """A run holding only a preserved space joins the text around it"""
+        for editor_class in (XMLEditor, LxmlXMLEditor):
+            with self.subTest(editor=editor_class.__name__):
+                editor = editor_class(self.xml_path)
+                runs, start, end = editor.get_run_range("foo bar")
+                self.assertEqual(len(runs), 3)
+                self.assertEqual((start, end), (0, 3))
+                paragraph = editor.get_node(tag="w:p", contains="foo bar")
+                self.assertEqual(editor._get_element_text(paragraph), "foo bar")
+
+
+if __name__ == '__main__':
+    unittest.main()
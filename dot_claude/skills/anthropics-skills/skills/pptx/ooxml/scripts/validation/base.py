@@ -3,6 +3,7 @@ Base validator with common validation logic for document files.
 """
 
 import re
+import zipfile
 from pathlib import Path
 
 import lxml.etree
@@ -103,10 +104,21 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    def __init__(self, unpacked_dir, original_file, verbose=False, parts=None):
+        """
+        Args:
+            unpacked_dir: Unpacked document to validate
+            original_file: Original Office file, to tell new errors from old ones
+            verbose: If True, print passing checks too
+            parts: Optional part names (e.g. "word/document.xml") that changed
+                since original_file. Per-file checks then only look at these, and
+                package-wide reference checks run only if the package structure
+                may have changed. Default: validate everything.
+        """
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
+        self.parts = None if parts is None else set(parts)
 
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
@@ -120,15 +132,41 @@ class BaseSchemaValidator:
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        # Files the per-file checks look at
+        self.checked_files = [f for f in self.xml_files if self._in_scope(f)]
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
 
+    def _in_scope(self, xml_file):
+        """Whether a file or its relationships part is among the changed parts."""
+        if self.parts is None:
+            return True
+        part = xml_file.relative_to(self.unpacked_dir)
+        rels = part.parent / "_rels" / f"{part.name}.rels"
+        return part.as_posix() in self.parts or rels.as_posix() in self.parts
+
+    def package_changed(self):
+        """Return True if relationships, content types or the set of parts may
+        have changed, i.e. if package-wide reference checks are needed."""
+        if self.parts is None:
+            return True
+        if any(
+            part.endswith(".rels") or part == "[Content_Types].xml"
+            for part in self.parts
+        ):
+            return True
+        if any(not (self.unpacked_dir / part).exists() for part in self.parts):
+            return True
+        with zipfile.ZipFile(self.original_file) as zf:
+            return not self.parts <= set(zf.namelist())
+
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
         errors = []
 
-        for xml_file in self.xml_files:
+        for xml_file in self.checked_files:
             try:
                 # Try to parse the XML file
                 lxml.etree.parse(str(xml_file))
@@ -157,7 +195,7 @@ class BaseSchemaValidator:
         """Validate that namespace prefixes in Ignorable attributes are declared."""
         errors = []
 
-        for xml_file in self.xml_files:
+        for xml_file in self.checked_files:
             try:
                 root = lxml.etree.parse(str(xml_file)).getroot()
                 declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
@@ -395,7 +433,7 @@ class BaseSchemaValidator:
         errors = []
 
         # Process each XML file that might contain r:id references
-        for xml_file in self.xml_files:
+        for xml_file in self.checked_files:
             # Skip .rels files themselves
             if xml_file.suffix == ".rels":
                 continue
@@ -692,7 +730,7 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        for xml_file in self.checked_files:
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
             is_valid, new_file_errors = self.validate_file_against_xsd(
                 xml_file, verbose=False
@@ -719,7 +757,7 @@ class BaseSchemaValidator:
 
         # Print summary
         if self.verbose:
-            print(f"Validated {len(self.xml_files)} files:")
+            print(f"Validated {len(self.checked_files)} files:")
             print(f"  - Valid: {valid_count}")
             print(f"  - Skipped (no schema): {skipped_count}")
             if original_error_count:
@@ -44,8 +44,11 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         if not self.validate_uuid_ids():
             all_valid = False
 
+        # Tests 4 and 6 only matter if the package structure may have changed
+        package_changed = self.package_changed()
+
         # Test 4: Relationship and file reference validation
-        if not self.validate_file_references():
+        if package_changed and not self.validate_file_references():
             all_valid = False
 
         # Test 5: Slide layout ID validation
@@ -53,7 +56,7 @@ class PPTXSchemaValidator(BaseSchemaValidator):
             all_valid = False
 
         # Test 6: Content type declarations
-        if not self.validate_content_types():
+        if package_changed and not self.validate_content_types():
             all_valid = False
 
         # Test 7: XSD schema validation
@@ -84,7 +87,7 @@ class PPTXSchemaValidator(BaseSchemaValidator):
             r"^[\{\(]?[0-9A-Fa-f]{8}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{12}[\}\)]?$"
         )
 
-        for xml_file in self.xml_files:
+        for xml_file in self.checked_files:
             try:
                 root = lxml.etree.parse(str(xml_file)).getroot()
 
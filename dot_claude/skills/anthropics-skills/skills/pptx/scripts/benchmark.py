@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the pptx scripts.
+
+Example usage:
+    # Time overlap detection on synthetic slides with 2000 shapes
+    python scripts/benchmark.py overlaps --shapes 2000
+
+    # Time rearranging synthetic decks into 1000-slide sequences
+    python scripts/benchmark.py rearrange --slides 1000
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from inventory import calculate_overlap, detect_overlaps
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches
+from rearrange import rearrange_presentation
+
+SLIDE_WIDTH = 13.333  # Inches, 16:9
+SLIDE_HEIGHT = 7.5
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pptx scripts")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    overlaps = subparsers.add_parser(
+        "overlaps", help="Compare sweep-line and pairwise overlap detection"
+    )
+    overlaps.add_argument(
+        "--shapes", type=int, default=2000, help="Shapes per synthetic slide"
+    )
+    overlaps.add_argument("--seed", type=int, default=0, help="Random seed")
+
+    rearrange = subparsers.add_parser(
+        "rearrange", help="Time rearranging synthetic decks into long sequences"
+    )
+    rearrange.add_argument(
+        "--slides", type=int, default=1000, help="Slides in each sequence"
+    )
+    rearrange.add_argument("--seed", type=int, default=0, help="Random seed")
+
+    args = parser.parse_args()
+    if args.command == "overlaps":
+        benchmark_overlaps(args.shapes, args.seed)
+    elif args.command == "rearrange":
+        benchmark_rearrange(args.slides, args.seed)
+
+
+def benchmark_overlaps(shapes=2000, seed=0):
+    """Print the time to detect overlaps on synthetic slides.
+
+    Each layout is run through detect_overlaps and through the pairwise
+    comparison it replaced, and the results are checked to be identical.
+
+    Args:
+        shapes: Shapes per slide
+        seed: Random seed for the layouts
+
+    Returns:
+        dict: Layout name to {"sweep", "pairwise", "overlaps"}
+    """
+    rng = random.Random(seed)
+    results = {}
+    for layout, make_slide in SLIDE_LAYOUTS.items():
+        rects = make_slide(shapes, rng)
+        sweep_shapes = _shapes(rects)
+        start = time.perf_counter()
+        detect_overlaps(sweep_shapes)
+        sweep = time.perf_counter() - start
+
+        pairwise_shapes = _shapes(rects)
+        start = time.perf_counter()
+        _detect_overlaps_pairwise(pairwise_shapes)
+        pairwise = time.perf_counter() - start
+
+        # Compared as lists, since the order of the JSON output matters too
+        found = [list(s.overlapping_shapes.items()) for s in sweep_shapes]
+        if found != [list(s.overlapping_shapes.items()) for s in pairwise_shapes]:
+            raise AssertionError(f"Overlaps differ on the {layout} layout")
+        results[layout] = {
+            "sweep": sweep,
+            "pairwise": pairwise,
+            "overlaps": sum(len(o) for o in found) // 2,
+        }
+
+    print(f"{shapes} shapes per slide")
+    print(f"{'layout':<12}{'sweep (s)':>12}{'pairwise (s)':>14}{'overlaps':>10}")
+    for layout, result in results.items():
+        print(
+            f"{layout:<12}{result['sweep']:>12.3f}{result['pairwise']:>14.3f}"
+            f"{result['overlaps']:>10}"
+        )
+    return results
+
+
+def benchmark_rearrange(slides=1000, seed=0):
+    """Print the time to rearrange synthetic decks into sequences of slides.
+
+    Each sequence is run through rearrange_presentation, and every slide of
+    the output is checked to be the template slide the sequence asked for.
+
+    Args:
+        slides: Slides in each sequence
+        seed: Random seed for the sequences
+
+    Returns:
+        dict: Sequence name to {"template", "seconds", "size"}
+    """
+    rng = random.Random(seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name, (template_slides, make_sequence) in _sequences(slides).items():
+            template_path = Path(temp_dir) / f"{name}-template.pptx"
+            output_path = Path(temp_dir) / f"{name}.pptx"
+            _write_template(template_path, template_slides)
+            sequence = make_sequence(slides, template_slides, rng)
+
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                rearrange_presentation(template_path, output_path, sequence)
+            seconds = time.perf_counter() - start
+
+            titles = [
+                slide.shapes[0].text for slide in Presentation(output_path).slides
+            ]
+            if titles != [f"Slide {idx}" for idx in sequence]:
+                raise AssertionError(f"Slides out of sequence for {name}")
+            results[name] = {
+                "template": template_slides,
+                "seconds": seconds,
+                "size": output_path.stat().st_size,
+            }
+
+    print(f"{slides} slides per sequence")
+    print(f"{'sequence':<12}{'template':>10}{'time (s)':>10}{'size (KB)':>11}")
+    for name, result in results.items():
+        print(
+            f"{name:<12}{result['template']:>10}{result['seconds']:>10.3f}"
+            f"{result['size'] // 1024:>11}"
+        )
+    return results
+
+
+def _dashboard_slide(shapes, rng):
+    # Grid of tiles, each with a label overlapping its top edge
+    tiles = shapes // 2
+    columns = max(1, round((tiles * SLIDE_WIDTH / SLIDE_HEIGHT) ** 0.5))
+    rows = -(-tiles // columns)
+    width, height = SLIDE_WIDTH / columns, SLIDE_HEIGHT / rows
+    rects = []
+    for n in range(tiles):
+        left, top = (n % columns) * width, (n // columns) * height
+        rects.append((left + 0.02, top + 0.02, width * 0.96, height * 0.96))
+        rects.append((left + 0.1 * width, top, width * 0.8, height * 0.3))
+    return rects
+
+
+def _scattered_slide(shapes, rng):
+    # Small shapes at random positions, like a diagram or scatter of callouts
+    scale = (200 / max(shapes, 1)) ** 0.5
+    return [
+        (
+            rng.uniform(0, SLIDE_WIDTH),
+            rng.uniform(0, SLIDE_HEIGHT),
+            rng.uniform(0.2, 1.5) * scale,
+            rng.uniform(0.1, 0.6) * scale,
+        )
+        for _ in range(shapes)
+    ]
+
+
+def _table_slide(shapes, rng):
+    # Rows of cells spanning the slide, as a drawn table, on a background card
+    columns = max(8, round((shapes / 4) ** 0.5))
+    rows = max(1, (shapes - 1) // columns)
+    height = SLIDE_HEIGHT / rows
+    rects = [(0.0, 0.0, SLIDE_WIDTH, SLIDE_HEIGHT)]
+    for n in range(rows * columns):
+        left = (n % columns) * SLIDE_WIDTH / columns
+        rects.append((left, (n // columns) * height, SLIDE_WIDTH / columns, height))
+    return rects
+
+
+SLIDE_LAYOUTS = {
+    "dashboard": _dashboard_slide,
+    "scattered": _scattered_slide,
+    "table": _table_slide,
+}
+
+
+def _reordered_sequence(slides, template_slides, rng):
+    # Every template slide once, shuffled
+    sequence = list(range(template_slides))
+    rng.shuffle(sequence)
+    return sequence
+
+
+def _repeated_sequence(slides, template_slides, rng):
+    # Slides picked from a small template, most of them used many times
+    return [rng.randrange(template_slides) for _ in range(slides)]
+
+
+def _selected_sequence(slides, template_slides, rng):
+    # Half of a large template, in order, as when trimming a deck
+    return sorted(rng.sample(range(template_slides), slides))
+
+
+def _sequences(slides):
+    return {
+        "reordered": (slides, _reordered_sequence),
+        "repeated": (max(1, slides // 20), _repeated_sequence),
+        "selected": (slides * 2, _selected_sequence),
+    }
+
+
+def _write_template(path, slides):
+    # Template deck whose slides each have a title, a body and a few of a
+    # small set of pictures, so repeated pictures can be shared
+    pictures = []
+    for n in range(5):
+        data = io.BytesIO()
+        Image.new("RGB", (160, 90), (50 * n, 120, 200)).save(data, "PNG")
+        pictures.append(data.getvalue())
+    prs = Presentation()
+    blank = prs.slide_layouts[6]
+    for n in range(slides):
+        slide = prs.slides.add_slide(blank)
+        slide.shapes.add_textbox(
+            Inches(0.5), Inches(0.5), Inches(8), Inches(1)
+        ).text = f"Slide {n}"
+        slide.shapes.add_textbox(
+            Inches(0.5), Inches(2), Inches(8), Inches(3)
+        ).text = f"Body text of slide {n}"
+        for k in range(n % 3 + 1):
+            picture = io.BytesIO(pictures[(n + k) % len(pictures)])
+            slide.shapes.add_picture(picture, Inches(0.5 + 3 * k), Inches(5), Inches(2))
+    prs.save(path)
+
+
+def _shapes(rects):
+    return [
+        SimpleNamespace(
+            shape_id=f"shape-{n}",
+            left=left,
+            top=top,
+            width=width,
+            height=height,
+            overlapping_shapes={},
+        )
+        for n, (left, top, width, height) in enumerate(rects)
+    ]
+
+
+def _detect_overlaps_pairwise(shapes):
+    # The comparison of every pair that detect_overlaps replaced
+    for i, shape1 in enumerate(shapes):
+        for shape2 in shapes[i + 1 :]:
+            rect1 = (shape1.left, shape1.top, shape1.width, shape1.height)
+            rect2 = (shape2.left, shape2.top, shape2.width, shape2.height)
+            overlaps, overlap_area = calculate_overlap(rect1, rect2)
+            if overlaps:
+                shape1.overlapping_shapes[shape2.shape_id] = overlap_area
+                shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Font lookup for text measurement, backed by a persistent index of font files.
+
+Probing font directories for every paragraph costs thousands of stat/listdir
+calls on a large deck. Instead, the font directories are scanned once
+(recursively, reading every face of .ttc collections) into an index mapping
+family and style names to font files. The index is saved to disk and reused
+until the modification time of one of the scanned directories changes, i.e.
+until a font is installed or removed. Loaded fonts are cached by (file, face,
+size).
+
+Text is measured by FontMetrics, which caches each font's glyph advances and
+kerning pairs and sums them with NumPy, so wrapping a paragraph costs one pass
+over its characters instead of one Pillow layout per word.
+
+Example usage:
+    # Rebuild the index and list what it found
+    python fonts.py --rebuild
+
+    # Show which file a font name resolves to
+    python fonts.py "Calibri" --bold
+
+    # From Python
+    from fonts import find_font, load_font
+    path, face = find_font("Calibri", bold=True)
+    font = load_font("Calibri", 18)  # ImageFont, or Pillow's default font
+    lines = load_metrics("Calibri", 18).wrap("Some long text", 120)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import re
+import sys
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import ImageFont
+
+INDEX_ENV_VAR = "PPTX_FONT_INDEX"
+INDEX_VERSION = 1
+FONT_CACHE_SIZE = 128  # Loaded (file, face, size) fonts kept in memory
+
+if platform.system() == "Darwin":
+    FONT_DIRS = ["/System/Library/Fonts/", "/Library/Fonts/", "~/Library/Fonts/"]
+    FONT_EXTENSIONS = (".ttf", ".otf", ".ttc", ".dfont")
+else:
+    FONT_DIRS = [
+        "/usr/share/fonts/",
+        "/usr/local/share/fonts/",
+        "~/.fonts/",
+        "~/.local/share/fonts/",
+    ]
+    FONT_EXTENSIONS = (".ttf", ".otf", ".ttc")
+
+# Style names by (bold, italic)
+STYLES = {
+    (False, False): "regular",
+    (True, False): "bold",
+    (False, True): "italic",
+    (True, True): "bolditalic",
+}
+
+FontLocation = Tuple[str, int]  # Font file path and face index within it
+
+# Characters between which a line may break without a space (Chinese and
+# Japanese), and the punctuation a line may not start or end with around them
+CJK_CHARACTERS = re.compile(
+    "[\u2e80-\u2fff\u3000-\u30ff\u3100-\u312f\u31a0-\u31ff\u3400-\u4dbf"
+    "\u4e00-\u9fff\uf900-\ufaff\uff00-\uffef\U00020000-\U0003134f]"
+)
+NO_BREAK_BEFORE = set(
+    "、。，．：；？！）］｝〕〉》」』】〙〗〟’”ー・々〻‐゠〜～"
+    "ぁぃぅぇぉっゃゅょゎゕゖァィゥェォッャュョヮヵヶ)]},.:;?!"
+)
+NO_BREAK_AFTER = set("（［｛〔〈《「『【〘〖〝‘“([{")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Look up fonts in the font index")
+    parser.add_argument("name", nargs="?", help="Font name to look up")
+    parser.add_argument("--bold", action="store_true", help="Look up the bold face")
+    parser.add_argument("--italic", action="store_true", help="Look up the italic face")
+    parser.add_argument(
+        "--rebuild", action="store_true", help="Rescan the font directories first"
+    )
+    args = parser.parse_args()
+
+    index = font_index(rebuild=args.rebuild)
+    if args.name is None:
+        for family in index.families():
+            print(family)
+        print(f"{len(index.families())} families, index at {index.path}")
+        return
+
+    location = index.find(args.name, bold=args.bold, italic=args.italic)
+    if location is None:
+        print(f"No font found for {args.name}", file=sys.stderr)
+        sys.exit(1)
+    path, face = location
+    print(path if face == 0 else f"{path} (face {face})")
+
+
+def default_index_path() -> Path:
+    """Return where the index is saved ($PPTX_FONT_INDEX or the user cache)."""
+    if os.environ.get(INDEX_ENV_VAR):
+        return Path(os.environ[INDEX_ENV_VAR])
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "pptx-skill" / "font-index.json"
+
+
+class FontIndex:
+    """Mapping of normalized font names to font files, persisted as JSON.
+
+    Each face is indexed under its family name with its style (regular, bold,
+    italic, bolditalic), and under its full name, PostScript name and file
+    name, so "Arial", "Arial Bold", "Arial-BoldMT" and "arialbd" all resolve.
+    """
+
+    def __init__(self, path: Optional[Path] = None, font_dirs=None):
+        """
+        Initialize an empty index; call load() or build() to fill it.
+
+        Args:
+            path: Where the index is saved (default: default_index_path())
+            font_dirs: Directories to scan (default: the platform's font dirs)
+        """
+        self.path = Path(path) if path else default_index_path()
+        self.roots = [str(Path(d).expanduser()) for d in (font_dirs or FONT_DIRS)]
+        # Directory scanned -> mtime (ns) when it was scanned
+        self.directories: Dict[str, int] = {}
+        # "family|style" or name -> [path, face]
+        self.fonts: Dict[str, List] = {}
+        # Results of find(), as most decks ask for the same few fonts
+        self._found: Dict[Tuple[str, bool, bool], Optional[FontLocation]] = {}
+
+    def load(self) -> bool:
+        """Load the saved index if it is still current.
+
+        Returns:
+            bool: False if there is no saved index, or a font directory has
+                changed since it was built
+        """
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != INDEX_VERSION or data.get("roots") != self.roots:
+            return False
+        if _existing(self.roots) != data.get("existing"):
+            return False
+        for directory, mtime in data["directories"].items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        self.directories = data["directories"]
+        self.fonts = data["fonts"]
+        self._found = {}
+        return True
+
+    def build(self) -> None:
+        """Scan the font directories and save the index (best effort)."""
+        self.directories = {}
+        self.fonts = {}
+        self._found = {}
+        for root in _existing(self.roots):
+            for directory, _, files in os.walk(root):
+                try:
+                    self.directories[directory] = os.stat(directory).st_mtime_ns
+                except OSError:
+                    continue
+                for file in sorted(files):
+                    if file.lower().endswith(FONT_EXTENSIONS):
+                        self._add_file(os.path.join(directory, file))
+        self.save()
+
+    def save(self) -> None:
+        """Write the index to self.path; an unwritable location is ignored."""
+        data = {
+            "version": INDEX_VERSION,
+            "roots": self.roots,
+            "existing": _existing(self.roots),
+            "directories": self.directories,
+            "fonts": self.fonts,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Replace atomically, so concurrent readers never see a partial file
+            fd, temp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+
+    def find(
+        self, name: str, bold: bool = False, italic: bool = False
+    ) -> Optional[FontLocation]:
+        """Return the (path, face) of the font best matching a name and style.
+
+        Tries the family with the requested style, then names given with their
+        style (e.g. "Arial Black", "arialbd"), then the family's regular face,
+        and finally any family whose name contains the given one.
+        """
+        lookup = (name, bool(bold), bool(italic))
+        if lookup not in self._found:
+            self._found[lookup] = self._find(_normalize(name), STYLES[lookup[1:]])
+        return self._found[lookup]
+
+    def signature(self) -> str:
+        """Return a hash of the indexed fonts, which changes when they do."""
+        data = json.dumps(self.fonts, sort_keys=True).encode()
+        return hashlib.sha256(data).hexdigest()
+
+    def families(self) -> List[str]:
+        """Return the normalized family names in the index."""
+        return sorted({k.partition("|")[0] for k in self.fonts if "|" in k})
+
+    def _find(self, key: str, style: str) -> Optional[FontLocation]:
+        if not key:
+            return None
+        for candidate in (f"{key}|{style}", key, f"{key}|regular"):
+            if candidate in self.fonts:
+                path, face = self.fonts[candidate]
+                return path, face
+        # Shortest family first, so "dejavu" finds DejaVu Sans, not Sans Mono
+        candidates = sorted(self.fonts, key=lambda k: (len(k.partition("|")[0]), k))
+        for wanted in (style, "regular"):
+            for candidate in candidates:
+                family, _, candidate_style = candidate.partition("|")
+                if candidate_style == wanted and key in family:
+                    path, face = self.fonts[candidate]
+                    return path, face
+        return None
+
+    def _add_file(self, path: str) -> None:
+        for face in range(_face_count(path)):
+            try:
+                family, style = ImageFont.truetype(path, size=12, index=face).getname()
+            except Exception:
+                continue
+            family_key = _normalize(family or "")
+            style_name = (style or "").lower()
+            is_bold = "bold" in style_name or "black" in style_name
+            is_italic = "italic" in style_name or "oblique" in style_name
+            keys = [
+                f"{family_key}|{STYLES[(is_bold, is_italic)]}",
+                _normalize(f"{family} {style}"),
+                _normalize(Path(path).stem),
+            ]
+            for key in keys:
+                # First (sorted) file wins, so lookups are stable across builds
+                if key and key not in self.fonts:
+                    self.fonts[key] = [path, face]
+
+
+class FontMetrics:
+    """Text widths and line wrapping for one loaded font.
+
+    Pillow's basic layout places each glyph at the previous glyph's advance
+    plus their kerning, so the width of any text is the sum of its
+    characters' advances and its adjacent pairs' kerning. Both are measured
+    once per character and pair and cached, in 1/64 pixel units so the sums
+    are exact and match ImageDraw.textlength. Fonts using another layout
+    (e.g. Raqm, which shapes whole runs) are measured with Pillow directly.
+    """
+
+    def __init__(self, font):
+        """
+        Args:
+            font: An ImageFont, e.g. from load_font()
+        """
+        self.font = font
+        self.additive = getattr(font, "layout_engine", None) == ImageFont.Layout.BASIC
+        self._advances = _MeasuredTable(self._measure)
+        self._kerning = _MeasuredTable(self._measure_pair)
+
+    def width(self, text: str) -> float:
+        """Return the width of text in pixels, as ImageDraw.textlength would."""
+        if not self.additive or not text:
+            return self.font.getlength(text)
+        return float(self._layout(text)[0][-1]) / 64
+
+    def wrap(self, line: str, max_width: float) -> List[str]:
+        """Wrap a line of text to fit within max_width pixels.
+
+        Breaks at spaces, and between Chinese and Japanese characters. Each
+        line takes as many words as fit, and a word wider than max_width gets
+        a line of its own.
+        """
+        if not line:
+            return [""]
+        if self.additive:
+            offsets, kerning = self._layout(line)
+
+            def width(start, end):
+                # A line starting at `start` does not get the kerning before it
+                return (offsets[end] - offsets[start] - kerning[start]) / 64
+
+        else:
+
+            def width(start, end):
+                return self.font.getlength(line[start:end])
+
+        if width(0, len(line)) <= max_width:
+            return [line]
+
+        wrapped = []
+        start = end = 0  # The current line is line[start:end]
+        for word_start, word_end in _break_units(line):
+            if start == end:
+                start = word_start
+            elif width(start, word_end) > max_width:
+                wrapped.append(line[start:end])
+                start = word_start
+            end = word_end
+        if start != end:
+            wrapped.append(line[start:end])
+        return wrapped
+
+    def _layout(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the prefix widths and per-character kerning of text, in 1/64 px.
+
+        offsets[i] is the width of text[:i] and kerning[i] the kerning between
+        text[i - 1] and text[i] (zero for the first character and the end).
+        """
+        kerning = np.zeros(len(text) + 1, dtype=np.int64)
+        if len(text) > 1:
+            table = self._kerning
+            kerning[1 : len(text)] = np.fromiter(
+                (table[pair] for pair in zip(text, text[1:])),
+                dtype=np.int64,
+                count=len(text) - 1,
+            )
+        advances = self._advances
+        offsets = np.zeros(len(text) + 1, dtype=np.int64)
+        offsets[1:] = np.fromiter(
+            (advances[c] for c in text), dtype=np.int64, count=len(text)
+        )
+        offsets[1:] += kerning[:-1]
+        np.cumsum(offsets, out=offsets)
+        return offsets, kerning
+
+    def _measure(self, char: str) -> int:
+        return round(self.font.getlength(char) * 64)
+
+    def _measure_pair(self, pair: Tuple[str, str]) -> int:
+        first, second = pair
+        length = round(self.font.getlength(first + second) * 64)
+        return length - self._advances[first] - self._advances[second]
+
+
+class _MeasuredTable(dict):
+    """Dict that fills in missing keys by calling a measuring function."""
+
+    def __init__(self, measure):
+        super().__init__()
+        self.measure = measure
+
+    def __missing__(self, key):
+        value = self[key] = self.measure(key)
+        return value
+
+
+_index: Optional[FontIndex] = None
+
+
+def font_index(rebuild: bool = False) -> FontIndex:
+    """Return the process-wide font index, loading or building it on first use."""
+    global _index
+    if _index is None or rebuild:
+        index = FontIndex()
+        if rebuild or not index.load():
+            index.build()
+        _index = index
+    return _index
+
+
+def find_font(
+    name: str, bold: bool = False, italic: bool = False
+) -> Optional[FontLocation]:
+    """Return the (path, face) of an installed font, or None (see FontIndex.find)."""
+    return font_index().find(name, bold=bold, italic=italic)
+
+
+def load_font(name: str, size: int, bold: bool = False, italic: bool = False):
+    """Return an ImageFont for a font name and pixel size.
+
+    Falls back to Pillow's default font if the font is not installed or cannot
+    be loaded.
+    """
+    location = find_font(name, bold=bold, italic=italic)
+    if location is not None:
+        try:
+            return _truetype(location[0], location[1], int(size))
+        except OSError:
+            pass
+    return _default_font()
+
+
+def load_metrics(
+    name: str, size: int, bold: bool = False, italic: bool = False
+) -> FontMetrics:
+    """Return the FontMetrics for a font name and pixel size (see load_font)."""
+    return _metrics(load_font(name, size, bold=bold, italic=italic))
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def _metrics(font) -> FontMetrics:
+    return FontMetrics(font)
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def _truetype(path: str, face: int, size: int):
+    return ImageFont.truetype(path, size=size, index=face)
+
+
+@lru_cache(maxsize=1)
+def _default_font():
+    return ImageFont.load_default()
+
+
+def _normalize(name: str) -> str:
+    """Lowercase a font name and drop spaces, hyphens and underscores."""
+    return "".join(c for c in name.lower() if c not in " -_")
+
+
+def _break_units(line: str):
+    """Yield (start, end) of the pieces a line may be broken into.
+
+    These are the words between single spaces (possibly empty, where spaces
+    repeat), with words containing Chinese or Japanese characters further
+    split around each of those characters.
+    """
+    start = 0
+    for word in line.split(" "):
+        end = start + len(word)
+        if CJK_CHARACTERS.search(word):
+            piece_start = start
+            for i in range(start + 1, end):
+                before, after = line[i - 1], line[i]
+                if (
+                    (CJK_CHARACTERS.match(before) or CJK_CHARACTERS.match(after))
+                    and after not in NO_BREAK_BEFORE
+                    and before not in NO_BREAK_AFTER
+                ):
+                    yield piece_start, i
+                    piece_start = i
+            yield piece_start, end
+        else:
+            yield start, end
+        start = end + 1
+
+
+def _existing(roots: List[str]) -> List[str]:
+    return [root for root in roots if os.path.isdir(root)]
+
+
+def _face_count(path: str) -> int:
+    """Return the number of faces in a font file (more than one for a .ttc)."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(12)
+    except OSError:
+        return 0
+    if header[:4] == b"ttcf" and len(header) == 12:
+        return int.from_bytes(header[8:12], "big")
+    return 1
+
+
+if __name__ == "__main__":
+    main()
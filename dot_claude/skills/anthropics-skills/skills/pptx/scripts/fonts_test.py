@@ -0,0 +1,187 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from fonts import NO_BREAK_BEFORE, FontIndex, FontMetrics
+from PIL import Image, ImageDraw, ImageFont
+
+WORDS = "To AV Wave fly office typography, kerning: jumped over lazy dogs WAVE Ty."
+
+
+def wrap_with_textlength(line, max_width, draw, font):
+    """Wrap a line word by word with ImageDraw.textlength, as inventory.py did."""
+    if not line:
+        return [""]
+    if draw.textlength(line, font=font) <= max_width:
+        return [line]
+
+    wrapped = []
+    current_line = ""
+    for word in line.split(" "):
+        test_line = current_line + (" " if current_line else "") + word
+        if draw.textlength(test_line, font=font) <= max_width:
+            current_line = test_line
+        else:
+            if current_line:
+                wrapped.append(current_line)
+            current_line = word
+    if current_line:
+        wrapped.append(current_line)
+    return wrapped
+
+
+class TestFontIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        installed = FontIndex(self.root / "installed.json")
+        installed.build()
+        self.font_dir = self.root / "fonts" / "dejavu"
+        self.font_dir.mkdir(parents=True)
+        for bold in (False, True):
+            location = installed.find("DejaVu Sans", bold=bold)
+            if location is None:
+                self.skipTest("DejaVu Sans is not installed")
+            shutil.copy(location[0], self.font_dir)
+        self.index_path = self.root / "font-index.json"
+
+    def index(self):
+        return FontIndex(self.index_path, font_dirs=[self.root / "fonts"])
+
+    def test_find_by_family_style_and_file_name(self):
+        """Names with or without their style resolve to the matching face"""
+        index = self.index()
+        index.build()
+        regular = str(self.font_dir / "DejaVuSans.ttf")
+        bold = str(self.font_dir / "DejaVuSans-Bold.ttf")
+        for name, kwargs, expected in [
+            ("DejaVu Sans", {}, regular),
+            ("DejaVu Sans", {"bold": True}, bold),
+            # No italic face: the regular one
+            ("DejaVu Sans", {"italic": True}, regular),
+            ("DejaVu Sans Bold", {}, bold),
+            ("DejaVuSans-Bold", {}, bold),
+            ("dejavusans_bold", {}, bold),
+            ("dejavu", {}, regular),
+        ]:
+            with self.subTest(name=name, **kwargs):
+                self.assertEqual(index.find(name, **kwargs), (expected, 0))
+        self.assertIsNone(index.find("Calibri"))
+        self.assertIsNone(index.find(""))
+
+    def test_saved_index_is_reused_until_fonts_change(self):
+        index = self.index()
+        index.build()
+        self.assertTrue(self.index_path.exists())
+
+        reloaded = self.index()
+        self.assertTrue(reloaded.load())
+        self.assertEqual(reloaded.fonts, index.fonts)
+        self.assertEqual(reloaded.signature(), index.signature())
+
+        # Removing a font changes its directory's modification time
+        (self.font_dir / "DejaVuSans-Bold.ttf").unlink()
+        mtime = self.font_dir.stat().st_mtime + 1
+        os.utime(self.font_dir, (mtime, mtime))
+        stale = self.index()
+        self.assertFalse(stale.load())
+        stale.build()
+        self.assertNotEqual(stale.signature(), index.signature())
+        self.assertEqual(
+            stale.find("DejaVu Sans", bold=True),
+            (str(self.font_dir / "DejaVuSans.ttf"), 0),
+        )
+
+
+class TestFontMetrics(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # DejaVu Sans has kerning pairs, which Pillow's default font lacks
+        with tempfile.TemporaryDirectory() as temp_dir:
+            index = FontIndex(Path(temp_dir) / "font-index.json")
+            index.build()
+            cls.kerned_font = index.find("DejaVu Sans")
+
+    def setUp(self):
+        self.draw = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+        self.rng = random.Random(0)
+
+    def basic_fonts(self, size):
+        """Yield (name, font) for the fonts to measure, on Pillow's basic layout."""
+        yield "default", ImageFont.load_default(size=size).font_variant(
+            layout_engine=ImageFont.Layout.BASIC
+        )
+        if self.kerned_font is not None:
+            path, face = self.kerned_font
+            yield "DejaVu Sans", ImageFont.truetype(
+                path, size, index=face, layout_engine=ImageFont.Layout.BASIC
+            )
+
+    def random_line(self, separator=" "):
+        words = WORDS.split()
+        count = self.rng.randrange(1, 25)
+        return separator.join(self.rng.choice(words) for _ in range(count))
+
+    def test_width_matches_textlength(self):
+        """Widths are those Pillow lays out, kerning included"""
+        for size in (11, 24):
+            for name, font in self.basic_fonts(size):
+                with self.subTest(font=name, size=size):
+                    metrics = FontMetrics(font)
+                    self.assertTrue(metrics.additive)
+                    for line in [WORDS, "AV", "A", ""] + [
+                        self.random_line() for _ in range(50)
+                    ]:
+                        self.assertEqual(
+                            metrics.width(line), self.draw.textlength(line, font=font)
+                        )
+
+    def test_wrap_matches_textlength(self):
+        """Lines break where wrapping with textlength breaks them"""
+        for size in (11, 18, 31):
+            for name, font in self.basic_fonts(size):
+                with self.subTest(font=name, size=size):
+                    metrics = FontMetrics(font)
+                    for n in range(200):
+                        # Some lines with repeated spaces
+                        line = self.random_line("  " if n % 5 == 0 else " ")
+                        max_width = self.rng.uniform(20, 400)
+                        self.assertEqual(
+                            metrics.wrap(line, max_width),
+                            wrap_with_textlength(line, max_width, self.draw, font),
+                            f"{line!r} in {max_width}px",
+                        )
+
+    def test_wrap_without_basic_layout(self):
+        """Fonts that are not additive are wrapped with Pillow's own lengths"""
+        font = ImageFont.load_default_imagefont()
+        metrics = FontMetrics(font)
+        self.assertFalse(metrics.additive)
+        for _ in range(50):
+            line = self.random_line()
+            max_width = self.rng.uniform(20, 300)
+            self.assertEqual(
+                metrics.wrap(line, max_width),
+                wrap_with_textlength(line, max_width, self.draw, font),
+            )
+
+    def test_wrap_between_cjk_characters(self):
+        """Chinese text breaks between characters, not before closing punctuation"""
+        font = ImageFont.load_default(size=16)
+        metrics = FontMetrics(font)
+        line = "这是一个没有空格的中文句子，用于测试换行。然后继续写下去。"
+        wrapped = metrics.wrap(line, metrics.width(line) / 3)
+        self.assertGreater(len(wrapped), 2)
+        self.assertEqual("".join(wrapped), line)
+        for text in wrapped[1:]:
+            self.assertNotIn(text[0], NO_BREAK_BEFORE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,6 +16,8 @@ Classes:
 
 Main Functions:
     extract_text_inventory: Extract all text from a presentation
+    extract_slide_inventory: Extract all text from one slide
+    get_inventory_as_dict: Extract all text as JSON-ready dictionaries, in parallel
     save_inventory: Save extracted data to JSON
 
 Usage:
@@ -24,16 +26,20 @@ Usage:
 
 import argparse
 import json
-import platform
+import multiprocessing
 import sys
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-from PIL import Image, ImageDraw, ImageFont
+from fonts import find_font, font_index, load_metrics
 from pptx import Presentation
+from pptx.enum.dml import MSO_FILL
 from pptx.enum.text import PP_ALIGN
 from pptx.shapes.base import BaseShape
+from pptx.text.text import Font
+from slide_cache import SlideCache, SlideHasher
 
 # Type aliases for cleaner signatures
 JsonValue = Union[str, int, float, bool, None]
@@ -41,11 +47,14 @@ ParagraphDict = Dict[str, JsonValue]
 ShapeDict = Dict[
     str, Union[str, float, bool, List[ParagraphDict], List[str], Dict[str, Any], None]
 ]
-InventoryData = Dict[
-    str, Dict[str, "ShapeData"]
-]  # Dict of slide_id -> {shape_id -> ShapeData}
+SlideData = Dict[str, "ShapeData"]  # Dict of shape_id -> ShapeData
+InventoryData = Dict[str, SlideData]  # Dict of slide_id -> {shape_id -> ShapeData}
 InventoryDict = Dict[str, Dict[str, ShapeDict]]  # JSON-serializable inventory
 
+SLIDES_PER_TASK = 4  # Slides sent to a worker process at a time
+# Part of the inventory cache key; bump when text measurement changes
+MEASUREMENT_VERSION = "1"
+
 
 def main():
     """Main entry point for command-line usage."""
@@ -60,6 +69,9 @@ Examples:
   python inventory.py presentation.pptx inventory.json --issues-only
     Extracts only text shapes that have overflow or overlap issues
 
+  python inventory.py presentation.pptx inventory.json --processes 8
+    Splits the slides of a large deck across 8 worker processes
+
 The output JSON includes:
   - All text content organized by slide and shape
   - Correct absolute positions for shapes in groups
@@ -76,6 +88,16 @@ The output JSON includes:
         action="store_true",
         help="Include only text shapes that have overflow or overlap issues",
     )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        help="Worker processes for large decks (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Measure all text again instead of reusing cached slide results",
+    )
 
     args = parser.parse_args()
 
@@ -94,7 +116,12 @@ The output JSON includes:
             print(
                 "Filtering to include only text shapes with issues (overflow/overlap)"
             )
-        inventory = extract_text_inventory(input_path, issues_only=args.issues_only)
+        inventory = get_inventory_as_dict(
+            input_path,
+            issues_only=args.issues_only,
+            processes=args.processes,
+            use_cache=not args.no_cache,
+        )
 
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -158,31 +185,29 @@ class ParagraphData:
         self.theme_color: Optional[str] = None
         self.line_spacing: Optional[float] = None
 
+        # Read the XML without python-pptx's getters that add missing elements
+        # (pPr, rPr, solidFill), so extracting never modifies the presentation
+        pPr = paragraph._p.pPr if getattr(paragraph, "_p", None) is not None else None
+
         # Check for bullet formatting
-        if (
-            hasattr(paragraph, "_p")
-            and paragraph._p is not None
-            and paragraph._p.pPr is not None
-        ):
-            pPr = paragraph._p.pPr
+        if pPr is not None:
             ns = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
             if (
                 pPr.find(f"{ns}buChar") is not None
                 or pPr.find(f"{ns}buAutoNum") is not None
             ):
                 self.bullet = True
-                if hasattr(paragraph, "level"):
-                    self.level = paragraph.level
+                self.level = pPr.lvl
 
         # Add alignment if not LEFT (default)
-        if hasattr(paragraph, "alignment") and paragraph.alignment is not None:
+        if pPr is not None and pPr.algn is not None:
             alignment_map = {
                 PP_ALIGN.CENTER: "CENTER",
                 PP_ALIGN.RIGHT: "RIGHT",
                 PP_ALIGN.JUSTIFY: "JUSTIFY",
             }
-            if paragraph.alignment in alignment_map:
-                self.alignment = alignment_map[paragraph.alignment]
+            if pPr.algn in alignment_map:
+                self.alignment = alignment_map[pPr.algn]
 
         # Add spacing properties if set
         if hasattr(paragraph, "space_before") and paragraph.space_before:
@@ -190,32 +215,33 @@ class ParagraphData:
         if hasattr(paragraph, "space_after") and paragraph.space_after:
             self.space_after = paragraph.space_after.pt
 
-        # Extract font properties from first run
-        if paragraph.runs:
-            first_run = paragraph.runs[0]
-            if hasattr(first_run, "font"):
-                font = first_run.font
-                if font.name:
-                    self.font_name = font.name
-                if font.size:
-                    self.font_size = font.size.pt
-                if font.bold is not None:
-                    self.bold = font.bold
-                if font.italic is not None:
-                    self.italic = font.italic
-                if font.underline is not None:
-                    self.underline = font.underline
-
-                # Handle color - both RGB and theme colors
+        # Extract font properties from first run (a run without rPr has none)
+        rPr = paragraph.runs[0]._r.rPr if paragraph.runs else None
+        if rPr is not None:
+            font = Font(rPr)
+            if font.name:
+                self.font_name = font.name
+            if font.size:
+                self.font_size = font.size.pt
+            if font.bold is not None:
+                self.bold = font.bold
+            if font.italic is not None:
+                self.italic = font.italic
+            if font.underline is not None:
+                self.underline = font.underline
+
+            # Handle color - both RGB and theme colors (only solid fills have one)
+            if font.fill.type == MSO_FILL.SOLID:
+                color = font.fill.fore_color
                 try:
                     # Try RGB color first
-                    if font.color.rgb:
-                        self.color = str(font.color.rgb)
+                    if color.rgb:
+                        self.color = str(color.rgb)
                 except (AttributeError, TypeError):
                     # Fall back to theme color
                     try:
-                        if font.color.theme_color:
-                            self.theme_color = font.color.theme_color.name
+                        if color.theme_color:
+                            self.theme_color = color.theme_color.name
                     except (AttributeError, TypeError):
                         pass
 
@@ -228,6 +254,29 @@ class ParagraphData:
                 font_size = self.font_size if self.font_size else 12.0
                 self.line_spacing = round(paragraph.line_spacing * font_size, 2)
 
+    @classmethod
+    def from_dict(cls, data: ParagraphDict) -> "ParagraphData":
+        """Recreate paragraph data from the dictionary to_dict() returned."""
+        paragraph_data = cls.__new__(cls)
+        for name in (
+            "level",
+            "alignment",
+            "space_before",
+            "space_after",
+            "font_name",
+            "font_size",
+            "bold",
+            "italic",
+            "underline",
+            "color",
+            "theme_color",
+            "line_spacing",
+        ):
+            setattr(paragraph_data, name, data.get(name))
+        paragraph_data.text = data["text"]  # type: ignore
+        paragraph_data.bullet = bool(data.get("bullet", False))
+        return paragraph_data
+
     def to_dict(self) -> ParagraphDict:
         """Convert to dictionary for JSON serialization, excluding None values."""
         result: ParagraphDict = {"text": self.text}
@@ -286,61 +335,8 @@ class ShapeData:
         Returns:
             Path to the font file, or None if not found
         """
-        system = platform.system()
-
-        # Common font file variations to try
-        font_variations = [
-            font_name,
-            font_name.lower(),
-            font_name.replace(" ", ""),
-            font_name.replace(" ", "-"),
-        ]
-
-        # Define font directories and extensions by platform
-        if system == "Darwin":  # macOS
-            font_dirs = [
-                "/System/Library/Fonts/",
-                "/Library/Fonts/",
-                "~/Library/Fonts/",
-            ]
-            extensions = [".ttf", ".otf", ".ttc", ".dfont"]
-        else:  # Linux
-            font_dirs = [
-                "/usr/share/fonts/truetype/",
-                "/usr/local/share/fonts/",
-                "~/.fonts/",
-            ]
-            extensions = [".ttf", ".otf"]
-
-        # Try to find the font file
-        from pathlib import Path
-
-        for font_dir in font_dirs:
-            font_dir_path = Path(font_dir).expanduser()
-            if not font_dir_path.exists():
-                continue
-
-            # First try exact matches
-            for variant in font_variations:
-                for ext in extensions:
-                    font_path = font_dir_path / f"{variant}{ext}"
-                    if font_path.exists():
-                        return str(font_path)
-
-            # Then try fuzzy matching - find files containing the font name
-            try:
-                for file_path in font_dir_path.iterdir():
-                    if file_path.is_file():
-                        file_name_lower = file_path.name.lower()
-                        font_name_lower = font_name.lower().replace(" ", "")
-                        if font_name_lower in file_name_lower and any(
-                            file_name_lower.endswith(ext) for ext in extensions
-                        ):
-                            return str(file_path)
-            except (OSError, PermissionError):
-                continue
-
-        return None
+        location = find_font(font_name)
+        return location[0] if location else None
 
     @staticmethod
     def get_slide_dimensions(slide: Any) -> tuple[Optional[int], Optional[int]]:
@@ -391,6 +387,7 @@ class ShapeData:
         absolute_left: Optional[int] = None,
         absolute_top: Optional[int] = None,
         slide: Optional[Any] = None,
+        measurements: Optional[Dict[str, Any]] = None,
     ):
         """Initialize from a PowerPoint shape object.
 
@@ -399,6 +396,8 @@ class ShapeData:
             absolute_left: Absolute left position in EMUs (for shapes in groups)
             absolute_top: Absolute top position in EMUs (for shapes in groups)
             slide: Optional slide object to get dimensions and layout information
+            measurements: Optional result of measurements() for an identical
+                shape, used instead of reading and measuring the text again
         """
         self.shape = shape  # Store reference to original shape
         self.shape_id: str = ""  # Will be set after sorting
@@ -461,21 +460,36 @@ class ShapeData:
             str, float
         ] = {}  # Dict of shape_id -> overlap area in sq inches
         self.warnings: List[str] = []
-        self._estimate_frame_overflow()
+        self._paragraphs: Optional[List[ParagraphData]] = None
+        if measurements is None:
+            self._estimate_frame_overflow()
+            self._detect_bullet_issues()
+        else:
+            self.frame_overflow_bottom = measurements["frame_overflow_bottom"]
+            self.warnings = list(measurements["warnings"])
+            self._paragraphs = [
+                ParagraphData.from_dict(p) for p in measurements["paragraphs"]
+            ]
         self._calculate_slide_overflow()
-        self._detect_bullet_issues()
 
     @property
     def paragraphs(self) -> List[ParagraphData]:
-        """Calculate paragraphs from the shape's text frame."""
-        if not self.shape or not hasattr(self.shape, "text_frame"):
-            return []
-
-        paragraphs = []
-        for paragraph in self.shape.text_frame.paragraphs:  # type: ignore
-            if paragraph.text.strip():
-                paragraphs.append(ParagraphData(paragraph))
-        return paragraphs
+        """Paragraphs with text, read from the shape's text frame on first use."""
+        if self._paragraphs is None:
+            self._paragraphs = []
+            if self.shape and hasattr(self.shape, "text_frame"):
+                for paragraph in self.shape.text_frame.paragraphs:  # type: ignore
+                    if paragraph.text.strip():
+                        self._paragraphs.append(ParagraphData(paragraph))
+        return self._paragraphs
+
+    def measurements(self) -> Dict[str, Any]:
+        """Return the results of reading and measuring the text, for caching."""
+        return {
+            "frame_overflow_bottom": self.frame_overflow_bottom,
+            "warnings": self.warnings,
+            "paragraphs": [para.to_dict() for para in self.paragraphs],
+        }
 
     def _get_default_font_size(self) -> int:
         """Get default font size from theme text styles or use conservative default."""
@@ -531,34 +545,6 @@ class ShapeData:
             self.inches_to_pixels(usable_height),
         )
 
-    def _wrap_text_line(self, line: str, max_width_px: int, draw, font) -> List[str]:
-        """Wrap a single line of text to fit within max_width_px."""
-        if not line:
-            return [""]
-
-        # Use textlength for efficient width calculation
-        if draw.textlength(line, font=font) <= max_width_px:
-            return [line]
-
-        # Need to wrap - split into words
-        wrapped = []
-        words = line.split(" ")
-        current_line = ""
-
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            if draw.textlength(test_line, font=font) <= max_width_px:
-                current_line = test_line
-            else:
-                if current_line:
-                    wrapped.append(current_line)
-                current_line = word
-
-        if current_line:
-            wrapped.append(current_line)
-
-        return wrapped
-
     def _estimate_frame_overflow(self) -> None:
         """Estimate if text overflows the shape bounds using PIL text measurement."""
         if not self.shape or not hasattr(self.shape, "text_frame"):
@@ -573,40 +559,34 @@ class ShapeData:
         if usable_width_px <= 0 or usable_height_px <= 0:
             return
 
-        # Set up PIL for text measurement
-        dummy_img = Image.new("RGB", (1, 1))
-        draw = ImageDraw.Draw(dummy_img)
-
         # Get default font size from placeholder or use conservative estimate
         default_font_size = self._get_default_font_size()
 
         # Calculate total height of all paragraphs
         total_height_px = 0
 
+        paragraphs = iter(self.paragraphs)
         for para_idx, paragraph in enumerate(text_frame.paragraphs):
             if not paragraph.text.strip():
                 continue
 
-            para_data = ParagraphData(paragraph)
+            para_data = next(paragraphs)
 
             # Load font for this paragraph
             font_name = para_data.font_name or "Arial"
             font_size = int(para_data.font_size or default_font_size)
 
-            font = None
-            font_path = self.get_font_path(font_name)
-            if font_path:
-                try:
-                    font = ImageFont.truetype(font_path, size=font_size)
-                except Exception:
-                    font = ImageFont.load_default()
-            else:
-                font = ImageFont.load_default()
+            metrics = load_metrics(
+                font_name,
+                font_size,
+                bold=bool(para_data.bold),
+                italic=bool(para_data.italic),
+            )
 
             # Wrap all lines in this paragraph
             all_wrapped_lines = []
             for line in paragraph.text.split("\n"):
-                wrapped = self._wrap_text_line(line, usable_width_px, draw, font)
+                wrapped = metrics.wrap(line, usable_width_px)
                 all_wrapped_lines.extend(wrapped)
 
             if all_wrapped_lines:
@@ -879,40 +859,81 @@ def calculate_overlap(
     return False, 0
 
 
-def detect_overlaps(shapes: List[ShapeData]) -> None:
+def detect_overlaps(shapes: List[ShapeData], tolerance: float = 0.05) -> None:
     """Detect overlapping shapes and update their overlapping_shapes dictionaries.
 
     This function requires each ShapeData to have its shape_id already set.
     It modifies the shapes in-place, adding shape IDs with overlap areas in square inches.
 
+    Shapes are swept left to right, keeping the shapes whose right edge is
+    still more than the tolerance past the sweep line, so each shape is only
+    compared with those it overlaps horizontally (instead of every pair).
+
     Args:
         shapes: List of ShapeData objects with shape_id attributes set
+        tolerance: Minimum overlap in inches, as in calculate_overlap
     """
-    n = len(shapes)
+    for i, shape in enumerate(shapes):
+        # Ensure shape IDs are set
+        assert shape.shape_id, f"Shape at index {i} has no shape_id"
+
+    rects = [(s.left, s.top, s.width, s.height) for s in shapes]
+    rights = [left + width for left, _, width, _ in rects]
+    bottoms = [top + height for _, top, _, height in rects]
+
+    # (i, j) with i < j -> overlap area
+    overlaps: Dict[Tuple[int, int], float] = {}
+    active: List[int] = []
+    for i in sorted(range(len(shapes)), key=lambda k: rects[k][0]):
+        left, top = rects[i][0], rects[i][1]
+        # Shapes ending within the tolerance of this left edge cannot overlap
+        # this or any later shape by more than the tolerance
+        active = [k for k in active if rights[k] - left > tolerance]
+        for k in active:
+            if bottoms[k] - top > tolerance and bottoms[i] - rects[k][1] > tolerance:
+                pair = (min(i, k), max(i, k))
+                overlap, area = calculate_overlap(
+                    rects[pair[0]], rects[pair[1]], tolerance
+                )
+                if overlap:
+                    overlaps[pair] = area
+        active.append(i)
 
-    # Compare each pair of shapes
-    for i in range(n):
-        for j in range(i + 1, n):
-            shape1 = shapes[i]
-            shape2 = shapes[j]
+    # Record in pair order, so each shape lists the others in slide order
+    for i, j in sorted(overlaps):
+        shapes[i].overlapping_shapes[shapes[j].shape_id] = overlaps[i, j]
+        shapes[j].overlapping_shapes[shapes[i].shape_id] = overlaps[i, j]
 
-            # Ensure shape IDs are set
-            assert shape1.shape_id, f"Shape at index {i} has no shape_id"
-            assert shape2.shape_id, f"Shape at index {j} has no shape_id"
 
-            rect1 = (shape1.left, shape1.top, shape1.width, shape1.height)
-            rect2 = (shape2.left, shape2.top, shape2.width, shape2.height)
+class InventoryCache:
+    """Text measurements of slides, saved on disk and reused while unchanged.
 
-            overlaps, overlap_area = calculate_overlap(rect1, rect2)
+    Reading and measuring the text is most of the cost of an inventory, and
+    the same deck is usually inventoried several times (inventory.py, then
+    replace.py and thumbnail.py). Results are keyed by the content hash of the
+    slide with its layout and master, the installed fonts and
+    MEASUREMENT_VERSION, so an edited slide or a new font is measured again.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        """
+        Args:
+            root: Cache root directory (default: see slide_cache.default_cache_dir)
+        """
+        self.store = SlideCache("inventory", root)
+        self.hasher = SlideHasher()
+        self.fonts = font_index().signature()
 
-            if overlaps:
-                # Add shape IDs with overlap area in square inches
-                shape1.overlapping_shapes[shape2.shape_id] = overlap_area
-                shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+    def key(self, slide: Any) -> str:
+        """Return the cache key of a slide in its current state."""
+        return self.hasher.key(slide, MEASUREMENT_VERSION, self.fonts)
 
 
 def extract_text_inventory(
-    pptx_path: Path, prs: Optional[Any] = None, issues_only: bool = False
+    pptx_path: Path,
+    prs: Optional[Any] = None,
+    issues_only: bool = False,
+    use_cache: bool = True,
 ) -> InventoryData:
     """Extract text content from all slides in a PowerPoint presentation.
 
@@ -920,6 +941,8 @@ def extract_text_inventory(
         pptx_path: Path to the PowerPoint file
         prs: Optional Presentation object to use. If not provided, will load from pptx_path.
         issues_only: If True, only include shapes that have overflow or overlap issues
+        use_cache: If True, reuse the text measurements of slides inventoried
+            before (see InventoryCache)
 
     Returns a nested dictionary: {slide-N: {shape-N: ShapeData}}
     Shapes are sorted by visual position (top-to-bottom, left-to-right).
@@ -929,87 +952,172 @@ def extract_text_inventory(
     if prs is None:
         prs = Presentation(str(pptx_path))
     inventory: InventoryData = {}
+    cache = InventoryCache() if use_cache else None
 
     for slide_idx, slide in enumerate(prs.slides):
-        # Collect all valid shapes from this slide with absolute positions
-        shapes_with_positions = []
-        for shape in slide.shapes:  # type: ignore
-            shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
-
-        if not shapes_with_positions:
-            continue
-
-        # Convert to ShapeData with absolute positions and slide reference
-        shape_data_list = [
-            ShapeData(
-                swp.shape,
-                swp.absolute_left,
-                swp.absolute_top,
-                slide,
-            )
-            for swp in shapes_with_positions
-        ]
+        slide_inventory = extract_slide_inventory(slide, issues_only, cache)
+        if slide_inventory:
+            inventory[f"slide-{slide_idx}"] = slide_inventory
 
-        # Sort by visual position and assign stable IDs in one step
-        sorted_shapes = sort_shapes_by_position(shape_data_list)
-        for idx, shape_data in enumerate(sorted_shapes):
-            shape_data.shape_id = f"shape-{idx}"
+    return inventory
 
-        # Detect overlaps using the stable shape IDs
-        if len(sorted_shapes) > 1:
-            detect_overlaps(sorted_shapes)
 
-        # Filter for issues only if requested (after overlap detection)
-        if issues_only:
-            sorted_shapes = [sd for sd in sorted_shapes if sd.has_any_issues]
+def extract_slide_inventory(
+    slide: Any, issues_only: bool = False, cache: Optional["InventoryCache"] = None
+) -> SlideData:
+    """Extract the text shapes of one slide, keyed by their stable shape IDs.
 
-        if not sorted_shapes:
-            continue
+    Args:
+        slide: The python-pptx slide
+        issues_only: If True, only include shapes that have overflow or overlap issues
+        cache: Optional cache of text measurements to use and update
 
-        # Create slide inventory using the stable shape IDs
-        inventory[f"slide-{slide_idx}"] = {
-            shape_data.shape_id: shape_data for shape_data in sorted_shapes
-        }
+    Returns a dictionary {shape-N: ShapeData}, empty if the slide has no text
+    shapes (with issues). Shapes are sorted by visual position.
+    """
+    # Collect all valid shapes from this slide with absolute positions
+    shapes_with_positions = []
+    for shape in slide.shapes:  # type: ignore
+        shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
+
+    if not shapes_with_positions:
+        return {}
+
+    # Reuse the measurements of an identical slide (key taken before reading
+    # the text, which can add empty <a:solidFill/> elements)
+    key = cache.key(slide) if cache else None
+    measured = cache.store.get(key) if cache else None
+    if measured is not None and len(measured) != len(shapes_with_positions):
+        measured = None
+
+    # Convert to ShapeData with absolute positions and slide reference
+    shape_data_list = [
+        ShapeData(
+            swp.shape,
+            swp.absolute_left,
+            swp.absolute_top,
+            slide,
+            measured[idx] if measured else None,
+        )
+        for idx, swp in enumerate(shapes_with_positions)
+    ]
+    if cache and measured is None:
+        cache.store.put(key, [sd.measurements() for sd in shape_data_list])
 
-    return inventory
+    # Sort by visual position and assign stable IDs in one step
+    sorted_shapes = sort_shapes_by_position(shape_data_list)
+    for idx, shape_data in enumerate(sorted_shapes):
+        shape_data.shape_id = f"shape-{idx}"
+
+    # Detect overlaps using the stable shape IDs
+    if len(sorted_shapes) > 1:
+        detect_overlaps(sorted_shapes)
+
+    # Filter for issues only if requested (after overlap detection)
+    if issues_only:
+        sorted_shapes = [sd for sd in sorted_shapes if sd.has_any_issues]
 
+    return {shape_data.shape_id: shape_data for shape_data in sorted_shapes}
 
-def get_inventory_as_dict(pptx_path: Path, issues_only: bool = False) -> InventoryDict:
+
+def get_inventory_as_dict(
+    pptx_path: Path,
+    issues_only: bool = False,
+    processes: Optional[int] = None,
+    use_cache: bool = True,
+) -> InventoryDict:
     """Extract text inventory and return as JSON-serializable dictionaries.
 
     This is a convenience wrapper around extract_text_inventory that returns
     dictionaries instead of ShapeData objects, useful for testing and direct
     JSON serialization.
 
+    Slides are independent, so large decks are split across a pool of worker
+    processes, each with its own Presentation. The result is the same as
+    extracting them in order in this process.
+
     Args:
         pptx_path: Path to the PowerPoint file
         issues_only: If True, only include shapes that have overflow or overlap issues
+        processes: Worker processes to use (default: one per CPU; 1 to extract
+            in this process)
+        use_cache: If True, reuse the text measurements of slides inventoried
+            before (see InventoryCache)
 
     Returns:
         Nested dictionary with all data serialized for JSON
     """
-    inventory = extract_text_inventory(pptx_path, issues_only=issues_only)
-
-    # Convert ShapeData objects to dictionaries
+    prs = Presentation(str(pptx_path))
+    batches = [
+        range(start, min(start + SLIDES_PER_TASK, len(prs.slides)))
+        for start in range(0, len(prs.slides), SLIDES_PER_TASK)
+    ]
+    processes = min(processes or multiprocessing.cpu_count(), len(batches))
     dict_inventory: InventoryDict = {}
-    for slide_key, shapes in inventory.items():
-        dict_inventory[slide_key] = {
-            shape_key: shape_data.to_dict() for shape_key, shape_data in shapes.items()
-        }
+    if processes <= 1:
+        inventory = extract_text_inventory(
+            pptx_path, prs, issues_only=issues_only, use_cache=use_cache
+        )
 
+        # Convert ShapeData objects to dictionaries
+        for slide_key, shapes in inventory.items():
+            dict_inventory[slide_key] = {
+                shape_key: shape_data.to_dict()
+                for shape_key, shape_data in shapes.items()
+            }
+        return dict_inventory
+
+    extract = partial(_extract_slides, issues_only=issues_only)
+    with multiprocessing.Pool(
+        processes, initializer=_init_worker, initargs=(str(pptx_path), use_cache)
+    ) as pool:
+        # imap returns the batches in order, so slides stay in deck order
+        for batch in pool.imap(extract, batches):
+            dict_inventory.update(batch)
     return dict_inventory
 
 
-def save_inventory(inventory: InventoryData, output_path: Path) -> None:
+# Worker process's Presentation and InventoryCache
+_presentation: Optional[Any] = None
+_cache: Optional["InventoryCache"] = None
+
+
+def _init_worker(pptx_path: str, use_cache: bool) -> None:
+    global _presentation, _cache
+    _presentation = Presentation(pptx_path)
+    _cache = InventoryCache() if use_cache else None
+
+
+def _extract_slides(slide_indices: range, issues_only: bool) -> InventoryDict:
+    slides = _presentation.slides  # type: ignore
+    batch: InventoryDict = {}
+    for slide_idx in slide_indices:
+        slide_inventory = extract_slide_inventory(
+            slides[slide_idx], issues_only, _cache
+        )
+        if slide_inventory:
+            batch[f"slide-{slide_idx}"] = {
+                shape_key: shape_data.to_dict()
+                for shape_key, shape_data in slide_inventory.items()
+            }
+    return batch
+
+
+def save_inventory(
+    inventory: Union[InventoryData, InventoryDict], output_path: Path
+) -> None:
     """Save inventory to JSON file with proper formatting.
 
-    Converts ShapeData objects to dictionaries for JSON serialization.
+    Converts ShapeData objects to dictionaries for JSON serialization; an
+    inventory from get_inventory_as_dict is saved as is.
     """
-    # Convert ShapeData objects to dictionaries
     json_inventory: InventoryDict = {}
     for slide_key, shapes in inventory.items():
         json_inventory[slide_key] = {
-            shape_key: shape_data.to_dict() for shape_key, shape_data in shapes.items()
+            shape_key: shape_data.to_dict()
+            if isinstance(shape_data, ShapeData)
+            else shape_data
+            for shape_key, shape_data in shapes.items()
         }
 
     with open(output_path, "w", encoding="utf-8") as f:
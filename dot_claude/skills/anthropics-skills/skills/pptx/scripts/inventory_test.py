@@ -0,0 +1,184 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from inventory import (
+    SLIDES_PER_TASK,
+    calculate_overlap,
+    detect_overlaps,
+    extract_text_inventory,
+    get_inventory_as_dict,
+)
+from lxml import etree
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.enum.text import PP_ALIGN
+from pptx.util import Inches, Pt
+
+
+def shapes(rects):
+    return [
+        SimpleNamespace(
+            shape_id=f"shape-{n}",
+            left=left,
+            top=top,
+            width=width,
+            height=height,
+            overlapping_shapes={},
+        )
+        for n, (left, top, width, height) in enumerate(rects)
+    ]
+
+
+def write_deck(path, slides):
+    """Write a deck of text boxes, some overflowing and some overlapping.
+
+    Every fourth slide, starting with the first, has no issues.
+    """
+    prs = Presentation()
+    for n in range(slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        title = slide.shapes.add_textbox(
+            Inches(0.5), Inches(0.5), Inches(8), Inches(1)
+        )
+        title.text_frame.text = f"Slide {n}"
+        paragraph = title.text_frame.paragraphs[0]
+        paragraph.alignment = PP_ALIGN.CENTER
+        paragraph.runs[0].font.bold = True
+        paragraph.runs[0].font.color.rgb = RGBColor(0x20, 0x40, 0x80)
+
+        body = slide.shapes.add_textbox(
+            Inches(0.5), Inches(1.6 - n % 2 * 0.4), Inches(3 + n % 3), Inches(1)
+        )
+        body.text_frame.word_wrap = True
+        body.text_frame.text = " ".join(["Body text that wraps."] * (n % 4 * 6 + 1))
+        body.text_frame.paragraphs[0].runs[0].font.size = Pt(18)
+    prs.save(path)
+
+
+def detect_overlaps_pairwise(shapes):
+    """Compare every pair of shapes, as detect_overlaps did before the sweep."""
+    for i, shape1 in enumerate(shapes):
+        for shape2 in shapes[i + 1 :]:
+            rect1 = (shape1.left, shape1.top, shape1.width, shape1.height)
+            rect2 = (shape2.left, shape2.top, shape2.width, shape2.height)
+            overlaps, overlap_area = calculate_overlap(rect1, rect2)
+            if overlaps:
+                shape1.overlapping_shapes[shape2.shape_id] = overlap_area
+                shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+
+
+class TestDetectOverlaps(unittest.TestCase):
+
+    def assertSameAsPairwise(self, rects):
+        sweep, pairwise = shapes(rects), shapes(rects)
+        detect_overlaps(sweep)
+        detect_overlaps_pairwise(pairwise)
+        # Same overlaps, listed in the same order
+        self.assertEqual(
+            [list(s.overlapping_shapes.items()) for s in sweep],
+            [list(s.overlapping_shapes.items()) for s in pairwise],
+        )
+
+    def test_random_layouts(self):
+        """The sweep finds the overlaps of comparing every pair"""
+        rng = random.Random(0)
+        for size in (1.5, 4.0):
+            with self.subTest(size=size):
+                rects = [
+                    (
+                        rng.uniform(0, 10),
+                        rng.uniform(0, 7.5),
+                        rng.uniform(0.1, size),
+                        rng.uniform(0.1, size),
+                    )
+                    for _ in range(200)
+                ]
+                self.assertSameAsPairwise(rects)
+
+    def test_edges_near_tolerance(self):
+        """Shapes touching or overlapping by about the tolerance"""
+        rects = [
+            (0.0, 0.0, 1.0, 1.0),
+            (1.0, 0.0, 1.0, 1.0),  # Touching on the right
+            (0.95, 0.0, 1.0, 1.0),  # Overlapping by exactly the tolerance
+            (0.94, 0.5, 1.0, 1.0),  # Just over the tolerance both ways
+            (0.0, 0.96, 1.0, 1.0),  # Just under the tolerance vertically
+            (0.0, 0.0, 10.0, 10.0),  # Background containing every shape
+            (0.5, 0.5, 0.0, 0.0),  # Empty shape
+        ]
+        self.assertSameAsPairwise(rects)
+
+    def test_nested_and_identical_shapes(self):
+        """Identical shapes, and shapes inside or crossing them"""
+        rects = [(1.0, 1.0, 2.0, 2.0)] * 3
+        rects += [(1.5, 1.5, 0.5, 0.5), (0.0, 2.0, 5.0, 0.2)]
+        self.assertSameAsPairwise(rects)
+
+
+class TestParallelInventory(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.deck = Path(self.temp_dir.name) / "deck.pptx"
+        write_deck(self.deck, SLIDES_PER_TASK * 3 + 1)
+
+    def test_parallel_matches_serial(self):
+        """Worker processes return the inventory of one process, in slide order"""
+        for issues_only in (False, True):
+            with self.subTest(issues_only=issues_only):
+                serial = get_inventory_as_dict(
+                    self.deck, issues_only, processes=1, use_cache=False
+                )
+                parallel = get_inventory_as_dict(
+                    self.deck, issues_only, processes=3, use_cache=False
+                )
+                self.assertTrue(serial)
+                self.assertEqual(issues_only, "slide-0" not in serial)
+                self.assertEqual(parallel, serial)
+                self.assertEqual(list(parallel), list(serial))
+
+
+
+class TestReadOnlyInventory(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.deck = Path(self.temp_dir.name) / "deck.pptx"
+        write_deck(self.deck, 2)
+
+    def test_extraction_leaves_slides_unchanged(self):
+        """Reading paragraphs adds no pPr, rPr or solidFill elements"""
+        prs = Presentation(self.deck)
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        # Runs without rPr, in paragraphs without pPr
+        slide.shapes.title.text_frame.text = "Plain title"
+        body = slide.placeholders[1].text_frame
+        body.text = "Plain body"
+        run = body.add_paragraph().add_run()
+        run.text = "Gradient run"
+        run.font.fill.gradient()
+
+        parts = [slide.part for slide in prs.slides]
+        parts += [slide.slide_layout.part for slide in prs.slides]
+        before = [etree.tostring(part._element) for part in parts]
+        inventory = extract_text_inventory(self.deck, prs, use_cache=False)
+        self.assertEqual([etree.tostring(part._element) for part in parts], before)
+
+        paragraphs = [
+            paragraph.to_dict()
+            for shape in inventory["slide-2"].values()
+            for paragraph in shape.paragraphs
+        ]
+        self.assertEqual(
+            paragraphs,
+            [{"text": "Plain title"}, {"text": "Plain body"}, {"text": "Gradient run"}],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
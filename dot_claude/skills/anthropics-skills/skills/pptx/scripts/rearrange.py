@@ -12,11 +12,19 @@ Slides can be repeated (e.g., 34 appears twice).
 import argparse
 import shutil
 import sys
+from collections import Counter
 from copy import deepcopy
 from pathlib import Path
 
-import six
 from pptx import Presentation
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.parts.slide import SlidePart
+
+# Relationships a copied slide shares with its source, besides external links:
+# its layout, pictures and media (the parts themselves are not copied)
+SHARED_RELATIONSHIPS = {RT.SLIDE_LAYOUT, RT.IMAGE, RT.MEDIA, RT.VIDEO, RT.AUDIO}
 
 
 def main():
@@ -73,83 +81,53 @@ Note: Slide indices are 0-based (first slide is 0, second is 1, etc.)
 
 
 def duplicate_slide(pres, index):
-    """Duplicate a slide in the presentation."""
-    source = pres.slides[index]
-
-    # Use source's layout to preserve formatting
-    new_slide = pres.slides.add_slide(source.slide_layout)
-
-    # Collect all image and media relationships from the source slide
-    image_rels = {}
-    for rel_id, rel in six.iteritems(source.part.rels):
-        if "image" in rel.reltype or "media" in rel.reltype:
-            image_rels[rel_id] = rel
-
-    # CRITICAL: Clear placeholder shapes to avoid duplicates
-    for shape in new_slide.shapes:
-        sp = shape.element
-        sp.getparent().remove(sp)
-
-    # Copy all shapes from source
-    for shape in source.shapes:
-        el = shape.element
-        new_el = deepcopy(el)
-        new_slide.shapes._spTree.insert_element_before(new_el, "p:extLst")
-
-        # Handle picture shapes - need to update the blip reference
-        # Look for all blip elements (they can be in pic or other contexts)
-        # Using the element's own xpath method without namespaces argument
-        blips = new_el.xpath(".//a:blip[@r:embed]")
-        for blip in blips:
-            old_rId = blip.get(
-                "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
-            )
-            if old_rId in image_rels:
-                # Create a new relationship in the destination slide for this image
-                old_rel = image_rels[old_rId]
-                # get_or_add returns the rId directly, or adds and returns new rId
-                new_rId = new_slide.part.rels.get_or_add(
-                    old_rel.reltype, old_rel._target
-                )
-                # Update the blip's embed reference to use the new relationship ID
-                blip.set(
-                    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed",
-                    new_rId,
-                )
-
-    # Copy any additional image/media relationships that might be referenced elsewhere
-    for rel_id, rel in image_rels.items():
-        try:
-            new_slide.part.rels.get_or_add(rel.reltype, rel._target)
-        except Exception:
-            pass  # Relationship might already exist
-
-    return new_slide
-
-
-def delete_slide(pres, index):
-    """Delete a slide from the presentation."""
-    rId = pres.slides._sldIdLst[index].rId
-    pres.part.drop_rel(rId)
-    del pres.slides._sldIdLst[index]
-
-
-def reorder_slides(pres, slide_index, target_index):
-    """Move a slide from one position to another."""
-    slides = pres.slides._sldIdLst
-
-    # Remove slide element from current position
-    slide_element = slides[slide_index]
-    slides.remove(slide_element)
-
-    # Insert at target position
-    slides.insert(target_index, slide_element)
+    """Duplicate a slide in the presentation, adding the copy at the end."""
+    slide_part = copy_slide_part(pres, pres.slides[index], len(pres.slides) + 1)
+    rId = pres.part.relate_to(slide_part, RT.SLIDE)
+    pres.slides._sldIdLst.add_sldId(rId)
+    return slide_part.slide
+
+
+def copy_slide_part(pres, source, number):
+    """Return a new slide part holding a copy of a slide.
+
+    The copy gets all of the slide's XML (shapes, background, transitions) and
+    shares its layout, picture, media and external link relationships under the
+    same rIds, so pictures and media are stored once and the copied XML needs no
+    rewriting. Other related parts, such as notes and charts, are not copied.
+
+    Args:
+        pres: Presentation to add the part to (it still has to be related)
+        source: Slide to copy
+        number: Number in the new partname, unique among the slide parts;
+            rearrange_presentation renumbers all slide parts before saving
+
+    Note:
+        This and rearrange_presentation use python-pptx private API
+        (_Relationships._rels, _Relationships._add_relationship and
+        CT_SlideIdList._add_sldId), checked against python-pptx 1.0.x; the
+        skill pins python-pptx to >=1.0,<2 for that reason.
+    """
+    partname = PackURI(f"/ppt/slides/slide{number}.xml")
+    slide_part = SlidePart(
+        partname, CT.PML_SLIDE, pres.part.package, deepcopy(source.element)
+    )
+    for rId, rel in source.part.rels.items():
+        if rel.is_external or rel.reltype in SHARED_RELATIONSHIPS:
+            # Relationships are immutable, so the copy uses the same objects
+            slide_part.rels._rels[rId] = rel
+    return slide_part
 
 
 def rearrange_presentation(template_path, output_path, slide_sequence):
     """
     Create a new presentation with slides from template in specified order.
 
+    The final sequence is planned in one pass: the first use of a template
+    slide is the slide itself and every later use a copy of it (see
+    copy_slide_part). The slide list is then rebuilt once, in order, and
+    unused slides are dropped.
+
     Args:
         template_path: Path to template PPTX file
         output_path: Path for output PPTX file
@@ -169,57 +147,48 @@ def rearrange_presentation(template_path, output_path, slide_sequence):
         if idx < 0 or idx >= total_slides:
             raise ValueError(f"Slide index {idx} out of range (0-{total_slides - 1})")
 
-    # Track original slides and their duplicates
-    slide_map = []  # List of actual slide indices for final presentation
-    duplicated = {}  # Track duplicates: original_idx -> [duplicate_indices]
+    slide_list = prs.slides._sldIdLst
+    template_slides = list(prs.slides)
+    template_ids = list(slide_list)
+    next_id = max(sldId.id for sldId in template_ids) + 1
 
-    # Step 1: DUPLICATE repeated slides
+    # Rebuild the slide list in sequence order, adding copies of repeated slides
     print(f"Processing {len(slide_sequence)} slides from template...")
+    for sldId in template_ids:
+        slide_list.remove(sldId)
+    used = set()
     for i, template_idx in enumerate(slide_sequence):
-        if template_idx in duplicated and duplicated[template_idx]:
-            # Already duplicated this slide, use the duplicate
-            slide_map.append(duplicated[template_idx].pop(0))
-            print(f"  [{i}] Using duplicate of slide {template_idx}")
-        elif slide_sequence.count(template_idx) > 1 and template_idx not in duplicated:
-            # First occurrence of a repeated slide - create duplicates
-            slide_map.append(template_idx)
-            duplicates = []
-            count = slide_sequence.count(template_idx) - 1
-            print(
-                f"  [{i}] Using original slide {template_idx}, creating {count} duplicate(s)"
-            )
-            for _ in range(count):
-                duplicate_slide(prs, template_idx)
-                duplicates.append(len(prs.slides) - 1)
-            duplicated[template_idx] = duplicates
-        else:
-            # Unique slide or first occurrence already handled, use original
-            slide_map.append(template_idx)
+        if template_idx not in used:
+            used.add(template_idx)
+            slide_list.append(template_ids[template_idx])
             print(f"  [{i}] Using original slide {template_idx}")
+            continue
+
+        slide_part = copy_slide_part(
+            prs, template_slides[template_idx], total_slides + len(slide_list) + 1
+        )
+        # A new part cannot be related yet, so skip relate_to's search of
+        # every existing relationship for a match
+        rId = prs.part.rels._add_relationship(RT.SLIDE, slide_part)
+        slide_list._add_sldId(id=next_id, rId=rId)
+        next_id += 1
+        print(f"  [{i}] Using duplicate of slide {template_idx}")
+
+    # Drop unused slides, which are no longer in the slide list, unless still
+    # referenced elsewhere (as drop_rel does, but counting references once)
+    unused = [sldId for idx, sldId in enumerate(template_ids) if idx not in used]
+    print(f"\nDeleting {len(unused)} unused slides...")
+    references = Counter(prs.part._element.xpath("//@r:id"))
+    kept = []
+    for sldId in unused:
+        if references[sldId.rId] < 2:
+            prs.part.rels.pop(sldId.rId)
+        else:
+            kept.append(sldId.rId)
 
-    # Step 2: DELETE unwanted slides (work backwards)
-    slides_to_keep = set(slide_map)
-    print(f"\nDeleting {len(prs.slides) - len(slides_to_keep)} unused slides...")
-    for i in range(len(prs.slides) - 1, -1, -1):
-        if i not in slides_to_keep:
-            delete_slide(prs, i)
-            # Update slide_map indices after deletion
-            slide_map = [idx - 1 if idx > i else idx for idx in slide_map]
-
-    # Step 3: REORDER to final sequence
-    print(f"Reordering {len(slide_map)} slides to final sequence...")
-    for target_pos in range(len(slide_map)):
-        # Find which slide should be at target_pos
-        current_pos = slide_map[target_pos]
-        if current_pos != target_pos:
-            reorder_slides(prs, current_pos, target_pos)
-            # Update slide_map: the move shifts other slides
-            for i in range(len(slide_map)):
-                if slide_map[i] > current_pos and slide_map[i] <= target_pos:
-                    slide_map[i] -= 1
-                elif slide_map[i] < current_pos and slide_map[i] >= target_pos:
-                    slide_map[i] += 1
-            slide_map[target_pos] = target_pos
+    # Number slide parts in presentation order (slide1.xml, slide2.xml, ...),
+    # after them any unused slide still referenced, so no partnames collide
+    prs.part.rename_slide_parts([sldId.rId for sldId in slide_list] + kept)
 
     # Save the presentation
     prs.save(output_path)
@@ -0,0 +1,77 @@
+import contextlib
+import io
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches
+
+from rearrange import rearrange_presentation
+
+
+def write_template(path, slides):
+    """Write a deck whose slides have a title and share one picture."""
+    picture = io.BytesIO()
+    Image.new("RGB", (16, 9), (40, 120, 200)).save(picture, "PNG")
+    prs = Presentation()
+    for n in range(slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        slide.shapes.add_textbox(Inches(1), Inches(1), Inches(6), Inches(1)).text = (
+            f"Slide {n}"
+        )
+        picture.seek(0)
+        slide.shapes.add_picture(picture, Inches(1), Inches(3), Inches(2))
+    prs.save(path)
+
+
+class TestRearrangePresentation(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.template = Path(self.temp_dir.name) / "template.pptx"
+        self.output = Path(self.temp_dir.name) / "output.pptx"
+        write_template(self.template, 6)
+
+    def rearrange(self, sequence):
+        with contextlib.redirect_stdout(io.StringIO()):
+            rearrange_presentation(self.template, self.output, sequence)
+        return Presentation(self.output)
+
+    def test_repeated_slides(self):
+        """Repeated slides are copies with their own content and shared pictures"""
+        sequence = [3, 1, 3, 3, 0, 1]
+        prs = self.rearrange(sequence)
+        self.assertEqual(
+            [slide.shapes[0].text for slide in prs.slides],
+            [f"Slide {n}" for n in sequence],
+        )
+
+        # Editing one copy leaves the others untouched
+        prs.slides[2].shapes[0].text = "Edited"
+        self.assertEqual(prs.slides[0].shapes[0].text, "Slide 3")
+        self.assertEqual(prs.slides[3].shapes[0].text, "Slide 3")
+
+        with zipfile.ZipFile(self.output) as zf:
+            names = zf.namelist()
+        slides = sorted(n for n in names if n.startswith("ppt/slides/slide"))
+        self.assertEqual(
+            slides, [f"ppt/slides/slide{n}.xml" for n in range(1, len(sequence) + 1)]
+        )
+        self.assertEqual(len([n for n in names if n.startswith("ppt/media/")]), 1)
+
+    def test_unused_slides_are_dropped(self):
+        prs = self.rearrange([5, 0])
+        self.assertEqual(
+            [slide.shapes[0].text for slide in prs.slides], ["Slide 5", "Slide 0"]
+        )
+        with zipfile.ZipFile(self.output) as zf:
+            slides = [n for n in zf.namelist() if n.startswith("ppt/slides/slide")]
+        self.assertEqual(len(slides), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,231 @@
+"""
+Per-slide results cached on disk, keyed by a hash of the slide's content.
+
+A slide's content hash covers the slide XML and the XML of its layout and
+master, which supply inherited placeholder positions and text styles, so any
+edit to the slide or what it inherits gives a new key. Render keys also cover
+the parts these use, such as pictures, media, charts and the theme. Results
+are stored as one JSON file (or, e.g. for images, one file) per key in a cache
+directory, shared between decks, runs and the scripts using them (e.g.
+inventory.py measures text and thumbnail.py renders only the slides it has
+not seen before).
+
+The cache directory is $PPTX_CACHE_DIR, or pptx-skill under the user cache
+directory ($XDG_CACHE_HOME or ~/.cache). Each kind of result is capped at
+$PPTX_CACHE_MAX_MB (default 200) megabytes: reads refresh an entry's
+modification time, and the least recently used entries are deleted once the
+cap is exceeded. Deleting the directory is always safe.
+
+Example usage:
+    from slide_cache import SlideCache, SlideHasher
+
+    cache = SlideCache("inventory")
+    hasher = SlideHasher()
+    for slide in prs.slides:
+        key = hasher.key(slide, "v1")
+        result = cache.get(key)
+        if result is None:
+            result = compute(slide)
+            cache.put(key, result)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+CACHE_ENV_VAR = "PPTX_CACHE_DIR"
+CACHE_MAX_ENV_VAR = "PPTX_CACHE_MAX_MB"
+DEFAULT_CACHE_MAX_MB = 200
+
+# Relationships not followed to find what a slide renders from: key() covers
+# the layout and master, and notes or links to other slides do not show
+UNRENDERED_RELATIONSHIPS = {
+    RT.NOTES_SLIDE,
+    RT.SLIDE,
+    RT.SLIDE_LAYOUT,
+    RT.SLIDE_MASTER,
+}
+
+
+def default_cache_dir() -> Path:
+    """Return the root cache directory ($PPTX_CACHE_DIR or the user cache)."""
+    if os.environ.get(CACHE_ENV_VAR):
+        return Path(os.environ[CACHE_ENV_VAR])
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "pptx-skill"
+
+
+def default_max_bytes() -> int:
+    """Return the size cap of each cache subdirectory ($PPTX_CACHE_MAX_MB)."""
+    try:
+        megabytes = float(os.environ.get(CACHE_MAX_ENV_VAR, DEFAULT_CACHE_MAX_MB))
+    except ValueError:
+        megabytes = DEFAULT_CACHE_MAX_MB
+    return int(megabytes * 2**20)
+
+
+class SlideHasher:
+    """Content hashes of slides, reusing the hash of each shared layout/master.
+
+    Use one hasher per pass over a presentation; it assumes parts other than
+    slides (layouts, masters, pictures, ...) do not change while it is in use.
+    """
+
+    def __init__(self):
+        # Part name -> hash of the part's XML
+        self._part_hashes: Dict[str, str] = {}
+
+    def key(self, slide: Any, *extra: str) -> str:
+        """Return the content hash of a slide, its layout and master.
+
+        Args:
+            slide: A python-pptx slide (its current, possibly edited, XML is used)
+            extra: Strings also hashed, e.g. a format version of the result
+        """
+        layout = slide.slide_layout
+        digest = hashlib.sha256(slide.part.blob)
+        for part in (layout.part, layout.slide_master.part):
+            digest.update(self._part_hash(part).encode())
+        for value in extra:
+            digest.update(b"\0" + value.encode())
+        return digest.hexdigest()
+
+    def render_key(self, slide: Any, *extra: str) -> str:
+        """Return the content hash of a slide and everything it renders from.
+
+        Besides what key() covers, this includes the parts the slide, layout
+        and master use, such as pictures, media, charts and the theme.
+
+        Args:
+            slide: A python-pptx slide (its current, possibly edited, XML is used)
+            extra: Strings also hashed, e.g. a format version of the result
+        """
+        dependencies = [self._part_hash(p) for p in self._dependencies(slide)]
+        return self.key(slide, *dependencies, *extra)
+
+    def _dependencies(self, slide: Any) -> List[Any]:
+        # Parts reachable from the slide, layout and master, in partname order
+        layout = slide.slide_layout
+        found: Dict[str, Any] = {}
+        pending = [slide.part, layout.part, layout.slide_master.part]
+        while pending:
+            for rel in pending.pop().rels.values():
+                if rel.is_external or rel.reltype in UNRENDERED_RELATIONSHIPS:
+                    continue
+                name = str(rel.target_part.partname)
+                if name not in found:
+                    found[name] = rel.target_part
+                    pending.append(rel.target_part)
+        return [found[name] for name in sorted(found)]
+
+    def _part_hash(self, part: Any) -> str:
+        name = str(part.partname)
+        if name not in self._part_hashes:
+            self._part_hashes[name] = hashlib.sha256(part.blob).hexdigest()
+        return self._part_hashes[name]
+
+
+class SlideCache:
+    """JSON results stored under content keys in a cache subdirectory."""
+
+    def __init__(
+        self, name: str, root: Optional[Path] = None, max_bytes: Optional[int] = None
+    ):
+        """
+        Args:
+            name: Subdirectory for this kind of result (e.g. "inventory")
+            root: Cache root (default: default_cache_dir())
+            max_bytes: Size cap of the subdirectory (default: default_max_bytes())
+        """
+        self.path = Path(root or default_cache_dir()) / name
+        self.max_bytes = default_max_bytes() if max_bytes is None else max_bytes
+        # Bytes written since the last prune; None until the first write
+        self._unpruned_bytes: Optional[int] = None
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the result stored under key, or None."""
+        path = self.path / f"{key}.json"
+        try:
+            value = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        self._touch(path)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable result; an unwritable cache is ignored."""
+        self._write(f"{key}.json", json.dumps(value).encode())
+
+    def get_file(self, key: str, suffix: str) -> Optional[Path]:
+        """Return the path of the file stored under key, or None.
+
+        Args:
+            key: Cache key
+            suffix: Suffix of the stored file (e.g. ".jpg")
+        """
+        path = self.path / f"{key}{suffix}"
+        if not path.is_file():
+            return None
+        self._touch(path)
+        return path
+
+    def put_file(self, key: str, source: Path) -> None:
+        """Store a copy of a file (e.g. an image); an unwritable cache is ignored."""
+        try:
+            data = Path(source).read_bytes()
+        except OSError:
+            return
+        self._write(f"{key}{Path(source).suffix}", data)
+
+    def _write(self, filename: str, data: bytes) -> None:
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            # Replace atomically, so concurrent readers never see a partial file
+            fd, temp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, self.path / filename)
+        except OSError:
+            return
+
+        # Prune on the first write, then after every tenth of the cap written
+        if self._unpruned_bytes is not None:
+            self._unpruned_bytes += len(data)
+        if self._unpruned_bytes is None or self._unpruned_bytes > self.max_bytes // 10:
+            self.prune()
+
+    def prune(self) -> None:
+        """Delete the least recently used entries until the cache fits max_bytes."""
+        self._unpruned_bytes = 0
+        entries = []
+        try:
+            with os.scandir(self.path) as it:
+                for entry in it:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        # Mark an entry as recently used, so prune() keeps it
+        try:
+            os.utime(path)
+        except OSError:
+            pass
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from slide_cache import SlideCache
+
+
+class TestSlideCachePruning(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+
+    def age(self, cache, filename, seconds_ago):
+        path = cache.path / filename
+        past = path.stat().st_mtime - seconds_ago
+        os.utime(path, (past, past))
+
+    def test_least_recently_used_entries_are_pruned(self):
+        """Once over the cap, the least recently used entries are deleted"""
+        cache = SlideCache("inventory", self.root, max_bytes=2000)
+        for key in ("a", "b", "c"):
+            cache.put(key, "x" * 500)
+        self.age(cache, "a.json", 300)
+        self.age(cache, "b.json", 200)
+        self.age(cache, "c.json", 100)
+        # Reading an entry makes it recently used
+        self.assertEqual(cache.get("a"), "x" * 500)
+
+        cache.put("d", "x" * 1000)
+        cache.prune()
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("d"))
+        total = sum(f.stat().st_size for f in cache.path.iterdir())
+        self.assertLessEqual(total, 2000)
+
+    def test_first_write_prunes_previous_runs(self):
+        """A new cache instance trims what earlier runs left behind"""
+        earlier = SlideCache("thumbnails", self.root, max_bytes=10**6)
+        for key in range(10):
+            earlier.put(str(key), "x" * 500)
+
+        SlideCache("thumbnails", self.root, max_bytes=2000).put("new", "x")
+        total = sum(f.stat().st_size for f in earlier.path.iterdir())
+        self.assertLessEqual(total, 2000)
+        self.assertIsNotNone(earlier.get("new"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -41,18 +41,27 @@ Examples:
 """
 
 import argparse
+import os
 import subprocess
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import chain, islice
 from pathlib import Path
 
+from fonts import font_index
 from inventory import extract_text_inventory
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
+from slide_cache import SlideCache, SlideHasher
+from soffice_pool import SofficePoolError, convert, pool_available
 
 # Constants
 THUMBNAIL_WIDTH = 300  # Fixed thumbnail width in pixels
-CONVERSION_DPI = 100  # DPI for PDF to image conversion
+CONVERSION_DPI = 100  # DPI the placeholder outline width is designed for
+PAGES_PER_TASK = 4  # PDF pages rendered by each pdftoppm run
+RENDER_VERSION = "1"  # Bump when slides are rendered differently, to drop cached images
 MAX_COLS = 6  # Maximum number of columns
 DEFAULT_COLS = 5  # Default number of columns
 JPEG_QUALITY = 95  # JPEG compression quality
@@ -86,6 +95,16 @@ def main():
         action="store_true",
         help="Outline text placeholders with a colored border",
     )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        help="Parallel pdftoppm processes for rendering (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Render all slides again instead of reusing cached slide images",
+    )
 
     args = parser.parse_args()
 
@@ -118,13 +137,19 @@ def main():
                 if placeholder_regions:
                     print(f"Found placeholders on {len(placeholder_regions)} slides")
 
-            # Convert slides to images
-            slide_images = convert_to_images(input_path, Path(temp_dir), CONVERSION_DPI)
-            if not slide_images:
+            # Convert slides to images, rendered while the grids are built
+            slide_count, slide_images = convert_to_images(
+                input_path,
+                Path(temp_dir),
+                THUMBNAIL_WIDTH,
+                args.processes,
+                use_cache=not args.no_cache,
+            )
+            if not slide_count:
                 print("Error: No slides found")
                 sys.exit(1)
 
-            print(f"Found {len(slide_images)} slides")
+            print(f"Found {slide_count} slides")
 
             # Create grids (max cols×(cols+1) images per grid)
             grid_files = create_grids(
@@ -134,6 +159,7 @@ def main():
                 output_path,
                 placeholder_regions,
                 slide_dimensions,
+                slide_count,
             )
 
             # Print saved files
@@ -150,7 +176,7 @@ def create_hidden_slide_placeholder(size):
     """Create placeholder image for hidden slides."""
     img = Image.new("RGB", size, color="#F0F0F0")
     draw = ImageDraw.Draw(img)
-    line_width = max(5, min(size) // 100)
+    line_width = max(1, min(size) // 100)
     draw.line([(0, 0), size], fill="#CCCCCC", width=line_width)
     draw.line([(size[0], 0), (0, size[1])], fill="#CCCCCC", width=line_width)
     return img
@@ -194,8 +220,57 @@ def get_placeholder_regions(pptx_path):
     return placeholder_regions, (slide_width_inches, slide_height_inches)
 
 
-def convert_to_images(pptx_path, temp_dir, dpi):
-    """Convert PowerPoint to images via PDF, handling hidden slides."""
+class ThumbnailCache:
+    """Rendered slide images, saved on disk and reused while unchanged.
+
+    When a deck is edited and thumbnailed again, most slides are as they were.
+    Images are keyed by the content hash of the slide with everything it
+    renders from (layout, master, pictures, media, theme), the slide size,
+    the installed fonts, the image width and RENDER_VERSION.
+    """
+
+    def __init__(self, prs, width, root=None):
+        """
+        Args:
+            prs: The Presentation the slides belong to
+            width: Width of the slide images in pixels
+            root: Cache root directory (default: see slide_cache.default_cache_dir)
+        """
+        self.store = SlideCache("thumbnails", root)
+        self.hasher = SlideHasher()
+        self.extra = (
+            RENDER_VERSION,
+            str(width),
+            f"{prs.slide_width}x{prs.slide_height}",
+            font_index().signature(),
+        )
+
+    def key(self, slide, slide_num):
+        """Return the cache key of a slide at the given (1-based) position."""
+        # Slide number fields show the slide's position, so moving it changes it
+        if slide.element.xpath(".//a:fld[@type='slidenum']"):
+            return self.hasher.render_key(slide, *self.extra, f"#{slide_num}")
+        return self.hasher.render_key(slide, *self.extra)
+
+
+def convert_to_images(pptx_path, temp_dir, width, processes=None, use_cache=True):
+    """Convert PowerPoint to images via PDF, handling hidden slides.
+
+    Pages are rendered straight at the thumbnail width, in ranges split across
+    parallel pdftoppm processes. With use_cache, only slides that changed since
+    they were last rendered are converted (see ThumbnailCache).
+
+    Args:
+        pptx_path: Path to the PowerPoint file
+        temp_dir: Directory for the PDF and the slide images
+        width: Width of the slide images in pixels
+        processes: pdftoppm processes to run at once (default: one per CPU)
+        use_cache: If True, reuse the images of slides rendered before
+
+    Returns:
+        Tuple of (slide_count, images), where images iterates over the image
+        paths in slide order, yielding each as soon as its range is rendered
+    """
     # Detect hidden slides
     print("Analyzing presentation...")
     prs = Presentation(str(pptx_path))
@@ -212,63 +287,151 @@ def convert_to_images(pptx_path, temp_dir, dpi):
     if hidden_slides:
         print(f"Hidden slides: {sorted(hidden_slides)}")
 
+    # Look up the visible slides rendered before
+    cache = ThumbnailCache(prs, width) if use_cache else None
+    keys = {}
+    cached = {}
+    for slide_num, slide in enumerate(prs.slides, 1):
+        if cache and slide_num not in hidden_slides:
+            keys[slide_num] = cache.key(slide, slide_num)
+            image_path = cache.store.get_file(keys[slide_num], ".jpg")
+            if image_path:
+                cached[slide_num] = image_path
+    changed_count = total_slides - len(hidden_slides) - len(cached)
+    if cached:
+        print(f"Reusing {len(cached)} cached slide images")
+
+    pages = iter(())
+    if changed_count:
+        if cached:
+            # Hide the unchanged slides, which the PDF export leaves out, so
+            # only changed slides are rendered (with their own slide numbers)
+            for slide_num, slide in enumerate(prs.slides, 1):
+                if slide_num in cached:
+                    slide.element.set("show", "0")
+            pptx_path = temp_dir / "changed" / pptx_path.name
+            pptx_path.parent.mkdir()
+            prs.save(str(pptx_path))
+        pdf_path = convert_to_pdf(pptx_path, temp_dir)
+
+        print(f"Converting {changed_count} slide(s) to images {width} pixels wide...")
+        pages = render_pages(pdf_path, temp_dir, width, changed_count, processes)
+
+    # Placeholders for hidden slides get the slide's aspect ratio
+    slide_width = prs.slide_width or 9144000
+    slide_height = prs.slide_height or 5143500
+    placeholder_size = (width, round(width * slide_height / slide_width))
+
+    return total_slides, _slide_images(
+        pages,
+        total_slides,
+        hidden_slides,
+        cached,
+        keys,
+        cache,
+        temp_dir,
+        placeholder_size,
+    )
+
+
+def convert_to_pdf(pptx_path, temp_dir):
+    """Convert PowerPoint to PDF in temp_dir and return the PDF's path."""
     pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
 
-    # Convert to PDF
+    # Convert to PDF, using a warm soffice instance when the pool service is running
     print("Converting to PDF...")
-    result = subprocess.run(
-        [
-            "soffice",
-            "--headless",
-            "--convert-to",
-            "pdf",
-            "--outdir",
-            str(temp_dir),
-            str(pptx_path),
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0 or not pdf_path.exists():
+    if pool_available():
+        try:
+            convert(pptx_path, "pdf", temp_dir, timeout=120)
+        except SofficePoolError as e:
+            raise RuntimeError(f"PDF conversion failed: {e}")
+    else:
+        result = subprocess.run(
+            [
+                "soffice",
+                "--headless",
+                "--convert-to",
+                "pdf",
+                "--outdir",
+                str(temp_dir),
+                str(pptx_path),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError("PDF conversion failed")
+    if not pdf_path.exists():
         raise RuntimeError("PDF conversion failed")
+    return pdf_path
 
-    # Convert PDF to images
-    print(f"Converting to images at {dpi} DPI...")
+
+def render_pages(pdf_path, temp_dir, width, page_count, processes=None):
+    """Render PDF pages to JPEGs of the given width, in parallel page ranges.
+
+    Yields the image paths in page order, each range as soon as it and the
+    ranges before it are rendered.
+    """
+    ranges = [
+        range(first, min(first + PAGES_PER_TASK, page_count + 1))
+        for first in range(1, page_count + 1, PAGES_PER_TASK)
+    ]
+    processes = max(1, min(processes or os.cpu_count() or 1, len(ranges)))
+    render = partial(_render_page_range, pdf_path, temp_dir, width)
+    with ThreadPoolExecutor(processes) as executor:
+        # map returns the ranges in order, so pages stay in deck order
+        for images in executor.map(render, ranges):
+            yield from images
+
+
+def _render_page_range(pdf_path, temp_dir, width, pages):
+    # Each range gets its own prefix, as pdftoppm pads page numbers to the
+    # page count of the whole document
+    prefix = f"slide-{pages.start}"
     result = subprocess.run(
-        ["pdftoppm", "-jpeg", "-r", str(dpi), str(pdf_path), str(temp_dir / "slide")],
+        [
+            "pdftoppm",
+            "-jpeg",
+            "-f",
+            str(pages.start),
+            "-l",
+            str(pages.stop - 1),
+            "-scale-to-x",
+            str(width),
+            "-scale-to-y",
+            "-1",
+            str(pdf_path),
+            str(temp_dir / prefix),
+        ],
         capture_output=True,
         text=True,
     )
     if result.returncode != 0:
         raise RuntimeError("Image conversion failed")
+    return sorted(temp_dir.glob(f"{prefix}-*.jpg"))
 
-    visible_images = sorted(temp_dir.glob("slide-*.jpg"))
-
-    # Create full list with placeholders for hidden slides
-    all_images = []
-    visible_idx = 0
-
-    # Get placeholder dimensions from first visible slide
-    if visible_images:
-        with Image.open(visible_images[0]) as img:
-            placeholder_size = img.size
-    else:
-        placeholder_size = (1920, 1080)
 
+def _slide_images(
+    pages, total_slides, hidden_slides, cached, keys, cache, temp_dir, size
+):
+    # Yield the cached images and rendered pages in slide order, with a
+    # placeholder image in place of each hidden slide
     for slide_num in range(1, total_slides + 1):
         if slide_num in hidden_slides:
             # Create placeholder image for hidden slide
             placeholder_path = temp_dir / f"hidden-{slide_num:03d}.jpg"
-            placeholder_img = create_hidden_slide_placeholder(placeholder_size)
+            placeholder_img = create_hidden_slide_placeholder(size)
             placeholder_img.save(placeholder_path, "JPEG")
-            all_images.append(placeholder_path)
+            yield placeholder_path
+        elif slide_num in cached:
+            yield cached[slide_num]
         else:
             # Use the actual visible slide image
-            if visible_idx < len(visible_images):
-                all_images.append(visible_images[visible_idx])
-                visible_idx += 1
-
-    return all_images
+            image_path = next(pages, None)
+            if image_path is not None:
+                if cache:
+                    cache.store.put_file(keys[slide_num], image_path)
+                yield image_path
 
 
 def create_grids(
@@ -278,30 +441,42 @@ def create_grids(
     output_path,
     placeholder_regions=None,
     slide_dimensions=None,
+    image_count=None,
 ):
-    """Create multiple thumbnail grids from slide images, max cols×(cols+1) images per grid."""
+    """Create multiple thumbnail grids from slide images, max cols×(cols+1) images per grid.
+
+    image_paths may be an iterator (e.g. from convert_to_images), in which case
+    image_count must be given; each image is placed as soon as it is yielded.
+    """
     # Maximum images per grid is cols × (cols + 1) for better proportions
     max_images_per_grid = cols * (cols + 1)
     grid_files = []
+    if image_count is None:
+        image_count = len(image_paths)
+    images = iter(image_paths)
 
     print(
         f"Creating grids with {cols} columns (max {max_images_per_grid} images per grid)"
     )
 
     # Split images into chunks
-    for chunk_idx, start_idx in enumerate(
-        range(0, len(image_paths), max_images_per_grid)
-    ):
-        end_idx = min(start_idx + max_images_per_grid, len(image_paths))
-        chunk_images = image_paths[start_idx:end_idx]
+    for chunk_idx, start_idx in enumerate(range(0, image_count, max_images_per_grid)):
+        end_idx = min(start_idx + max_images_per_grid, image_count)
+        chunk_images = islice(images, end_idx - start_idx)
 
         # Create grid for this chunk
         grid = create_grid(
-            chunk_images, cols, width, start_idx, placeholder_regions, slide_dimensions
+            chunk_images,
+            cols,
+            width,
+            start_idx,
+            placeholder_regions,
+            slide_dimensions,
+            end_idx - start_idx,
         )
 
         # Generate output filename
-        if len(image_paths) <= max_images_per_grid:
+        if image_count <= max_images_per_grid:
             # Single grid - use base filename without suffix
             grid_filename = output_path
         else:
@@ -314,6 +489,8 @@ def create_grids(
         grid_filename.parent.mkdir(parents=True, exist_ok=True)
         grid.save(str(grid_filename), quality=JPEG_QUALITY)
         grid_files.append(str(grid_filename))
+        # Free the canvas before the next grid's is allocated
+        grid.close()
 
     return grid_files
 
@@ -325,18 +502,26 @@ def create_grid(
     start_slide_num=0,
     placeholder_regions=None,
     slide_dimensions=None,
+    image_count=None,
 ):
-    """Create thumbnail grid from slide images with optional placeholder outlining."""
+    """Create thumbnail grid from slide images with optional placeholder outlining.
+
+    image_paths may be an iterator, in which case image_count must be given.
+    """
     font_size = int(width * FONT_SIZE_RATIO)
     label_padding = int(font_size * LABEL_PADDING_RATIO)
+    if image_count is None:
+        image_count = len(image_paths)
+    images = iter(image_paths)
 
     # Get dimensions
-    with Image.open(image_paths[0]) as img:
+    first_image = next(images)
+    with Image.open(first_image) as img:
         aspect = img.height / img.width
     height = int(width * aspect)
 
     # Calculate grid size
-    rows = (len(image_paths) + cols - 1) // cols
+    rows = (image_count + cols - 1) // cols
     grid_w = cols * width + (cols + 1) * GRID_PADDING
     grid_h = rows * (height + font_size + label_padding * 2) + (rows + 1) * GRID_PADDING
 
@@ -353,7 +538,7 @@ def create_grid(
         font = ImageFont.load_default()
 
     # Place thumbnails
-    for i, img_path in enumerate(image_paths):
+    for i, img_path in enumerate(chain([first_image], images)):
         row, col = i // cols, i % cols
         x = col * width + (col + 1) * GRID_PADDING
         y_base = (
@@ -378,6 +563,13 @@ def create_grid(
             # Get original dimensions before thumbnail
             orig_w, orig_h = img.size
 
+            # Decode JPEGs at the smallest scale still covering the thumbnail
+            # (DCT scaling), and shrink to size before drawing, so only
+            # thumbnail-sized images are ever held in memory
+            img.draft("RGB", (width, height))
+            img.thumbnail((width, height), Image.Resampling.LANCZOS)
+            w, h = img.size
+
             # Apply placeholder outlines if enabled
             if placeholder_regions and (start_slide_num + i) in placeholder_regions:
                 # Convert to RGBA for transparency support
@@ -395,8 +587,16 @@ def create_grid(
                     slide_width_inches = orig_w / CONVERSION_DPI
                     slide_height_inches = orig_h / CONVERSION_DPI
 
-                x_scale = orig_w / slide_width_inches
-                y_scale = orig_h / slide_height_inches
+                x_scale = w / slide_width_inches
+                y_scale = h / slide_height_inches
+
+                # Thick proportional stroke, as wide as one drawn at
+                # CONVERSION_DPI and scaled down to this image
+                dpi_size = min(slide_width_inches, slide_height_inches) * CONVERSION_DPI
+                dpi_stroke_width = max(5, int(dpi_size) // 150)
+                stroke_width = max(
+                    1, round(dpi_stroke_width * x_scale / CONVERSION_DPI)
+                )
 
                 # Create a highlight overlay
                 overlay = Image.new("RGBA", img.size, (255, 255, 255, 0))
@@ -404,7 +604,7 @@ def create_grid(
 
                 # Highlight each placeholder region
                 for region in regions:
-                    # Convert from inches to pixels in the original image
+                    # Convert from inches to pixels in the thumbnail
                     px_left = int(region["left"] * x_scale)
                     px_top = int(region["top"] * y_scale)
                     px_width = int(region["width"] * x_scale)
@@ -412,9 +612,6 @@ def create_grid(
 
                     # Draw highlight outline with red color and thick stroke
                     # Using a bright red outline instead of fill
-                    stroke_width = max(
-                        5, min(orig_w, orig_h) // 150
-                    )  # Thicker proportional stroke width
                     overlay_draw.rectangle(
                         [(px_left, px_top), (px_left + px_width, px_top + px_height)],
                         outline=(255, 0, 0, 255),  # Bright red, fully opaque
@@ -426,8 +623,6 @@ def create_grid(
                 # Convert back to RGB for JPEG saving
                 img = img.convert("RGB")
 
-            img.thumbnail((width, height), Image.Resampling.LANCZOS)
-            w, h = img.size
             tx = x + (width - w) // 2
             ty = y_thumbnail + (height - h) // 2
             grid.paste(img, (tx, ty))
@@ -0,0 +1,196 @@
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from lxml import etree
+from PIL import Image, ImageChops, ImageDraw, ImageStat
+from pptx import Presentation
+from pptx.oxml.ns import qn
+from pptx.util import Inches
+
+from thumbnail import (
+    GRID_PADDING,
+    ThumbnailCache,
+    _slide_images,
+    create_grid,
+    create_grids,
+)
+
+
+def write_images(directory, count, size=(300, 169)):
+    """Write count JPEGs of distinct colors and return their paths."""
+    paths = []
+    for n in range(count):
+        path = directory / f"slide-{n + 1}.jpg"
+        Image.new("RGB", size, (n * 20 % 256, 100, 200)).save(path, "JPEG")
+        paths.append(path)
+    return paths
+
+
+class TestCreateGrids(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.output = self.root / "grids" / "thumbnails.jpg"
+
+    def create_grids(self, images, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return create_grids(images, 3, 300, self.output, **kwargs)
+
+    def test_iterator_grids_are_saved_as_images_arrive(self):
+        """Each grid is written before the next grid's images are requested"""
+        paths = write_images(self.root, 14)
+        saved_before = []
+
+        def images():
+            for path in paths:
+                saved_before.append(len(list(self.output.parent.glob("*.jpg"))))
+                yield path
+
+        grid_files = self.create_grids(images(), image_count=len(paths))
+        self.assertEqual(
+            grid_files,
+            [str(self.output.parent / f"thumbnails-{n}.jpg") for n in (1, 2)],
+        )
+        # 3 columns hold 12 images per grid
+        self.assertEqual(saved_before, [0] * 12 + [1] * 2)
+
+    def test_iterator_matches_list(self):
+        """Grids from an iterator are identical to grids from a list"""
+        paths = write_images(self.root, 5)
+        (list_grid,) = self.create_grids(paths)
+        expected = Path(list_grid).read_bytes()
+        (iterator_grid,) = self.create_grids(iter(paths), image_count=len(paths))
+        self.assertEqual(Path(iterator_grid).read_bytes(), expected)
+        with Image.open(iterator_grid) as grid:
+            # 3 columns of 300 px images, with padding around them
+            self.assertEqual(grid.width, 3 * 300 + 4 * 20)
+
+
+
+class TestThumbnailCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.deck = self.root / "deck.pptx"
+        prs = Presentation()
+        for n in range(3):
+            slide = prs.slides.add_slide(prs.slide_layouts[6])
+            box = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(6), Inches(1))
+            box.text_frame.text = "Same text"
+        # The last slide shows its slide number
+        paragraph = box.text_frame.paragraphs[0]._p
+        etree.SubElement(paragraph, qn("a:fld"), type="slidenum")
+        prs.save(self.deck)
+
+    def keys(self, prs, width=300):
+        cache = ThumbnailCache(prs, width, self.root / "cache")
+        return [cache.key(slide, n) for n, slide in enumerate(prs.slides, 1)]
+
+    def test_keys_follow_slide_content(self):
+        """Only edited slides, and moved slides showing their number, get new keys"""
+        prs = Presentation(self.deck)
+        keys = self.keys(prs)
+        # Identical slides share images; reloading the deck changes nothing
+        self.assertEqual(keys[0], keys[1])
+        self.assertEqual(self.keys(Presentation(self.deck)), keys)
+        self.assertNotEqual(self.keys(prs, width=400), keys)
+
+        prs.slides[1].shapes[0].text_frame.text = "Edited"
+        edited = self.keys(prs)
+        self.assertEqual(edited[0], keys[0])
+        self.assertNotEqual(edited[1], keys[1])
+
+        # Moving a slide with a slide number field renders it differently
+        cache = ThumbnailCache(prs, 300, self.root / "cache")
+        self.assertEqual(cache.key(prs.slides[0], 1), cache.key(prs.slides[0], 3))
+        self.assertNotEqual(cache.key(prs.slides[2], 3), cache.key(prs.slides[2], 1))
+
+    def test_slide_images_in_slide_order(self):
+        """Hidden, cached and rendered slides are interleaved in deck order"""
+        cache = ThumbnailCache(Presentation(self.deck), 300, self.root / "cache")
+        paths = write_images(self.root, 4)
+        rendered = iter(paths[:3])
+        cached = {4: paths[3]}
+        keys = {n: f"key-{n}" for n in (1, 3, 4, 6)}
+
+        images = list(
+            _slide_images(
+                rendered, 6, {2, 5}, cached, keys, cache, self.root, (300, 169)
+            )
+        )
+        self.assertEqual(
+            images,
+            [
+                paths[0],
+                self.root / "hidden-002.jpg",
+                paths[1],
+                paths[3],
+                self.root / "hidden-005.jpg",
+                paths[2],
+            ],
+        )
+        with Image.open(images[1]) as placeholder:
+            self.assertEqual(placeholder.size, (300, 169))
+        # Rendered slides are stored for the next run
+        for n, path in ((1, paths[0]), (3, paths[1]), (6, paths[2])):
+            self.assertEqual(
+                cache.store.get_file(keys[n], ".jpg").read_bytes(), path.read_bytes()
+            )
+
+
+
+class TestCreateGrid(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+
+    def write_slide(self, name, width):
+        """Write a 4:3 slide image with a dark box, at the given width."""
+        height = width * 3 // 4
+        image = Image.new("RGB", (width, height), (240, 240, 240))
+        ImageDraw.Draw(image).rectangle(
+            [(width // 4, height // 4), (width // 2, height // 2)], fill=(30, 30, 90)
+        )
+        path = self.root / name
+        image.save(path, "JPEG", quality=95)
+        return path
+
+    def test_large_images_match_thumbnail_sized_images(self):
+        """Full-size slides give the grid of slides rendered at thumbnail width"""
+        # One 10 x 7.5 inch slide with a text region at (1, 1), 4 x 2 inches
+        regions = {0: [{"left": 1, "top": 1, "width": 4, "height": 2}]}
+        large = self.write_slide("large.jpg", 4000)
+        small = self.write_slide("small.jpg", 300)
+        for outlines in (None, regions):
+            with self.subTest(outlines=bool(outlines)):
+                grids = [
+                    create_grid([path], 1, 300, 0, outlines, (10, 7.5))
+                    for path in (large, small)
+                ]
+                self.assertEqual(grids[0].size, grids[1].size)
+                diff = ImageStat.Stat(ImageChops.difference(*grids)).mean
+                self.assertLess(max(diff), 1)
+
+                if outlines:
+                    # Middle of the region's left edge, in the thumbnail
+                    # below the slide number label
+                    top = grids[0].height - GRID_PADDING - 225
+                    for grid in grids:
+                        red, green, blue = grid.getpixel(
+                            (GRID_PADDING + 30, top + 60)
+                        )
+                        self.assertGreater(red, 200)
+                        self.assertLess(max(green, blue), 80)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,6 +11,7 @@ import os
 import platform
 from pathlib import Path
 from openpyxl import load_workbook
+from soffice_pool import SofficePoolError, pool_available, recalc as pool_recalc
 
 
 def setup_libreoffice_macro():
@@ -50,22 +51,13 @@ def setup_libreoffice_macro():
         return False
 
 
-def recalc(filename, timeout=30):
+def recalc_with_soffice(abs_path, timeout):
     """
-    Recalculate formulas in Excel file and report any errors
-    
-    Args:
-        filename: Path to Excel file
-        timeout: Maximum time to wait for recalculation (seconds)
+    Recalculate by cold-starting soffice with the RecalculateAndSave macro
     
     Returns:
-        dict with error locations and counts
+        dict with an 'error' key on failure, None on success
     """
-    if not Path(filename).exists():
-        return {'error': f'File {filename} does not exist'}
-    
-    abs_path = str(Path(filename).absolute())
-    
     if not setup_libreoffice_macro():
         return {'error': 'Failed to setup LibreOffice macro'}
     
@@ -98,6 +90,36 @@ def recalc(filename, timeout=30):
         else:
             return {'error': error_msg}
     
+    return None
+
+
+def recalc(filename, timeout=30):
+    """
+    Recalculate formulas in Excel file and report any errors
+    
+    Args:
+        filename: Path to Excel file
+        timeout: Maximum time to wait for recalculation (seconds)
+    
+    Returns:
+        dict with error locations and counts
+    """
+    if not Path(filename).exists():
+        return {'error': f'File {filename} does not exist'}
+    
+    abs_path = str(Path(filename).absolute())
+    
+    # Prefer a warm instance from the soffice_pool service over a cold start
+    if pool_available():
+        try:
+            pool_recalc(abs_path, timeout=timeout)
+        except SofficePoolError as e:
+            return {'error': str(e)}
+    else:
+        error = recalc_with_soffice(abs_path, timeout)
+        if error:
+            return error
+    
     # Check for Excel errors in the recalculated file - scan ALL cells
     try:
         wb = load_workbook(filename, data_only=True)